@@ -1,13 +1,27 @@
-from typing import List
+from collections import OrderedDict
+from typing import Iterator, List, Optional
 import gradio as gr
+import numpy as np
 from pathlib import Path
 from sonic_wrapper.sonic_api_wrapper import CartesiaVoiceManager, VoiceAccessibility, improve_tts_text
+from sonic_wrapper.output_formats import DEFAULT_OUTPUT_PROFILE, OUTPUT_PROFILES, file_extension, resolve_output_format
+from sonic_wrapper.metrics import serve_metrics
 import os
 import json
 import datetime
+import threading
+import time
+import uuid
 
-# Global variable to hold the manager instance
-manager = None
+# Managers shared by all sessions that use the same API key, so their client,
+# connection pool and voice caches stay warm; the least recently used are dropped
+MAX_MANAGERS = 32
+_managers = OrderedDict()
+_managers_lock = threading.Lock()
+# Custom voice IDs are numbered from the voice count, so creation is serialized
+_custom_voice_lock = threading.Lock()
+# Generations running at once across all sessions, e.g. SONIC_CONCURRENCY=16
+CONCURRENCY_LIMIT = int(os.environ.get("SONIC_CONCURRENCY", 8))
 
 # Constants
 LANGUAGE_CHOICES = ["all", "ru", "en", "es", "pl", "de", "fr", "tr", "pt", "zh", "ja", "hi", "it", "ko", "nl", "sv"]
@@ -20,6 +34,8 @@ ACCESS_TYPE_MAP = {
 SPEED_CHOICES = ["Very Slow", "Slow", "Normal", "Fast", "Very Fast"]
 EMOTION_CHOICES = ["Neutral", "Happy", "Sad", "Angry", "Surprised", "Curious"]
 EMOTION_INTENSITY = ["Very Weak", "Weak", "Medium", "Strong", "Very Strong"]
+# Only WAV profiles can be played back in the browser
+OUTPUT_FORMAT_CHOICES = [name for name, fmt in OUTPUT_PROFILES.items() if fmt["container"] == "wav"]
 
 def map_speed(speed_type: str) -> float:
     speed_map = {
@@ -31,45 +47,54 @@ def map_speed(speed_type: str) -> float:
     }
     return speed_map[speed_type]
 
-def generate_output_filename(language: str) -> str:
-    """Generate output filename with timestamp and language"""
+def generate_output_filename(language: str, extension: str = ".wav") -> str:
+    """Generate a unique output filename with timestamp and language"""
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    return f"output/{timestamp}_{language}.wav"
+    return f"output/{timestamp}_{uuid.uuid4().hex}_{language}{extension}"
 
-def extract_voice_id_from_label(voice_label: str) -> str:
+def get_manager(api_key: str) -> Optional[CartesiaVoiceManager]:
+    """Returns the shared manager of an API key, creating it on first use"""
+    if not api_key:
+        return None
+    with _managers_lock:
+        manager = _managers.get(api_key)
+        if manager is None:
+            manager = CartesiaVoiceManager(api_key=api_key, base_dir=Path("voice2voice"))
+            _managers[api_key] = manager
+            while len(_managers) > MAX_MANAGERS:
+                _managers.popitem(last=False)
+        else:
+            _managers.move_to_end(api_key)
+        return manager
+
+def extract_voice_id_from_label(manager: CartesiaVoiceManager, voice_label: str) -> str:
     """
     Extracts voice ID from label in dropdown
     For example: "John (en) [Custom]" -> extract ID from voices dictionary
     """
-    global manager
     try:
         if not manager:
             return None
 
-        # Get all voices and their labels
-        choices = manager.get_voice_choices()
-        # Find voice by label and get its ID
-        voice_data = next((c for c in choices if c["label"] == voice_label), None)
-        return voice_data["value"] if voice_data else None
+        # Dictionary lookup, rebuilt by the manager only when the catalog changes
+        return manager.extract_voice_id_from_label(voice_label)
     except Exception as e:
         print(f"❌ Error getting voices: {str(e)}")
         return None
 
 def initialize_manager(api_key: str) -> str:
-    global manager
     try:
         if not api_key:
             return "❌ API key is required to initialize the manager"
 
-        manager = CartesiaVoiceManager(api_key=api_key, base_dir=Path("voice2voice"))
+        get_manager(api_key)
         return "✅ Manager initialized"
     except Exception as e:
-        manager = None
         return f"❌ Error: {str(e)}"
 
-def get_initial_voices():
-    global manager
+def get_initial_voices(api_key: str = None):
     """Get initial list of voices"""
+    manager = get_manager(api_key)
     if not manager:
         return [], None
     choices = manager.get_voice_choices()
@@ -77,11 +102,11 @@ def get_initial_voices():
         return [], None  
     return [c["label"] for c in choices], choices[0]["label"] if choices else None
 
-def update_voice_list(language: str, access_type: str, current_voice: str = None):
+def update_voice_list(api_key: str, language: str, access_type: str, current_voice: str = None):
     """
     Update the list of voices, preserving the current selection
     """
-    global manager
+    manager = get_manager(api_key)
     if not manager:
         return gr.update(choices=[], value=None), "❌ Manager is not initialized"
     
@@ -106,14 +131,14 @@ def update_voice_list(language: str, access_type: str, current_voice: str = None
     except Exception as e:
         return gr.update(choices=[], value=None), f"❌ Error: {str(e)}"
 
-def update_voice_info(voice_label: str) -> str:
+def update_voice_info(api_key: str, voice_label: str) -> str:
     """Update voice information"""
-    global manager
+    manager = get_manager(api_key)
     if not manager or not voice_label:
         return ""
     
     try:
-        voice_id = extract_voice_id_from_label(voice_label)
+        voice_id = extract_voice_id_from_label(manager, voice_label)
         if not voice_id:
             return "❌ Voice not found"
             
@@ -127,12 +152,12 @@ def update_voice_info(voice_label: str) -> str:
     except Exception as e:
         return f"❌ Error: {str(e)}"
 
-def create_custom_voice(name: str, language: str, audio_data: tuple) -> tuple:
+def create_custom_voice(api_key: str, name: str, language: str, audio_data: tuple) -> tuple:
     """
     Creates a custom voice and updates the list of voices
     Returns: (status, updated dropdown, voice info)
     """
-    global manager
+    manager = get_manager(api_key)
     if not manager:
         return "❌ Manager is not initialized", gr.update(), ""
     
@@ -144,11 +169,12 @@ def create_custom_voice(name: str, language: str, audio_data: tuple) -> tuple:
         audio_path = audio_data[0] if isinstance(audio_data, tuple) else audio_data
         
         # Create the voice
-        voice_id = manager.create_custom_voice(
-            name=name,
-            source=audio_path,
-            language=language
-        )
+        with _custom_voice_lock:
+            voice_id = manager.create_custom_voice(
+                name=name,
+                source=audio_path,
+                language=language
+            )
         
         print(voice_id)
         
@@ -157,7 +183,7 @@ def create_custom_voice(name: str, language: str, audio_data: tuple) -> tuple:
         choice_labels = [c["label"] for c in choices]
         
         # Find label for the new voice
-        new_voice_label = next(c["label"] for c in choices if c["value"] == voice_id)
+        new_voice_label = manager.get_voice_label(voice_id)
         
         # Get info of the new voice
         voice_info = manager.get_voice_info(voice_id)
@@ -209,7 +235,68 @@ def map_emotions(selected_emotions, intensity):
             })
     return emotions
 
+def build_speech_item(
+    manager: CartesiaVoiceManager,
+    text: str,
+    voice_label: str,
+    improve_text: bool,
+    auto_language: bool,
+    manual_language: str,
+    speed_type: str,
+    use_custom_speed: bool,
+    custom_speed: float,
+    emotions: List[str],
+    emotion_intensity: str,
+    output_format: str
+) -> dict:
+    """
+    Collects the request's settings into a speak_many item, so nothing is set
+    on the manager that other sessions share
+    """
+    voice_id = extract_voice_id_from_label(manager, voice_label)
+    if not voice_id:
+        raise ValueError("Voice not found")
+
+    # Without manual language, the voice's own language is used
+    language = manual_language if not auto_language else manager.load_voice(voice_id)['language']
+    return {
+        "text": text if not improve_text else improve_tts_text(text, language),
+        "voice": voice_id,
+        "language": language,
+        "speed": custom_speed if use_custom_speed else map_speed(speed_type),
+        "emotions": map_emotions(emotions, emotion_intensity) if emotions and emotions != ["Neutral"] else [],
+        "output_format": output_format,
+        "output_file": generate_output_filename(language, file_extension(resolve_output_format(output_format)))
+    }
+
+def _mulaw_table() -> np.ndarray:
+    """G.711 mu-law byte -> 16-bit sample"""
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    magnitude = (((u & 0x0F) << 3) + 0x84) << ((u >> 4) & 0x07)
+    return np.where(u & 0x80, 0x84 - magnitude, magnitude - 0x84).astype(np.int16)
+
+MULAW_TABLE = _mulaw_table()
+# Cartesia encoding -> (sample dtype, bytes per sample) of the streaming player
+STREAM_DTYPES = {"pcm_f32le": ("<f4", 4), "pcm_s16le": ("<i2", 2), "pcm_mulaw": ("u1", 1)}
+
+def pcm_chunks_to_samples(chunks: Iterator[bytes], encoding: str) -> Iterator[np.ndarray]:
+    """
+    Converts streamed raw PCM to sample arrays for a streaming gr.Audio,
+    carrying over bytes of a sample split between two chunks
+    """
+    dtype, width = STREAM_DTYPES[encoding]
+    pending = b""
+    for chunk in chunks:
+        data = pending + chunk
+        usable = len(data) - len(data) % width
+        pending = data[usable:]
+        if not usable:
+            continue
+        samples = np.frombuffer(data[:usable], dtype=dtype)
+        yield MULAW_TABLE[samples] if encoding == "pcm_mulaw" else samples
+
 def generate_speech(
+    api_key: str,
     text: str,
     voice_label: str,
     improve_text: bool,
@@ -219,10 +306,11 @@ def generate_speech(
     use_custom_speed: bool,
     custom_speed: float,
     emotions: List[str],
-    emotion_intensity: str
+    emotion_intensity: str,
+    output_format: str = DEFAULT_OUTPUT_PROFILE
 ):
-    global manager
     """Generate speech considering language settings"""
+    manager = get_manager(api_key)
     if not manager:
         return None, "❌ Manager is not initialized"
     
@@ -230,53 +318,91 @@ def generate_speech(
         return None, "❌ Text and voice are required"
     
     try:
-        # Extract voice ID from label
-        voice_id = extract_voice_id_from_label(voice_label)
-        if not voice_id:
-            return None, "❌ Voice not found"
-            
-        # Set the voice by ID
-        manager.set_voice(voice_id)
-        
-        # If auto-detect is off, set language manually
-        if not auto_language:
-            manager.set_language(manual_language)
-        
-        # Set speed
-        if use_custom_speed:
-            manager.speed = custom_speed
-        else:
-            manager.speed = map_speed(speed_type)
-        
-        # Set emotions
-        if emotions and emotions != ["Neutral"]:
-            manager.set_emotions(map_emotions(emotions, emotion_intensity))
-        else:
-            manager.set_emotions()  # Reset emotions
-        
-        # Generate output file name
-        output_file = generate_output_filename(
-            manual_language if not auto_language else manager.current_language
+        item = build_speech_item(
+            manager, text, voice_label, improve_text, auto_language, manual_language,
+            speed_type, use_custom_speed, custom_speed, emotions, emotion_intensity, output_format
         )
         
         # Create output directory if it doesn't exist
         os.makedirs("output", exist_ok=True)
         
-        # Generate speech
-        output_path = manager.speak(
-            text=text if not improve_text else improve_tts_text(text, manager.current_language),
-            output_file=output_file
-        )
+        # Generate speech with the request's own settings
+        audio_data, _ = manager.synthesize_item(item)
+        with open(item["output_file"], "wb") as f:
+            f.write(audio_data)
         
-        return output_path, "✅ Audio generated successfully"
+        return item["output_file"], "✅ Audio generated successfully"
         
     except Exception as e:
         return None, f"❌ Error generating speech: {str(e)}"
 
+def stream_speech(
+    api_key: str,
+    stream: bool,
+    text: str,
+    voice_label: str,
+    improve_text: bool,
+    auto_language: bool,
+    manual_language: str,
+    speed_type: str,
+    use_custom_speed: bool,
+    custom_speed: float,
+    emotions: List[str],
+    emotion_intensity: str,
+    output_format: str = DEFAULT_OUTPUT_PROFILE
+):
+    """
+    Plays the audio while Cartesia generates it and saves the finished file for download
+    Yields: (live audio chunk, finished file, status)
+    """
+    settings = (text, voice_label, improve_text, auto_language, manual_language,
+                speed_type, use_custom_speed, custom_speed, emotions, emotion_intensity, output_format)
+    if not stream:
+        output_path, status = generate_speech(api_key, *settings)
+        yield None, output_path, status
+        return
+
+    manager = get_manager(api_key)
+    if not manager:
+        yield None, None, "❌ Manager is not initialized"
+        return
+
+    if not text or not voice_label:
+        yield None, None, "❌ Text and voice are required"
+        return
+
+    try:
+        item = build_speech_item(manager, *settings)
+        os.makedirs("output", exist_ok=True)
+        audio_format = resolve_output_format(output_format)
+
+        started = time.perf_counter()
+        first_audio = None
+        chunks = manager.stream_item_to_file(item)
+        for samples in pcm_chunks_to_samples(chunks, audio_format["encoding"]):
+            if first_audio is None:
+                first_audio = time.perf_counter() - started
+            yield (
+                (audio_format["sample_rate"], samples),
+                gr.update(),
+                f"▶️ Playing, first audio after {first_audio * 1000:.0f} ms"
+            )
+
+        total = time.perf_counter() - started
+        first_audio_text = f"{first_audio * 1000:.0f} ms" if first_audio is not None else "n/a"
+        yield (
+            None,
+            item["output_file"],
+            f"✅ Audio generated (first audio after {first_audio_text}, total {total:.1f} s)"
+        )
+
+    except Exception as e:
+        yield None, None, f"❌ Error generating speech: {str(e)}"
+
 def initialize_manager_and_update(api_key: str, language: str, access_type: str, current_voice: str = None):
     status = initialize_manager(api_key)
-    if manager:
-        voice_update, voice_status = update_voice_list(language, access_type, current_voice)
+    if get_manager(api_key):
+        voice_update, voice_status = update_voice_list(api_key, language, access_type, current_voice)
         combined_status = f"{status}\n{voice_status}"
         return combined_status, voice_update
     else:
@@ -376,6 +502,15 @@ with gr.Blocks() as demo:
                     visible=False
                 )
             
+            # Output format
+            with gr.Accordion("Output Format", open=False):
+                cartesia_output_format = gr.Dropdown(
+                    label="Format",
+                    choices=OUTPUT_FORMAT_CHOICES,
+                    value=DEFAULT_OUTPUT_PROFILE,
+                    info="hifi-f32-44k: best quality; pcm16-24k: ~4x smaller; telephony-mulaw-8k: ~20x smaller"
+                )
+            
             cartesia_setting_improve_text = gr.Checkbox(
                 label="Improve text according to recommendations",
                 value=True
@@ -384,6 +519,16 @@ with gr.Blocks() as demo:
         # Right column
         with gr.Column():
             cartessia_status_bar = gr.Label(value="Status")
+            cartesia_output_stream = gr.Checkbox(
+                label="Play audio while it is generated",
+                value=True
+            )
+            cartesia_output_stream_audio = gr.Audio(
+                label="Live",
+                streaming=True,
+                autoplay=True,
+                interactive=False
+            )
             cartesia_output_audio = gr.Audio(
                 label="Result",
                 interactive=False
@@ -400,6 +545,7 @@ with gr.Blocks() as demo:
     cartesia_setting_filter_lang.change(
         update_voice_list,
         inputs=[
+            cartesia_api_key,
             cartesia_setting_filter_lang,
             cartesia_setting_filter_type,
             cartesia_setting_voice  # Pass the current selection
@@ -410,6 +556,7 @@ with gr.Blocks() as demo:
     cartesia_setting_filter_type.change(
         update_voice_list,
         inputs=[
+            cartesia_api_key,
             cartesia_setting_filter_lang,
             cartesia_setting_filter_type,
             cartesia_setting_voice  # Pass the current selection
@@ -419,13 +566,13 @@ with gr.Blocks() as demo:
     
     cartesia_setting_voice.change(
         update_voice_info,
-        inputs=[cartesia_setting_voice],
+        inputs=[cartesia_api_key, cartesia_setting_voice],
         outputs=[cartesia_setting_voice_info]
     )
     
     cartesia_setting_voice_update.click(
         update_voice_list,
-        inputs=[cartesia_setting_filter_lang, cartesia_setting_filter_type, cartesia_setting_voice],
+        inputs=[cartesia_api_key, cartesia_setting_filter_lang, cartesia_setting_filter_type, cartesia_setting_voice],
         outputs=[cartesia_setting_voice, cartessia_status_bar]
     )
     
@@ -438,6 +585,7 @@ with gr.Blocks() as demo:
     cartesia_setting_custom_add.click(
         create_custom_voice,
         inputs=[
+            cartesia_api_key,
             cartesia_setting_custom_name,
             cartesia_setting_custom_lang,
             cartesia_setting_custom_voice
@@ -455,9 +603,17 @@ with gr.Blocks() as demo:
         outputs=[cartesia_setting_manual_language]
     )
 
+    cartesia_output_stream.change(
+        lambda x: gr.update(visible=x),
+        inputs=[cartesia_output_stream],
+        outputs=[cartesia_output_stream_audio]
+    )
+
     cartesia_output_button.click(
-        generate_speech,
+        stream_speech,
         inputs=[
+            cartesia_api_key,
+            cartesia_output_stream,
             cartesia_text,
             cartesia_setting_voice,
             cartesia_setting_improve_text,
@@ -467,9 +623,11 @@ with gr.Blocks() as demo:
             cartesia_speed_speed_allow_custom,
             cartesia_speed_speed_custom,
             cartesia_emotions,
-            cartesia_emotions_intensity
+            cartesia_emotions_intensity,
+            cartesia_output_format
         ],
         outputs=[
+            cartesia_output_stream_audio,
             cartesia_output_audio,
             cartessia_status_bar
         ]
@@ -477,5 +635,9 @@ with gr.Blocks() as demo:
 
 # Run the app
 if __name__ == "__main__":
-    demo.queue()
+    # Prometheus metrics of all managers, e.g. SONIC_METRICS_PORT=9464
+    if os.environ.get("SONIC_METRICS_PORT"):
+        serve_metrics(port=int(os.environ["SONIC_METRICS_PORT"]))
+    # Sessions don't share settings, so generations can run concurrently
+    demo.queue(default_concurrency_limit=CONCURRENCY_LIMIT)
     demo.launch(share=True)
@@ -0,0 +1,195 @@
+"""
+End-to-end check and benchmark of the HTTP synthesis service against the local
+Cartesia stand-in (no network access or API key needed).
+
+Starts the stand-in and a SynthesisService in-process, then measures time to
+first byte and total time of streamed /v1/speak requests, buffered requests,
+/v1/batch and /v1/voices under concurrent load. It also checks that a streamed
+response carries the same audio as the buffered one, that batch results are
+complete and that invalid requests get a 400. Exits with status 1 when a check fails.
+
+    python benchmarks/bench_http_service.py
+    python benchmarks/bench_http_service.py --requests 200 --concurrency 16 --workers 8 --latency-ms 150
+"""
+import argparse
+import base64
+import http.client
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sonic_wrapper.http_service import SynthesisService  # noqa: E402
+from sonic_wrapper.log_config import configure_logging  # noqa: E402
+from sonic_wrapper.sonic_api_wrapper import CartesiaVoiceManager  # noqa: E402
+from sonic_wrapper.standin_server import CartesiaStandIn  # noqa: E402
+from sonic_wrapper.wav import WAV_HEADER_SIZE  # noqa: E402
+
+TEXT = "The quick brown fox jumps over the lazy dog."
+
+
+def post(base_url: str, path: str, payload, stream: bool = False) -> dict:
+    """
+    POSTs JSON and reads the response in chunks, timing the first body byte.
+    """
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=60)
+    started = time.perf_counter()
+    conn.request("POST", path, body=json.dumps(payload), headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    first_byte = None
+    body = bytearray()
+    while True:
+        data = response.read1(65536) if stream else response.read()
+        if not data:
+            break
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+        body.extend(data)
+        if not stream:
+            break
+    conn.close()
+    return {"status": response.status, "body": bytes(body), "ttfb": first_byte,
+            "total": time.perf_counter() - started}
+
+
+def get(base_url: str, path: str) -> dict:
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=60)
+    started = time.perf_counter()
+    conn.request("GET", path)
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return {"status": response.status, "body": body, "total": time.perf_counter() - started}
+
+
+def summarize(samples) -> dict:
+    samples = sorted(samples)
+    return {
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+def load(function, requests: int, concurrency: int) -> tuple:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(function, range(requests)))
+    return results, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--requests', type=int, default=60, help='Requests per case (default: 60)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients (default: 8)')
+    parser.add_argument('--workers', type=int, default=8, help='Service synthesis workers (default: 8)')
+    parser.add_argument('--latency-ms', type=float, default=50.0,
+                        help='Stand-in latency per request / to the first chunk (default: 50)')
+    parser.add_argument('--batch-size', type=int, default=20, help='Items per /v1/batch request (default: 20)')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--log', action='store_true', help='Keep the manager\'s logging enabled')
+    args = parser.parse_args()
+
+    if not args.log:
+        configure_logging(level="ERROR", log_file=None)
+
+    failures = []
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="sonic-http-") as workdir, \
+            CartesiaStandIn(voice_count=50, latency=args.latency_ms / 1000, api_key="bench",
+                            chunk_size=4096) as standin:
+        os.environ["CARTESIA_BASE_URL"] = standin.base_url
+        manager = CartesiaVoiceManager(api_key="bench", base_dir=Path(workdir) / "voice2voice")
+        voice = standin.list_voices()[0]
+
+        with SynthesisService(manager, workers=args.workers) as service:
+            base_url = service.base_url
+            speak = {"text": TEXT, "voice": voice["name"], "format": "pcm16-24k"}
+
+            # Correctness
+            streamed = post(base_url, "/v1/speak", speak, stream=True)
+            buffered = post(base_url, "/v1/speak", dict(speak, stream=False))
+            if streamed["status"] != 200 or buffered["status"] != 200:
+                failures.append(f"/v1/speak answered {streamed['status']} / {buffered['status']}")
+            elif streamed["body"][WAV_HEADER_SIZE:] != buffered["body"][WAV_HEADER_SIZE:]:
+                failures.append("streamed and buffered /v1/speak audio differ")
+            bad = post(base_url, "/v1/speak", {"text": TEXT, "voice": voice["id"], "speed": 7})
+            if bad["status"] != 400:
+                failures.append(f"invalid speed answered {bad['status']} instead of 400")
+
+            # Streamed and buffered speak under load
+            def streamed_request(i):
+                return post(base_url, "/v1/speak", dict(speak, text=f"{TEXT} {i}"), stream=True)
+
+            def buffered_request(i):
+                return post(base_url, "/v1/speak", dict(speak, text=f"{TEXT} {i}", stream=False))
+
+            for name, function in (("speak streamed", streamed_request), ("speak buffered", buffered_request)):
+                responses, elapsed = load(function, args.requests, args.concurrency)
+                errors = [r["status"] for r in responses if r["status"] != 200]
+                if errors:
+                    failures.append(f"{name}: {len(errors)} requests failed ({sorted(set(errors))})")
+                results[name] = {
+                    "ttfb": summarize([r["ttfb"] for r in responses if r["ttfb"] is not None]),
+                    "total": summarize([r["total"] for r in responses]),
+                    "requests_per_second": args.requests / elapsed,
+                }
+
+            # Batch
+            def batch_request(i):
+                items = [dict(speak, id=f"{i}-{n}", text=f"{TEXT} {i} {n}") for n in range(args.batch_size)]
+                return post(base_url, "/v1/batch", {"items": items}, stream=True)
+
+            batches = max(1, args.requests // args.batch_size)
+            responses, elapsed = load(batch_request, batches, max(1, args.concurrency // 4))
+            for response in responses:
+                lines = [json.loads(line) for line in response["body"].splitlines() if line]
+                broken = [line for line in lines if line["error"] or not base64.b64decode(line["audio"])]
+                if response["status"] != 200 or len(lines) != args.batch_size or broken:
+                    failures.append(f"/v1/batch returned {len(lines)} results, {len(broken)} failed")
+                    break
+            results["batch"] = {
+                "total": summarize([r["total"] for r in responses]),
+                "items_per_second": batches * args.batch_size / elapsed,
+            }
+
+            # Voices from the local catalog
+            responses, elapsed = load(lambda i: get(base_url, "/v1/voices?custom=false"),
+                                      args.requests, args.concurrency)
+            if any(r["status"] != 200 for r in responses):
+                failures.append("/v1/voices failed")
+            results["voices"] = {"total": summarize([r["total"] for r in responses])}
+            results["standin_calls"] = standin.stats()
+
+    print(f"stand-in latency {args.latency_ms:.0f} ms, {args.workers} workers, {args.concurrency} clients")
+    for name, result in results.items():
+        if name == "standin_calls":
+            continue
+        line = f"{name:16}"
+        if "ttfb" in result:
+            line += f" ttfb median {result['ttfb']['median_ms']:7.1f} ms p95 {result['ttfb']['p95_ms']:7.1f} ms |"
+        line += f" total median {result['total']['median_ms']:7.1f} ms p95 {result['total']['p95_ms']:7.1f} ms"
+        if "requests_per_second" in result:
+            line += f" | {result['requests_per_second']:.1f} requests/s"
+        if "items_per_second" in result:
+            line += f" | {result['items_per_second']:.1f} items/s"
+        print(line)
+    for failure in failures:
+        print(f"FAILED: {failure}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"results": results, "failures": failures}, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Import-time budget of the package and the CLI.
+
+Runs each case in a fresh interpreter, subtracts the bare interpreter startup
+and compares the median against its budget. A case also fails when it imports
+one of the heavy modules that must stay deferred until first use (the Cartesia
+SDK and its HTTP stacks, tqdm). Exits with status 1 when any case fails.
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --runs 15 --scale 2 --output import_time.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that only commands reaching the API (or showing progress) may import
+DEFERRED_MODULES = ("cartesia", "aiohttp", "httpx", "requests", "tqdm", "http.server")
+
+# name -> (interpreter arguments, budget in milliseconds above bare startup)
+CASES = {
+    "import sonic_wrapper.cli": (["-c", "import sonic_wrapper.cli"], 40),
+    "import sonic_wrapper.sonic_api_wrapper": (["-c", "import sonic_wrapper.sonic_api_wrapper"], 200),
+    "cli --help": (["-m", "sonic_wrapper", "--help"], 60),
+    "cli list-voices --accessibility custom": (
+        ["-m", "sonic_wrapper", "list-voices", "--accessibility", "custom"], 300),
+}
+
+
+def run(args, cwd: str, env: dict, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + args
+    return subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True)
+
+
+def wall_ms(args, cwd: str, env: dict, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = run(args, cwd, env)
+        samples.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr}")
+    return statistics.median(samples)
+
+
+def imported_modules(args, cwd: str, env: dict) -> set:
+    """
+    Names of all modules imported by a run, from the -X importtime report.
+    """
+    result = run(args, cwd, env, importtime=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            if name != "package":
+                modules.add(name)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--runs', type=int, default=9, help='Runs per case; the median is compared (default: 9)')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='Multiply all budgets, e.g. 2 on slow CI machines (default: 1)')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    env.setdefault("CARTESIA_API_KEY", "import-time-budget")  # the CLI exits early without a key
+    env.pop("SONIC_TRANSPORT", None)
+
+    results = {}
+    failed = False
+    with tempfile.TemporaryDirectory(prefix="sonic-import-") as workdir:
+        baseline = wall_ms(["-c", "pass"], workdir, env, args.runs)
+        print(f"interpreter startup: {baseline:.1f} ms (subtracted below)")
+        print(f"{'case':42} {'ms':>8} {'budget':>8}  status")
+        for name, (case_args, budget) in CASES.items():
+            elapsed = max(0.0, wall_ms(case_args, workdir, env, args.runs) - baseline)
+            budget *= args.scale
+            leaked = sorted(m for m in imported_modules(case_args, workdir, env)
+                            if m in DEFERRED_MODULES)
+            problems = []
+            if elapsed > budget:
+                problems.append("OVER BUDGET")
+            if leaked:
+                problems.append(f"imports {', '.join(leaked)}")
+            failed |= bool(problems)
+            results[name] = {"ms": elapsed, "budget_ms": budget, "deferred_modules_imported": leaked}
+            print(f"{name:42} {elapsed:8.1f} {budget:8.1f}  {'; '.join(problems) or 'ok'}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"baseline_ms": baseline, "results": results}, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Throughput of improve_tts_text against the previous multi-pass implementation.
+
+Checks that both produce identical output on a generated corpus and on random
+fuzz strings, then reports MB/s for each.
+
+    python benchmarks/bench_text_normalization.py --size-mb 8 --repeat 3
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sonic_wrapper.text_normalization import improve_tts_text  # noqa: E402
+
+
+def legacy_improve_tts_text(text: str, language: str = 'en') -> str:
+    """
+    improve_tts_text as it was before the single-pass engine, kept as the reference.
+    """
+    text = re.sub(r'(\w+)(\s*)$', r'\1.\2', text)
+    text = re.sub(r'(\w+)(\s*\n)', r'\1.\2', text)
+
+    def format_date(match):
+        date = datetime.strptime(match.group(), '%Y-%m-%d')
+        return date.strftime('%m/%d/%Y')
+
+    text = re.sub(r'\d{4}-\d{2}-\d{2}', format_date, text)
+    text = text.replace(' - ', ' - - ')
+    text = re.sub(r'\?(?![\s\n])', '??', text)
+    text = text.replace('"', '')
+    text = text.replace("'", '')
+    text = re.sub(r'(https?://\S+|\S+@\S+\.\S+)\?', r'\1 ?', text)
+
+    if language.lower() in ['ru', 'rus', 'russian']:
+        text = text.replace('г.', 'году')
+    elif language.lower() in ['fr', 'fra', 'french']:
+        text = text.replace('M.', 'Monsieur')
+
+    return text
+
+
+SAMPLE_LINES = [
+    'The meeting moved to 2024-03-15 - please confirm?',
+    'He said "hello" and she replied \'hi\'',
+    'Visit https://example.com/page?id=3 or mail me@example.org?',
+    'Does it work?Yes it does',
+    'В 2021 г. мы переехали',
+    'M. Dupont est arrivé le 2023-11-02',
+    'Plain sentence without punctuation   ',
+    '这是一个测试句子',
+    'Numbers 12023-01-055 and 1999-12-31 - end',
+]
+
+
+def build_corpus(size_bytes: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines = []
+    total = 0
+    while total < size_bytes:
+        line = rng.choice(SAMPLE_LINES)
+        lines.append(line)
+        total += len(line.encode("utf-8")) + 1
+    return "\n".join(lines)
+
+
+def fuzz_equivalence(cases: int, seed: int = 1):
+    rng = random.Random(seed)
+    alphabet = ['a', 'b', 'Z', 'г', 'M', '.', '1', '2', '0', '-', ' ', '\n', '\t', '?', '"', "'",
+                '@', ':', '/', 'http://', 'https://', 'x.y', ' - ', '2024-01-02', 'г.', 'M.']
+    for _ in range(cases):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        for language in ("en", "ru", "FR", "de"):
+            try:
+                expected = legacy_improve_tts_text(text, language)
+            except ValueError:
+                expected = ValueError
+            try:
+                actual = improve_tts_text(text, language)
+            except ValueError:
+                actual = ValueError
+            if actual != expected:
+                raise AssertionError(f"Output differs for {text!r} ({language}): {actual!r} != {expected!r}")
+
+
+def measure(function, text: str, language: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(text, language)
+        best = min(best, time.perf_counter() - started)
+    return len(text.encode("utf-8")) / best / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--size-mb', type=float, default=4.0, help='Corpus size in MB (default: 4)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per implementation, best is reported')
+    parser.add_argument('--fuzz', type=int, default=20000, help='Random strings checked for equal output')
+    args = parser.parse_args()
+
+    corpus = build_corpus(int(args.size_mb * 1e6))
+    for language in ("en", "ru", "fr"):
+        if improve_tts_text(corpus, language) != legacy_improve_tts_text(corpus, language):
+            print(f"Output differs from the previous implementation on the corpus ({language})")
+            sys.exit(1)
+    fuzz_equivalence(args.fuzz)
+    print(f"Output identical on a {args.size_mb:g} MB corpus and {args.fuzz} fuzz strings")
+
+    legacy = measure(legacy_improve_tts_text, corpus, "ru", args.repeat)
+    current = measure(improve_tts_text, corpus, "ru", args.repeat)
+    print(f"previous: {legacy:8.2f} MB/s")
+    print(f"current:  {current:8.2f} MB/s  ({current / legacy:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""
+Offline benchmark of CartesiaVoiceManager against an in-process fake client.
+
+Builds a synthetic voice2voice directory in a temporary folder, points the manager
+at FakeCartesia and times the wrapper's hot paths. Results are written as JSON;
+pass a previous results file with --compare to flag regressions.
+
+    python benchmarks/bench_voice_manager.py --voices 2000 --latency-ms 20 --output bench.json
+    python benchmarks/bench_voice_manager.py --compare bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger  # noqa: E402
+
+from fake_cartesia import FakeCartesia, make_voices  # noqa: E402
+from sonic_wrapper.sonic_api_wrapper import CartesiaVoiceManager, VoiceAccessibility  # noqa: E402
+from sonic_wrapper.text_normalization import improve_tts_text  # noqa: E402
+
+SPEAK_TEXT = ("The quick brown fox jumps over the lazy dog on 2024-05-01 - twice? "
+              "She said \"hello\" and left.\n") * 2
+
+
+def build_voice_dir(base_dir: Path, voices, custom_count: int) -> CartesiaVoiceManager:
+    """
+    Writes the synthetic library to base_dir the way a voice sync would, plus custom voices.
+    """
+    manager = CartesiaVoiceManager(api_key=None, base_dir=base_dir)
+    for voice in voices:
+        manager._save_voice_to_api(voice)
+    rng = random.Random(1)
+    for i in range(custom_count):
+        source = rng.choice(voices)
+        manager._save_voice_to_custom(dict(
+            source, id=f"custom_{i}", name=f"Custom {i}", is_public=False, is_custom=True
+        ))
+    return manager
+
+
+def run_case(client: FakeCartesia, function, iterations: int, setup=None) -> dict:
+    samples = []
+    calls_before = sum(client.calls.values())
+    for i in range(iterations):
+        if setup:
+            setup(i)
+        started = time.perf_counter()
+        function(i)
+        samples.append(time.perf_counter() - started)
+    calls = sum(client.calls.values()) - calls_before
+
+    samples_us = sorted(s * 1e6 for s in samples)
+    mean_us = statistics.fmean(samples_us)
+    calls_per_iteration = calls / iterations
+    return {
+        "iterations": iterations,
+        "mean_us": mean_us,
+        "p50_us": samples_us[len(samples_us) // 2],
+        "p95_us": samples_us[min(len(samples_us) - 1, int(len(samples_us) * 0.95))],
+        "min_us": samples_us[0],
+        "api_calls_per_iteration": calls_per_iteration,
+        # Time not spent waiting on the (fake) network
+        "overhead_us": max(0.0, mean_us - calls_per_iteration * client.latency * 1e6),
+    }
+
+
+def run_suite(args) -> dict:
+    rng = random.Random(args.seed)
+    voices = make_voices(args.voices, seed=args.seed)
+    client = FakeCartesia(voices, latency=args.latency_ms / 1000)
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="sonic-bench-") as tmp:
+        workdir = Path(tmp)
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            started = time.perf_counter()
+            manager = build_voice_dir(workdir / "voice2voice", voices, args.custom_voices)
+            results["setup.build_voice_dir"] = {"seconds": time.perf_counter() - started}
+            manager.client = client
+
+            ids = [voice["id"] for voice in voices]
+            n = args.iterations
+
+            results["list_available_voices.cold"] = run_case(
+                client, lambda i: manager.list_available_voices(), n,
+                setup=lambda i: manager.invalidate_voice_cache()
+            )
+            results["list_available_voices.warm"] = run_case(
+                client, lambda i: manager.list_available_voices(), n
+            )
+            results["list_available_voices.filtered"] = run_case(
+                client, lambda i: manager.list_available_voices(
+                    languages=["en"], accessibility=VoiceAccessibility.ONLY_PUBLIC
+                ), n
+            )
+            results["get_voice_choices.cold"] = run_case(
+                client, lambda i: manager.get_voice_choices(), n,
+                setup=lambda i: manager.invalidate_voice_cache()
+            )
+            results["get_voice_choices.warm"] = run_case(
+                client, lambda i: manager.get_voice_choices(), n
+            )
+
+            labels = [choice["label"] for choice in manager.get_voice_choices()]
+            picks = [rng.choice(labels) for _ in range(n * 10)]
+            results["extract_voice_id_from_label"] = run_case(
+                client, lambda i: manager.extract_voice_id_from_label(picks[i]), n * 10
+            )
+
+            def forget(voice_id):
+                manager.voices.pop(voice_id, None)
+                manager.loaded_voices.discard(voice_id)
+
+            picks = [rng.choice(ids) for _ in range(n)]
+            results["load_voice.cold"] = run_case(
+                client, lambda i: manager.load_voice(picks[i]), n,
+                setup=lambda i: forget(picks[i])
+            )
+            results["load_voice.warm"] = run_case(
+                client, lambda i: manager.load_voice(picks[i]), n
+            )
+            results["set_voice"] = run_case(
+                client, lambda i: manager.set_voice(picks[i]), n,
+                setup=lambda i: forget(picks[i])
+            )
+
+            manager.set_voice(ids[0])
+            manager.set_language("en")
+            with contextlib.redirect_stdout(io.StringIO()):  # speak() prints every saved file
+                results["speak"] = run_case(
+                    client, lambda i: manager.speak(SPEAK_TEXT, output_file=str(workdir / "bench.wav")), n
+                )
+
+            text = SPEAK_TEXT * 8
+            results["improve_tts_text"] = run_case(
+                client, lambda i: improve_tts_text(text, "en"), n * 10
+            )
+            results["improve_tts_text"]["mb_per_s"] = (
+                len(text.encode("utf-8")) / (results["improve_tts_text"]["mean_us"] / 1e6) / 1e6
+            )
+            manager.catalog.close()
+        finally:
+            os.chdir(cwd)
+
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> bool:
+    """
+    Prints per-case ratios of mean overhead and returns True when any case regressed.
+    """
+    regressed = False
+    print(f"{'case':40} {'baseline us':>12} {'current us':>12} {'ratio':>7}")
+    for name, result in current["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or "overhead_us" not in result or "overhead_us" not in previous:
+            continue
+        ratio = result["overhead_us"] / previous["overhead_us"] if previous["overhead_us"] else float("inf")
+        flag = " REGRESSION" if ratio > threshold else ""
+        regressed |= bool(flag)
+        print(f"{name:40} {previous['overhead_us']:12.1f} {result['overhead_us']:12.1f} {ratio:7.2f}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--voices', type=int, default=1000, help='Synthetic API voices (default: 1000)')
+    parser.add_argument('--custom-voices', type=int, default=50, help='Synthetic custom voices (default: 50)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Fake latency per API call (default: 0)')
+    parser.add_argument('--iterations', type=int, default=50, help='Iterations per case (default: 50)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench_voice_manager.json', help='Results file (JSON)')
+    parser.add_argument('--compare', help='Previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Overhead ratio above which a case counts as a regression (default: 1.25)')
+    parser.add_argument('--log', action='store_true', help='Keep the manager\'s logging enabled')
+    args = parser.parse_args()
+
+    # Read the baseline before the run, so that writing --output can't replace it
+    baseline = None
+    if args.compare:
+        if Path(args.compare).resolve() == Path(args.output).resolve():
+            parser.error("--compare and --output point to the same file; write the new results elsewhere")
+        baseline = json.loads(Path(args.compare).read_text())
+
+    if not args.log:
+        logger.disable("sonic_wrapper")
+
+    results = run_suite(args)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+
+    for name, result in results.items():
+        if "mean_us" in result:
+            print(f"{name:40} mean {result['mean_us']:10.1f} us   overhead {result['overhead_us']:10.1f} us")
+    print(f"Results written to {args.output}")
+
+    if baseline is not None:
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
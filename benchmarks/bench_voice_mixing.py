@@ -0,0 +1,163 @@
+"""
+Local (numpy) versus API voice mixing against the local Cartesia stand-in
+(no network access or API key needed).
+
+Generates random weighted blends of the stand-in's voices, checks that the local
+mix matches voices.mix on a sample of them, then times mixing every blend through
+the API one call at a time against one batched local matrix product. Finally a
+second manager on the same voice2voice folder mixes the blends again, which must
+be served by the persistent mix memo without any API call. Exits with status 1
+when the local and remote results differ or the memo misses.
+
+    python benchmarks/bench_voice_mixing.py
+    python benchmarks/bench_voice_mixing.py --blends 500 --voices 8 --latency-ms 80
+
+The stand-in mixes with the same formula as the local engine, so the check above
+only guards the local engine's plumbing. To compare with the real voices.mix,
+record a session against the API once, then replay it anywhere without a key:
+
+    CARTESIA_API_KEY=... python benchmarks/bench_voice_mixing.py --record cassettes/mix_check.jsonl
+    python benchmarks/bench_voice_mixing.py --replay cassettes/mix_check.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sonic_wrapper.log_config import configure_logging  # noqa: E402
+from sonic_wrapper.sonic_api_wrapper import CartesiaVoiceManager  # noqa: E402
+from sonic_wrapper.standin_server import CartesiaStandIn  # noqa: E402
+from sonic_wrapper.transport import Transport  # noqa: E402
+
+
+def check_real_api(args) -> int:
+    """
+    Compares local mixes with voices.mix of the real API (--record) or of a
+    recorded session (--replay); returns the exit status.
+    """
+    transport = Transport("record", args.record) if args.record else Transport("replay", args.replay)
+    with tempfile.TemporaryDirectory(prefix="sonic-mix-") as workdir:
+        manager = CartesiaVoiceManager(base_dir=Path(workdir) / "voice2voice", transport=transport,
+                                       mix_cache_entries=0)
+        if manager.client is None:
+            print("FAILED: no Cartesia client, set CARTESIA_API_KEY to record")
+            return 1
+        voice_ids = sorted(voice["id"] for voice in manager.client.voices.list())[:args.library]
+        rng = random.Random(1)
+        recipes = [
+            [{"id": voice_id, "weight": rng.uniform(0.05, 1.0)}
+             for voice_id in rng.sample(voice_ids, min(args.voices, len(voice_ids)))]
+            for _ in range(args.samples)
+        ]
+        check = manager.verify_local_mix(recipes, tolerance=args.tolerance)
+
+    source = f"recorded to {args.record}" if args.record else f"replayed from {args.replay}"
+    print(f"voices.mix {source}: {check['recipes']} blends, max difference {check['max_difference']}")
+    if args.output:
+        Path(args.output).write_text(json.dumps({"check": check}, indent=2))
+    if not check["equivalent"]:
+        print(f"FAILED: local mix differs from voices.mix by {check['max_difference']}")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--blends', type=int, default=200, help='Blends to mix (default: 200)')
+    parser.add_argument('--voices', type=int, default=5, help='Voices per blend (default: 5)')
+    parser.add_argument('--library', type=int, default=50, help='Voices in the stand-in library (default: 50)')
+    parser.add_argument('--samples', type=int, default=20, help='Blends checked against the API (default: 20)')
+    parser.add_argument('--latency-ms', type=float, default=30.0, help='Stand-in latency per request (default: 30)')
+    parser.add_argument('--tolerance', type=float, default=1e-4,
+                        help='Largest allowed difference between local and API mixes (default: 1e-4)')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--log', action='store_true', help='Keep the manager\'s logging enabled')
+    real_api = parser.add_mutually_exclusive_group()
+    real_api.add_argument('--record', metavar='CASSETTE',
+                          help='Check against the real API (needs CARTESIA_API_KEY) and record the calls')
+    real_api.add_argument('--replay', metavar='CASSETTE', help='Check against a recorded --record session')
+    args = parser.parse_args()
+
+    if not args.log:
+        configure_logging(level="ERROR", log_file=None)
+    if args.record or args.replay:
+        sys.exit(check_real_api(args))
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory(prefix="sonic-mix-") as workdir, \
+            CartesiaStandIn(voice_count=args.library, latency=args.latency_ms / 1000, api_key="bench") as standin:
+        os.environ["CARTESIA_BASE_URL"] = standin.base_url
+        base_dir = Path(workdir) / "voice2voice"
+        # The memo would serve every mix after the first, so the mixing itself is timed without it
+        manager = CartesiaVoiceManager(api_key="bench", base_dir=base_dir, mix_cache_entries=0)
+        voice_ids = [voice["id"] for voice in standin.list_voices()]
+        recipes = [
+            [{"id": voice_id, "weight": rng.uniform(0.05, 1.0)} for voice_id in rng.sample(voice_ids, args.voices)]
+            for _ in range(args.blends)
+        ]
+        for voice_id in voice_ids:
+            manager.load_voice(voice_id)
+
+        check = manager.verify_local_mix(recipes[:args.samples], tolerance=args.tolerance)
+
+        started = time.perf_counter()
+        remote = [manager.create_mixed_embedding(recipe, local=False) for recipe in recipes]
+        remote_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        local = manager.create_mixed_embeddings(recipes, local=True)
+        local_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for recipe in recipes:
+            manager.create_mixed_embedding(recipe, local=True)
+        single_seconds = time.perf_counter() - started
+
+        CartesiaVoiceManager(api_key="bench", base_dir=base_dir).create_mixed_embeddings(recipes)
+        memoized = CartesiaVoiceManager(api_key="bench", base_dir=base_dir)
+        calls_before = sum(standin.stats().values())
+        started = time.perf_counter()
+        memo = [memoized.create_mixed_embedding(recipe) for recipe in recipes]
+        memo_seconds = time.perf_counter() - started
+        memo_api_calls = sum(standin.stats().values()) - calls_before
+        memo_stats = memoized.get_mix_cache_stats()
+
+    failures = []
+    if not check["equivalent"]:
+        failures.append(f"local mix differs from voices.mix by {check['max_difference']}")
+    if memo_api_calls or memo_stats["misses"] or max(max(abs(a - b) for a, b in zip(x, y))
+                                                      for x, y in zip(memo, local)) > args.tolerance:
+        failures.append(f"mix memo made {memo_api_calls} API calls, {memo_stats['misses']} misses")
+
+    results = {
+        "check": check,
+        "remote_seconds": remote_seconds,
+        "local_batch_seconds": local_seconds,
+        "local_single_seconds": single_seconds,
+        "memo_seconds": memo_seconds,
+        "memo_stats": memo_stats,
+        "failures": failures,
+    }
+    print(f"{args.blends} blends of {args.voices} voices, stand-in latency {args.latency_ms:.0f} ms")
+    print(f"check           {check['recipes']} blends, max difference {check['max_difference']}")
+    print(f"API, one by one {remote_seconds * 1000:9.1f} ms")
+    print(f"local, one by one {single_seconds * 1000:7.1f} ms")
+    print(f"local, batched  {local_seconds * 1000:9.1f} ms ({remote_seconds / max(local_seconds, 1e-9):.0f}x)")
+    print(f"memo, one by one {memo_seconds * 1000:8.1f} ms ({memo_stats['disk_hits']} disk hits, "
+          f"{memo_api_calls} API calls)")
+    for failure in failures:
+        print(f"FAILED: {failure}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+In-process stand-in for the Cartesia client, used by the offline benchmarks.
+
+Implements the subset of the SDK the wrapper calls (voices.list/get/mix/clone,
+tts.bytes/sse) over a synthetic voice library, sleeping ``latency`` seconds per
+call to emulate the network.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sonic_wrapper.standin_server import EMBEDDING_DIM, embedding_from_bytes, make_voices  # noqa: E402,F401
+from sonic_wrapper.wav import bytes_per_sample, wav_header  # noqa: E402
+
+
+class _Voices:
+    def __init__(self, client: "FakeCartesia"):
+        self._client = client
+
+    def list(self) -> List[Dict]:
+        self._client._call("voices.list")
+        return [{k: v for k, v in voice.items() if k != "embedding"} for voice in self._client.library]
+
+    def get(self, id: str) -> Dict:
+        self._client._call("voices.get")
+        voice = self._client._by_id.get(id)
+        if voice is None:
+            raise ValueError(f"Voice {id} not found")
+        return dict(voice)
+
+    def mix(self, voices: List[Dict]) -> List[float]:
+        self._client._call("voices.mix")
+        total = sum(component["weight"] for component in voices)
+        return [
+            sum(component["embedding"][i] * component["weight"] for component in voices) / total
+            for i in range(EMBEDDING_DIM)
+        ]
+
+    def clone(self, filepath: str) -> List[float]:
+        self._client._call("voices.clone")
+        return embedding_from_bytes(filepath.encode("utf-8"))
+
+
+class _TTS:
+    def __init__(self, client: "FakeCartesia"):
+        self._client = client
+
+    def _pcm(self, transcript: str, output_format: Dict) -> bytes:
+        seconds = len(transcript) * self._client.seconds_per_char
+        samples = int(output_format["sample_rate"] * seconds)
+        return bytes(samples * bytes_per_sample(output_format["encoding"]))
+
+    def bytes(self, transcript: str, output_format: Dict, **kwargs) -> bytes:
+        self._client._call("tts.bytes")
+        pcm = self._pcm(transcript, output_format)
+        if output_format["container"] == "wav":
+            return wav_header(output_format["encoding"], output_format["sample_rate"], len(pcm)) + pcm
+        return pcm
+
+    def sse(self, transcript: str, output_format: Dict, stream: bool = True, chunk_size: int = 8192, **kwargs):
+        self._client._call("tts.sse")
+        pcm = self._pcm(transcript, output_format)
+        for start in range(0, len(pcm), chunk_size):
+            yield {"audio": pcm[start:start + chunk_size]}
+
+
+class FakeCartesia:
+    """
+    Drop-in replacement for ``cartesia.Cartesia`` with a synthetic voice library.
+
+    :param voices: Voice library, see make_voices
+    :param latency: Seconds slept per API call
+    :param seconds_per_char: Length of generated audio per transcript character
+    """
+
+    def __init__(self, voices: List[Dict], latency: float = 0.0, seconds_per_char: float = 0.06):
+        self.library = voices
+        self._by_id = {voice["id"]: voice for voice in voices}
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self.calls = Counter()
+        self._lock = threading.Lock()
+        self.voices = _Voices(self)
+        self.tts = _TTS(self)
+
+    def _call(self, endpoint: str):
+        with self._lock:
+            self.calls[endpoint] += 1
+        if self.latency:
+            time.sleep(self.latency)
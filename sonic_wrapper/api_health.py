@@ -0,0 +1,264 @@
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from .output_formats import resolve_output_format
+
+
+class ApiHealth:
+    """
+    Cached health of the Cartesia API for a voice manager.
+
+    The light probe is a single ``voices.get`` of a voice that is already known
+    (from the local catalog or the cached listing); ``voices.list`` is only
+    called when no voice is known yet, and its result then refills the
+    manager's listing cache. The probed voice's embedding is remembered so the
+    opt-in deep check can run a one-character ``tts.bytes`` generation without
+    listing or fetching voices first.
+
+    ``status()`` never blocks: it returns the last result and, once that is
+    due, starts a refresh in a background thread. ``start()`` keeps the result
+    fresh from a daemon thread. A result is due after ``ttl`` seconds; while
+    the API is failing the delay doubles per failure, up to ``max_backoff``.
+
+    :param manager: Voice manager providing ``client``, ``catalog`` and ``remote_voices``
+    :param ttl: Seconds a light probe result stays fresh
+    :param deep_check: Also run the generation check when refreshing
+    :param deep_ttl: Seconds a deep check result stays fresh
+    :param max_backoff: Upper bound of the retry delay after failures
+    """
+
+    DEEP_CHECK_FORMAT = "telephony-mulaw-8k"  # smallest profile
+
+    def __init__(self, manager, ttl: float = 60.0, deep_check: bool = False,
+                 deep_ttl: float = 900.0, max_backoff: float = 300.0):
+        self.manager = manager
+        self.ttl = ttl
+        self.deep_check = deep_check
+        self.deep_ttl = deep_ttl
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._is_api_available = False
+        self._can_generate: Optional[bool] = None
+        self._checked_at: Optional[float] = None
+        self._deep_checked_at: Optional[float] = None
+        self._last_check_datetime: Optional[datetime] = None
+        self._latency: Optional[float] = None
+        self._error: Optional[str] = None
+        self._failures = 0
+        self._probe_voice: Optional[Dict] = None
+
+    # ------------------------------------------------------------------ probes
+
+    def _known_voice_ids(self) -> List[str]:
+        if self._probe_voice is not None:
+            return [self._probe_voice["id"]]
+        ids = [voice["id"] for voice in self.manager.catalog.query(is_custom=False)[:1]]
+        if not ids and self.manager.remote_voices.generation:
+            cached = self.manager.remote_voices.get()
+            ids = [voice["id"] for voice in cached[:1]]
+        return ids
+
+    def probe(self) -> bool:
+        """
+        Light check: is the API reachable and the key accepted? Stores and returns the result.
+        """
+        client = self.manager.client
+        if not client:
+            self._store(False, None, "Cartesia client is not initialized")
+            return False
+
+        started = time.perf_counter()
+        try:
+            voice = None
+            ids = self._known_voice_ids()
+            if ids:
+                try:
+                    voice = client.voices.get(id=ids[0])
+                except Exception as e:
+                    # The voice may have been deleted remotely; fall back to the listing
+                    logger.debug(f"Probe of voice {ids[0]} failed, listing voices: {e}")
+            if voice is None:
+                voices = client.voices.list()
+                self.manager.remote_voices.set(voices)
+                if not voices:
+                    raise ValueError("No voices returned")
+                voice = client.voices.get(id=voices[0]["id"])
+            self._probe_voice = {"id": voice["id"], "embedding": voice["embedding"]}
+        except Exception as e:
+            self._probe_voice = None
+            self._store(False, time.perf_counter() - started, str(e))
+            logger.warning(f"API health probe failed: {e}")
+            return False
+
+        self._store(True, time.perf_counter() - started, None)
+        return True
+
+    def deep_probe(self) -> bool:
+        """
+        Generation check: synthesizes one character with the remembered embedding.
+        Runs the light probe first when no embedding is remembered yet.
+        """
+        if self._probe_voice is None and not self.probe():
+            self._store_deep(False)
+            return False
+        try:
+            audio = self.manager.client.tts.bytes(
+                model_id="sonic-english",
+                transcript="A",
+                voice_embedding=self._probe_voice["embedding"],
+                duration=None,
+                output_format=resolve_output_format(self.DEEP_CHECK_FORMAT),
+            )
+            can_generate = bool(audio)
+            if not can_generate:
+                logger.warning("Health check generated empty audio.")
+        except Exception as e:
+            logger.warning(f"API generation check failed: {e}")
+            with self._lock:
+                self._error = str(e)
+            can_generate = False
+        self._store_deep(can_generate)
+        return can_generate
+
+    def _store(self, available: bool, latency: Optional[float], error: Optional[str]):
+        with self._lock:
+            self._is_api_available = available
+            self._latency = latency
+            self._error = error
+            self._checked_at = time.monotonic()
+            self._last_check_datetime = datetime.now()
+            self._failures = 0 if available else self._failures + 1
+
+    def _store_deep(self, can_generate: bool):
+        with self._lock:
+            self._can_generate = can_generate
+            self._deep_checked_at = time.monotonic()
+
+    # ------------------------------------------------------------------ refresh
+
+    def refresh(self, deep: bool = None) -> Dict:
+        """
+        Runs the probe (and the deep check if enabled or ``deep`` is True) now.
+        """
+        deep = self.deep_check if deep is None else deep
+        with self._refresh_lock:
+            available = self.probe()
+            if available and deep:
+                self.deep_probe()
+        return self.status(refresh_if_stale=False)
+
+    def refresh_in_background(self):
+        """
+        Starts a refresh thread unless one is already running.
+        """
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name="api-health-refresh", daemon=True).start()
+
+    def _background_refresh(self):
+        try:
+            deep = self.deep_check and self._deep_expired()
+            self.refresh(deep=deep)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _expired(self) -> bool:
+        delay = self.next_delay()
+        with self._lock:
+            return self._checked_at is None or time.monotonic() - self._checked_at >= delay
+
+    def _deep_expired(self) -> bool:
+        with self._lock:
+            return self._deep_checked_at is None or time.monotonic() - self._deep_checked_at >= self.deep_ttl
+
+    def next_delay(self) -> float:
+        """
+        Seconds until the next scheduled check: ``ttl`` while healthy, doubling per consecutive failure.
+        """
+        with self._lock:
+            failures = self._failures
+        if not failures:
+            return self.ttl
+        return min(self.max_backoff, self.ttl * 2 ** (failures - 1))
+
+    def start(self):
+        """
+        Keeps the status fresh from a daemon thread until ``stop()``.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="api-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh(deep=self.deep_check and self._deep_expired())
+            except Exception as e:
+                logger.error(f"API health refresh failed: {e}")
+            self._stop.wait(self.next_delay())
+
+    # ------------------------------------------------------------------ status
+
+    @property
+    def is_api_available(self) -> bool:
+        return self._is_api_available
+
+    @property
+    def can_generate(self) -> bool:
+        """
+        Result of the last deep check; without one, assumed from the light probe.
+        """
+        with self._lock:
+            return self._can_generate_locked()
+
+    def _can_generate_locked(self) -> bool:
+        if not self._is_api_available:
+            return False
+        return True if self._can_generate is None else self._can_generate
+
+    @property
+    def last_check_datetime(self) -> Optional[str]:
+        if self._last_check_datetime:
+            return self._last_check_datetime.strftime('%Y-%m-%d %H:%M:%S')
+        return None
+
+    def status(self, refresh_if_stale: bool = True) -> Dict:
+        """
+        The last known status, returned immediately. A stale status triggers a background refresh.
+        """
+        stale = self._expired()
+        if stale and refresh_if_stale and not (self._thread and self._thread.is_alive()):
+            self.refresh_in_background()
+        with self._lock:
+            latency = self._latency
+            return {
+                "is_api_available": self._is_api_available,
+                "can_generate": self._can_generate_locked(),
+                "generation_verified": self._can_generate is not None,
+                "last_check": self.last_check_datetime,
+                "latency_ms": round(latency * 1000, 1) if latency is not None else None,
+                "error": self._error,
+                "consecutive_failures": self._failures,
+                "stale": stale,
+            }
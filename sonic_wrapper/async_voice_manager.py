@@ -0,0 +1,221 @@
+import asyncio
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Union
+
+from loguru import logger
+
+from .sonic_api_wrapper import CartesiaVoiceManager, VoiceAccessibility
+from .instrumented_client import InstrumentedClient
+from .log_config import hot_logger
+from .sdk import cartesia_class
+from .output_formats import resolve_output_format
+from .synthesis_cache import synthesis_key
+from .wav import wav_header, patch_wav_header
+
+
+class AsyncCartesiaVoiceManager:
+    """
+    asyncio counterpart of CartesiaVoiceManager.
+
+    Wraps a CartesiaVoiceManager so both share the same voice directories, catalog,
+    embedding stores and caches. Speech is generated with Cartesia's async client;
+    voice-file I/O and the SDK's blocking voices.* calls run in worker threads so
+    they never block the event loop.
+    """
+
+    def __init__(self, api_key: str = None, base_dir: Path = None, voices_cache_ttl: float = 300.0,
+                 manager: CartesiaVoiceManager = None):
+        self.manager = manager or CartesiaVoiceManager(
+            api_key=api_key, base_dir=base_dir, voices_cache_ttl=voices_cache_ttl
+        )
+        transport = self.manager.transport
+        AsyncCartesia = cartesia_class(asynchronous=True)
+        if self.manager.api_key and AsyncCartesia:
+            client = transport(AsyncCartesia(api_key=self.manager.api_key), asynchronous=True)
+            self.async_client = InstrumentedClient(client, self.manager.metrics)
+            logger.info("Async Cartesia client initialized.")
+        elif not transport.needs_api_key:
+            self.async_client = InstrumentedClient(transport(None, asynchronous=True), self.manager.metrics)
+        else:
+            self.async_client = None
+            logger.warning("Async Cartesia client is not initialized. Speech generation will be unavailable.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, exc_tb):
+        await self.close()
+
+    async def close(self):
+        if self.async_client is not None:
+            await self.async_client.close()
+
+    # =========================================================================
+    #                       Settings (no I/O, shared with the sync manager)
+    # =========================================================================
+
+    @property
+    def current_voice(self) -> Optional[Dict]:
+        return self.manager.current_voice
+
+    @property
+    def current_language(self) -> Optional[str]:
+        return self.manager.current_language
+
+    @property
+    def speed(self):
+        return self.manager.speed
+
+    @speed.setter
+    def speed(self, value):
+        self.manager.speed = value
+
+    def set_language(self, language: str):
+        self.manager.set_language(language)
+
+    def set_emotions(self, emotions: List[Dict[str, str]] = None):
+        self.manager.set_emotions(emotions)
+
+    # =========================================================================
+    #                       Voices
+    # =========================================================================
+
+    async def list_available_voices(self, languages: List[str] = None,
+                                    accessibility: VoiceAccessibility = VoiceAccessibility.ALL) -> List[Dict]:
+        return await asyncio.to_thread(self.manager.list_available_voices, languages, accessibility)
+
+    async def get_voice_choices(self, language: str = None,
+                                accessibility: VoiceAccessibility = VoiceAccessibility.ALL) -> List[Dict]:
+        return await asyncio.to_thread(self.manager.get_voice_choices, language, accessibility)
+
+    async def extract_voice_id_from_label(self, voice_label: str) -> Optional[str]:
+        return await asyncio.to_thread(self.manager.extract_voice_id_from_label, voice_label)
+
+    async def get_voice_id_by_name(self, name: str) -> List[str]:
+        return await asyncio.to_thread(self.manager.get_voice_id_by_name, name)
+
+    async def get_voice_info(self, voice_id: str) -> Dict:
+        return await asyncio.to_thread(self.manager.get_voice_info, voice_id)
+
+    async def load_voice(self, voice_id: str) -> Dict:
+        return await asyncio.to_thread(self.manager.load_voice, voice_id)
+
+    async def set_voice(self, voice_id: str):
+        await asyncio.to_thread(self.manager.set_voice, voice_id)
+
+    async def update_voices_from_api(self, max_workers: int = 8, prune: bool = False) -> Optional[Dict[str, List[str]]]:
+        return await asyncio.to_thread(self.manager.update_voices_from_api, max_workers, prune)
+
+    # =========================================================================
+    #                       Speech
+    # =========================================================================
+
+    def _require_client(self):
+        if not self.async_client:
+            logger.error("Cannot generate speech without async API client.")
+            raise ValueError("Async API client is not initialized. Cannot generate speech.")
+
+    @staticmethod
+    def _write_file(output_file: str, audio_data: bytes):
+        with open(output_file, "wb") as f:
+            f.write(audio_data)
+
+    async def _synthesize(self, request: Dict) -> tuple:
+        """
+        Async counterpart of CartesiaVoiceManager._synthesize, sharing its synthesis cache.
+        """
+        cache = self.manager.synthesis_cache
+        if cache is None:
+            return await self.async_client.tts.bytes(**request), False
+        key = synthesis_key(request)
+        audio_data = await asyncio.to_thread(cache.get, key)
+        self.manager.metrics.cache_event("synthesis", audio_data is not None)
+        if audio_data is not None:
+            return audio_data, True
+        audio_data = await self.async_client.tts.bytes(**request)
+        await asyncio.to_thread(cache.put, key, audio_data)
+        return audio_data, False
+
+    async def speak(self, text: str, output_file: str = None, output_format: Union[str, Dict] = None) -> str:
+        self._require_client()
+        output_format = resolve_output_format(output_format)
+        # Reading the embedding may touch the embedding store, so build off-loop
+        request = await asyncio.to_thread(self.manager._current_tts_request, text, output_format)
+        audio_data, self.manager.last_synthesis_cached = await self._synthesize(request)
+
+        if output_file is None:
+            output_file = self.manager._default_output_file(output_format)
+        await asyncio.to_thread(self._write_file, output_file, audio_data)
+        hot_logger.info(f"Audio saved to {output_file}")
+        return output_file
+
+    async def speak_stream(self, text: str, output_file: str = None,
+                           output_format: Union[str, Dict] = None) -> AsyncIterator[bytes]:
+        """
+        Async version of CartesiaVoiceManager.speak_stream: yields raw PCM
+        chunks as they arrive and writes them to a WAV file whose header is
+        patched when the stream ends (headerless PCM for raw profiles).
+        """
+        self._require_client()
+        output_format = resolve_output_format(output_format)
+        with_header = output_format["container"] == "wav"
+        request = await asyncio.to_thread(
+            self.manager._current_tts_request, text, dict(output_format, container="raw")
+        )
+        if output_file is None:
+            output_file = self.manager._default_output_file(output_format)
+
+        started = time.perf_counter()
+        first_chunk_at = None
+        data_size = 0
+        f = await asyncio.to_thread(open, output_file, "wb")
+        try:
+            if with_header:
+                await asyncio.to_thread(f.write, wav_header(output_format["encoding"], output_format["sample_rate"]))
+            async for chunk in await self.async_client.tts.sse(stream=True, **request):
+                audio = chunk["audio"]
+                if first_chunk_at is None:
+                    first_chunk_at = time.perf_counter() - started
+                    hot_logger.info(f"First audio chunk after {first_chunk_at * 1000:.0f} ms")
+                await asyncio.to_thread(f.write, audio)
+                data_size += len(audio)
+                yield audio
+        finally:
+            if with_header:
+                await asyncio.to_thread(patch_wav_header, f, data_size)
+            await asyncio.to_thread(f.close)
+            self.manager.last_stream_stats = {
+                "output_file": output_file,
+                "time_to_first_chunk": first_chunk_at,
+                "total_time": time.perf_counter() - started,
+                "bytes": data_size
+            }
+
+    async def _run_speak_item(self, index: int, item: Dict, semaphore: asyncio.Semaphore) -> Dict:
+        async with semaphore:
+            started = time.perf_counter()
+            result = {"index": index, "output_file": None, "error": None, "cached": False}
+            try:
+                request, output_file = await asyncio.to_thread(self.manager._prepare_item, index, item)
+                audio_data, result["cached"] = await self._synthesize(request)
+                await asyncio.to_thread(self._write_file, output_file, audio_data)
+                result["output_file"] = output_file
+            except Exception as e:
+                logger.error(f"Item {index} failed: {e}")
+                result["error"] = str(e)
+            result["elapsed"] = time.perf_counter() - started
+            return result
+
+    async def speak_many(self, items: Iterable[Dict], max_workers: int = 4, ordered: bool = True) -> List[Dict]:
+        """
+        Async version of CartesiaVoiceManager.speak_many with at most
+        ``max_workers`` requests in flight.
+        """
+        self._require_client()
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+        tasks = [asyncio.ensure_future(self._run_speak_item(index, item, semaphore))
+                 for index, item in enumerate(items)]
+        if ordered:
+            return list(await asyncio.gather(*tasks))
+        return [await task for task in asyncio.as_completed(tasks)]
@@ -0,0 +1,208 @@
+import csv
+import json
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+from loguru import logger
+
+from .output_formats import file_extension, resolve_output_format
+
+
+def read_jobs(path: Path, input_format: str = None) -> Iterator[Tuple[int, Dict]]:
+    """
+    Yields (row number, job) from a JSON Lines or CSV file without reading it all at once.
+    Row numbers start at 1 and count data rows only; blank lines are skipped.
+
+    :param path: Jobs file
+    :param input_format: "jsonl" or "csv", guessed from the extension when None
+    """
+    path = Path(path)
+    input_format = input_format or ("csv" if path.suffix.lower() == ".csv" else "jsonl")
+    with open(path, encoding="utf-8", newline="") as f:
+        if input_format == "csv":
+            for row_number, row in enumerate(csv.DictReader(f), start=1):
+                yield row_number, {k.strip(): v for k, v in row.items() if k and v not in (None, "")}
+        else:
+            row_number = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                row_number += 1
+                try:
+                    job = json.loads(line)
+                except json.JSONDecodeError as e:
+                    job = {"_error": f"Invalid JSON: {e}"}
+                yield row_number, job if isinstance(job, dict) else {"_error": "Row is not a JSON object"}
+
+
+def parse_emotions(value) -> list:
+    """
+    Accepts "positivity:high curiosity:low" (separated by spaces, commas or
+    semicolons), a list of such strings, or a list of {"name", "level"} dicts.
+    """
+    if isinstance(value, str):
+        value = [part for part in re.split(r"[;,\s]+", value) if part]
+    emotions = []
+    for emotion in value:
+        if isinstance(emotion, dict):
+            emotions.append(emotion)
+            continue
+        name, sep, level = str(emotion).partition(":")
+        if not sep:
+            raise ValueError(f"Invalid emotion format: {emotion}. Expected format is emotion:intensity")
+        emotions.append({"name": name.strip().lower(), "level": level.strip().lower()})
+    return emotions
+
+
+def parse_speed(value):
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value.strip().lower()
+    return value
+
+
+def load_manifest(path: Path) -> Dict[str, Dict]:
+    """
+    Latest manifest record per job key. A line cut short by a crash is ignored.
+    """
+    records = {}
+    path = Path(path)
+    if not path.exists():
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record["key"]] = record
+    return records
+
+
+class BatchJob:
+    """
+    Runs a jobs file through CartesiaVoiceManager.iter_speak_many and appends
+    one manifest record per row as results arrive.
+
+    A row is skipped when its output file already exists (unless ``overwrite``).
+    Files are written under a temporary name first, so an existing output is
+    always complete. Rerunning the same command after a crash therefore
+    resumes where it stopped; rows that failed are retried.
+
+    :param manager: CartesiaVoiceManager to synthesize with
+    :param jobs_path: JSON Lines or CSV jobs file
+    :param output_dir: Directory for rows without an "output" path
+    :param manifest_path: Manifest file (JSON Lines), default <jobs file>.manifest.jsonl
+    :param default_format: Output profile for rows without "format"
+    :param overwrite: Synthesize rows even if their output exists
+    """
+
+    def __init__(self, manager, jobs_path: Path, output_dir: Path = None, manifest_path: Path = None,
+                 default_format: str = None, input_format: str = None, overwrite: bool = False):
+        self.manager = manager
+        self.jobs_path = Path(jobs_path)
+        self.output_dir = Path(output_dir) if output_dir else self.jobs_path.parent / f"{self.jobs_path.stem}_audio"
+        self.manifest_path = Path(manifest_path) if manifest_path else \
+            self.jobs_path.with_name(self.jobs_path.name + ".manifest.jsonl")
+        self.default_format = default_format
+        self.input_format = input_format
+        self.overwrite = overwrite
+        self.summary = {"ok": 0, "skipped": 0, "failed": 0}
+        self._voice_ids: Dict[str, str] = {}
+        self._pending: Dict[int, Dict] = {}
+
+    def resolve_voice(self, identifier: str) -> str:
+        """
+        Voice ID for an ID or a unique voice name, see CartesiaVoiceManager.resolve_voice_id;
+        cached per identifier.
+        """
+        voice_id = self._voice_ids.get(identifier)
+        if voice_id is None:
+            voice_id = self._voice_ids[identifier] = self.manager.resolve_voice_id(identifier)
+        return voice_id
+
+    def _item(self, row_number: int, job: Dict) -> Dict:
+        if "_error" in job:
+            raise ValueError(job["_error"])
+        if not job.get("text"):
+            raise ValueError("Row has no text")
+        output_format = resolve_output_format(job.get("format") or self.default_format)
+        key = str(job.get("id") or row_number)
+        output = job.get("output") or str(self.output_dir / f"{key}{file_extension(output_format)}")
+        item = {"text": job["text"], "output_format": output_format, "output_file": output}
+        if job.get("voice"):
+            item["voice"] = self.resolve_voice(job["voice"])
+        if job.get("language"):
+            item["language"] = job["language"]
+        if job.get("speed") is not None:
+            item["speed"] = parse_speed(job["speed"])
+        if job.get("emotions"):
+            item["emotions"] = parse_emotions(job["emotions"])
+        return item
+
+    def _items(self, manifest: Dict[str, Dict], write) -> Iterator[Dict]:
+        """
+        Yields speak_many items for the rows that still need work; rows that
+        are skipped or invalid are written to the manifest directly.
+        """
+        index = 0
+        for row_number, job in read_jobs(self.jobs_path, self.input_format):
+            key = str(job.get("id") or row_number)
+            record = {"key": key, "row": row_number}
+            try:
+                item = self._item(row_number, job)
+            except Exception as e:
+                write(dict(record, status="failed", output_file=None, error=str(e), elapsed=0.0))
+                continue
+
+            output_file = item["output_file"]
+            if not self.overwrite and Path(output_file).exists():
+                previous = manifest.get(key)
+                if not (previous and previous.get("status") in ("ok", "skipped")):
+                    write(dict(record, status="skipped", output_file=output_file, error=None, elapsed=0.0))
+                else:
+                    self.summary["skipped"] += 1
+                continue
+
+            Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+            self._pending[index] = record
+            index += 1
+            yield item
+
+    def run(self, max_workers: int = 4, show_progress: bool = True) -> Dict[str, int]:
+        """
+        Processes the jobs file and returns counts of ok, skipped and failed rows.
+        """
+        manifest = load_manifest(self.manifest_path)
+        started = time.perf_counter()
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, "a", encoding="utf-8") as manifest_file:
+            def write(record: Dict):
+                record["finished_at"] = datetime.now().isoformat(timespec="seconds")
+                manifest_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                manifest_file.flush()
+                self.summary[record["status"]] += 1
+
+            results = self.manager.iter_speak_many(
+                self._items(manifest, write), max_workers=max_workers, show_progress=show_progress
+            )
+            for result in results:
+                record = self._pending.pop(result["index"])
+                write(dict(
+                    record,
+                    status="failed" if result["error"] else "ok",
+                    output_file=result["output_file"],
+                    error=result["error"],
+                    cached=result["cached"],
+                    elapsed=round(result["elapsed"], 4),
+                ))
+
+        elapsed = time.perf_counter() - started
+        logger.info(f"Batch {self.jobs_path}: {self.summary['ok']} generated, {self.summary['skipped']} skipped, "
+                    f"{self.summary['failed']} failed in {elapsed:.1f} s")
+        return dict(self.summary, seconds=elapsed)
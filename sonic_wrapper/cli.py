@@ -1,15 +1,94 @@
 import argparse
 import sys
 from pathlib import Path
-from sonic_api_wrapper import CartesiaVoiceManager, VoiceAccessibility, improve_tts_text
+from .output_formats import DEFAULT_OUTPUT_PROFILE, OUTPUT_PROFILES, file_extension, resolve_output_format
 import os
-from dotenv import load_dotenv
+
+VALID_EMOTIONS = ["anger", "positivity", "surprise", "sadness", "curiosity"]
+VALID_INTENSITIES = ["lowest", "low", "medium", "high", "highest"]
+
+
+def parse_emotion_args(items):
+    """
+    Validates "emotion:intensity" arguments; exits with a message on the first invalid one.
+    """
+    emotions = []
+    for item in items:
+        try:
+            name, level = item.split(':')
+            name = name.strip().lower()
+            level = level.strip().lower()
+            if name not in VALID_EMOTIONS:
+                print(f"Invalid emotion name: {name}. Valid emotions are: {', '.join(VALID_EMOTIONS)}")
+                sys.exit(1)
+            if level not in VALID_INTENSITIES:
+                print(f"Invalid intensity level: {level}. Valid intensities are: {', '.join(VALID_INTENSITIES)}")
+                sys.exit(1)
+            emotions.append({'name': name, 'level': level})
+        except ValueError:
+            print(f"Invalid emotion format: {item}. Expected format is emotion:intensity")
+            sys.exit(1)
+    return emotions
+
+
+def print_voices(voices):
+    if not voices:
+        print("No voices found with the specified filters.")
+    else:
+        for voice in voices:
+            print(f"ID: {voice['id']}, Name: {voice['name']}, Language: {voice['language']}, "
+                  f"Type: {'Custom' if voice.get('is_custom') else 'API'}")
+
+
+def forward_to_daemon(args, path):
+    """
+    Runs list-voices or generate-speech in a daemon started with 'serve'.
+    Returns False when no daemon is listening, so the command runs locally.
+    """
+    from .daemon import DaemonError, DaemonUnavailable, request
+
+    if args.command == 'list-voices':
+        accessibility = {'all': 'all', 'custom': 'only_custom', 'api': 'only_public'}[args.accessibility]
+        payload = {'command': 'list-voices', 'language': args.language, 'accessibility': accessibility}
+    else:
+        payload = {
+            'command': 'generate-speech',
+            'text': args.text,
+            'voice': args.voice,
+            'language': args.language,
+            'speed': args.speed,
+            'emotions': [f"{e['name']}:{e['level']}" for e in parse_emotion_args(args.emotions or [])],
+            'format': args.format,
+            'output': args.output,
+            'cwd': os.getcwd(),
+        }
+    try:
+        result = request(path, payload)
+    except DaemonUnavailable:
+        return False
+    except DaemonError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.command == 'list-voices':
+        print_voices(result)
+    else:
+        print(f"Audio generated and saved to {result['output_file']}")
+    return True
+
 
 def main():
     parser = argparse.ArgumentParser(
         description="Cartesia Voice Manager CLI",
         formatter_class=argparse.RawTextHelpFormatter
     )
+    parser.add_argument('--metrics-port', type=int,
+                        help='Serve Prometheus metrics at http://127.0.0.1:PORT/metrics while the command runs')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help='Minimum log level (default: SONIC_LOG_LEVEL or INFO)')
+    parser.add_argument('--socket',
+                        help='Send list-voices and generate-speech to the daemon listening on this socket\n'
+                             '(see serve), falling back to running them locally (default: SONIC_SOCKET)')
     subparsers = parser.add_subparsers(dest='command', help='Commands')
 
     # Set API key (without --api-key flag)
@@ -29,6 +108,12 @@ def main():
     parser_generate.add_argument('--language', help='Language of the speech (optional)')
     parser_generate.add_argument('--output', help='Output file path (optional)')
     parser_generate.add_argument('--improve-text', action='store_true', help='Improve text before synthesis')
+    parser_generate.add_argument('--format', choices=list(OUTPUT_PROFILES), default=DEFAULT_OUTPUT_PROFILE,
+                                 help='Output format profile (default: %(default)s)\n'
+                                      'hifi-f32-44k: 32-bit float WAV, 44.1 kHz\n'
+                                      'pcm16-24k: 16-bit WAV, 24 kHz\n'
+                                      'telephony-mulaw-8k: mu-law WAV, 8 kHz\n'
+                                      'raw-pcm: headerless 16-bit PCM, 24 kHz')
     parser_generate.add_argument('--speed', type=float, default=0.0,
                                  help='Speech speed (-1 to 1, default: 0.0)')
     parser_generate.add_argument('--emotions', nargs='+', metavar='EMOTION:INTENSITY',
@@ -38,6 +123,53 @@ def main():
                                       'Valid emotions: anger, positivity, surprise, sadness, curiosity\n'
                                       'Valid intensities: lowest, low, medium, high, highest')
 
+    # Synthesize a jobs file
+    parser_batch = subparsers.add_parser(
+        'synth-batch', help='Synthesize every row of a JSONL or CSV jobs file',
+        formatter_class=argparse.RawTextHelpFormatter,
+        description='Each row has "text" and optionally "id", "voice" (ID or name), "language",\n'
+                    '"speed", "emotions" ("positivity:high curiosity:low"), "format" and "output".\n'
+                    'Rows whose output file exists are skipped and every result is appended to\n'
+                    'the manifest, so rerunning the same command resumes an interrupted batch.'
+    )
+    parser_batch.add_argument('input', help='Jobs file (.jsonl or .csv)')
+    parser_batch.add_argument('--input-format', choices=['jsonl', 'csv'],
+                              help='Jobs file format (default: from the file extension)')
+    parser_batch.add_argument('--workers', type=int, default=4, help='Concurrent requests (default: 4)')
+    parser_batch.add_argument('--output-dir',
+                              help='Directory for rows without "output" (default: <input name>_audio)')
+    parser_batch.add_argument('--manifest', help='Results manifest (default: <input>.manifest.jsonl)')
+    parser_batch.add_argument('--voice', help='Voice ID or name for rows without "voice"')
+    parser_batch.add_argument('--language', help='Language for rows without "language"')
+    parser_batch.add_argument('--speed', help='Speed for rows without "speed" (-1 to 1 or slowest..fastest)')
+    parser_batch.add_argument('--emotions', nargs='+', metavar='EMOTION:INTENSITY',
+                              help='Emotions for rows without "emotions"')
+    parser_batch.add_argument('--format', choices=list(OUTPUT_PROFILES), default=DEFAULT_OUTPUT_PROFILE,
+                              help='Output format profile for rows without "format" (default: %(default)s)')
+    parser_batch.add_argument('--overwrite', action='store_true', help='Synthesize rows whose output exists')
+    parser_batch.add_argument('--no-progress', action='store_true', help='Hide the progress bar')
+
+    # Run a warm daemon
+    parser_serve = subparsers.add_parser(
+        'serve', help='Keep a warm client in a daemon that answers CLI requests over a Unix socket'
+    )
+    parser_serve.add_argument('--socket', dest='serve_socket', required=True, help='Socket path, e.g. /run/sonic.sock')
+    parser_serve.add_argument('--max-concurrency', type=int, default=8,
+                              help='Maximum number of syntheses running at once (default: 8)')
+
+    # Run the HTTP synthesis service
+    parser_serve_http = subparsers.add_parser(
+        'serve-http', help='Serve /v1/speak (streaming), /v1/batch and /v1/voices over HTTP'
+    )
+    parser_serve_http.add_argument('--host', default='127.0.0.1', help='Address to bind (default: 127.0.0.1)')
+    parser_serve_http.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080)')
+    parser_serve_http.add_argument('--workers', type=int, default=8,
+                                   help='Maximum number of concurrent syntheses (default: 8)')
+    parser_serve_http.add_argument('--queue-timeout', type=float, default=30.0,
+                                   help='Seconds a request waits for a free worker before a 503 (default: 30)')
+    parser_serve_http.add_argument('--synthesis-cache', action='store_true',
+                                   help='Serve repeated requests from the synthesis cache')
+
     # Create custom voice
     parser_create_voice = subparsers.add_parser('create-voice', help='Create a custom voice')
     parser_create_voice.add_argument('--name', required=True, help='Name of the custom voice')
@@ -48,9 +180,28 @@ def main():
     # Parse arguments
     args = parser.parse_args()
 
+    # Imported after parsing so --help and argument errors don't pay for them
+    from dotenv import load_dotenv
+
     # Load environment variables
     load_dotenv()
 
+    # Thin-client mode: a running daemon already has a warm client, catalog and connection
+    if args.command in ('list-voices', 'generate-speech'):
+        from .daemon import socket_path
+        path = socket_path(args.socket)
+        if path and forward_to_daemon(args, path):
+            sys.exit(0)
+
+    from .sonic_api_wrapper import CartesiaVoiceManager, VoiceAccessibility, improve_tts_text
+
+    from .log_config import configure_logging
+    configure_logging(level=args.log_level)
+
+    if args.metrics_port:
+        from .metrics import serve_metrics
+        serve_metrics(port=args.metrics_port)
+
     # Initialize manager
     manager = CartesiaVoiceManager(base_dir=Path("voice2voice"))
 
@@ -60,8 +211,8 @@ def main():
         print("API key updated and saved to .env file.")
         sys.exit(0)
 
-    # Ensure API key is set
-    if not manager.api_key:
+    # Ensure API key is set (replayed sessions need none)
+    if not manager.api_key and manager.transport.needs_api_key:
         print("API key is not set. Use 'set-api-key' command to set it.")
         sys.exit(1)
 
@@ -76,35 +227,18 @@ def main():
             languages=[args.language] if args.language != 'all' else None,
             accessibility=accessibility
         )
-        if not voices:
-            print("No voices found with the specified filters.")
-        else:
-            for voice in voices:
-                print(f"ID: {voice['id']}, Name: {voice['name']}, Language: {voice['language']}, "
-                      f"Type: {'Custom' if voice.get('is_custom') else 'API'}")
+        print_voices(voices)
         sys.exit(0)
 
     # Handle generate-speech command
     if args.command == 'generate-speech':
-        # Resolve voice ID or name
-        voice_identifier = args.voice
+        # Resolve voice ID or name (local catalog first, then the API listing)
         try:
-            # Try loading by voice ID
-            manager.load_voice(voice_identifier)
-            voice_id = voice_identifier
-        except ValueError:
-            # Try resolving by voice name
-            matching_voice_ids = manager.get_voice_id_by_name(voice_identifier)
-            if not matching_voice_ids:
-                print(f"Voice '{voice_identifier}' not found by ID or name.")
-                sys.exit(1)
-            elif len(matching_voice_ids) > 1:
-                print(f"Multiple voices found with name '{voice_identifier}'. Please specify the voice ID.")
-                for vid in matching_voice_ids:
-                    print(f"- {vid}")
-                sys.exit(1)
-            else:
-                voice_id = matching_voice_ids[0]
+            voice_id = manager.resolve_voice_id(args.voice)
+            manager.load_voice(voice_id)
+        except ValueError as e:
+            print(f"Could not resolve voice '{args.voice}': {e}")
+            sys.exit(1)
 
         # Set the voice
         manager.set_voice(voice_id)
@@ -118,24 +252,7 @@ def main():
 
         # Set emotions if provided
         if args.emotions:
-            emotions = []
-            valid_emotions = ["anger", "positivity", "surprise", "sadness", "curiosity"]
-            valid_intensities = ["lowest", "low", "medium", "high", "highest"]
-            for item in args.emotions:
-                try:
-                    name, level = item.split(':')
-                    name = name.strip().lower()
-                    level = level.strip().lower()
-                    if name not in valid_emotions:
-                        print(f"Invalid emotion name: {name}. Valid emotions are: {', '.join(valid_emotions)}")
-                        sys.exit(1)
-                    if level not in valid_intensities:
-                        print(f"Invalid intensity level: {level}. Valid intensities are: {', '.join(valid_intensities)}")
-                        sys.exit(1)
-                    emotions.append({'name': name, 'level': level})
-                except ValueError:
-                    print(f"Invalid emotion format: {item}. Expected format is emotion:intensity")
-                    sys.exit(1)
+            emotions = parse_emotion_args(args.emotions)
             manager.set_emotions(emotions)
         else:
             manager.set_emotions()
@@ -146,19 +263,76 @@ def main():
             text = improve_tts_text(text, manager.current_language)
 
         # Set output file path
-        output_file = args.output or f"output_{manager.current_language}.wav"
+        output_format = resolve_output_format(args.format)
+        output_file = args.output or f"output_{manager.current_language}{file_extension(output_format)}"
 
         # Generate speech
         try:
             output_path = manager.speak(
                 text=text,
-                output_file=output_file
+                output_file=output_file,
+                output_format=output_format
             )
             print(f"Audio generated and saved to {output_path}")
         except Exception as e:
             print(f"Error generating speech: {e}")
         sys.exit(0)
 
+    # Handle synth-batch command
+    if args.command == 'synth-batch':
+        from .batch_jobs import BatchJob, parse_emotions, parse_speed
+
+        batch = BatchJob(
+            manager,
+            args.input,
+            output_dir=args.output_dir,
+            manifest_path=args.manifest,
+            default_format=args.format,
+            input_format=args.input_format,
+            overwrite=args.overwrite
+        )
+        # Rows fall back to the manager's current settings
+        try:
+            if args.voice:
+                manager.set_voice(batch.resolve_voice(args.voice))
+            if args.language:
+                manager.set_language(args.language)
+            if args.speed is not None:
+                manager.speed = parse_speed(args.speed)
+            if args.emotions:
+                manager.set_emotions(parse_emotions(args.emotions))
+        except Exception as e:
+            print(f"Invalid batch defaults: {e}")
+            sys.exit(1)
+
+        summary = batch.run(max_workers=args.workers, show_progress=not args.no_progress)
+        print(f"{summary['ok']} generated, {summary['skipped']} skipped, {summary['failed']} failed "
+              f"in {summary['seconds']:.1f} s. Manifest: {batch.manifest_path}")
+        sys.exit(1 if summary['failed'] else 0)
+
+    # Handle serve command
+    if args.command == 'serve':
+        from .daemon import SynthesisDaemon
+
+        daemon = SynthesisDaemon(manager, args.serve_socket, max_concurrency=args.max_concurrency)
+        daemon.warm_up()
+        try:
+            daemon.serve_forever()
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    # Handle serve-http command
+    if args.command == 'serve-http':
+        from .http_service import SynthesisService
+
+        if args.synthesis_cache:
+            manager.enable_synthesis_cache()
+        service = SynthesisService(manager, workers=args.workers, queue_timeout=args.queue_timeout)
+        service.serve_forever(host=args.host, port=args.port)
+        sys.exit(0)
+
     # Handle create-voice command
     if args.command == 'create-voice':
         try:
@@ -0,0 +1,234 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .output_formats import file_extension, resolve_output_format
+
+# Default socket of the CLI's thin-client mode, see socket_path()
+SOCKET_ENV = "SONIC_SOCKET"
+
+# Requests and responses are single JSON lines; this bounds a request line
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+class DaemonUnavailable(ConnectionError):
+    """
+    No daemon is listening on the socket.
+    """
+
+
+class DaemonError(RuntimeError):
+    """
+    The daemon received the request but could not carry it out.
+    """
+
+
+def socket_path(path: str = None) -> Optional[str]:
+    return path or os.environ.get(SOCKET_ENV) or None
+
+
+def request(path: str, payload: Dict, timeout: float = 300.0) -> Dict:
+    """
+    Sends one request to a running daemon and returns its result.
+
+    Only the standard library is imported here, so a CLI run that is forwarded
+    to the daemon skips the SDK, the manager and their start-up cost.
+
+    :raises DaemonUnavailable: Nothing is listening on ``path``
+    :raises DaemonError: The daemon reported an error
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise DaemonUnavailable(f"No daemon listening on {path}: {e}")
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise DaemonError("Daemon closed the connection without a response")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise DaemonError(response.get("error") or "Unknown daemon error")
+    return response["result"]
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline(MAX_REQUEST_BYTES)
+        if not line:
+            return
+        try:
+            payload = json.loads(line)
+            response = {"ok": True, "result": self.server.synthesis_daemon.handle(payload)}
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+class SynthesisDaemon:
+    """
+    Long-lived process that keeps a CartesiaVoiceManager (its Cartesia client and
+    HTTP connection, the voice catalog and loaded embeddings) warm and serves CLI
+    requests over a Unix domain socket, one JSON line in and one JSON line out.
+
+    Commands: "ping", "list-voices" and "generate-speech" (see the handle_* methods).
+    Syntheses use per-request settings and never touch the manager's current voice,
+    so concurrent requests don't interfere. Output paths are resolved against the
+    client's working directory and written by the daemon.
+
+    :param manager: CartesiaVoiceManager to serve
+    :param path: Socket path; the socket file is created with mode 0600
+    :param max_concurrency: Maximum number of syntheses running at once
+    """
+
+    def __init__(self, manager, path: str, max_concurrency: int = 8):
+        self.manager = manager
+        self.path = str(path)
+        self.started_at = None
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._server = None
+
+    def warm_up(self):
+        """
+        Creates the client, opens the API connection and fills the voice listing
+        and catalog, so the first request doesn't pay for them.
+        """
+        from loguru import logger
+
+        started = time.perf_counter()
+        if self.manager.client:
+            try:
+                self.manager._list_remote_voices()
+            except Exception as e:
+                logger.warning(f"Daemon warm-up could not list voices: {e}")
+        self.manager.catalog.count()
+        logger.info(f"Daemon warmed up in {time.perf_counter() - started:.2f} s")
+
+    def handle(self, payload: Dict):
+        command = payload.get("command")
+        handler = {
+            "ping": self.handle_ping,
+            "list-voices": self.handle_list_voices,
+            "generate-speech": self.handle_generate_speech,
+        }.get(command)
+        if handler is None:
+            raise ValueError(f"Unknown command: {command}")
+        return handler(payload)
+
+    def handle_ping(self, payload: Dict) -> Dict:
+        return {"pid": os.getpid(), "uptime": time.time() - self.started_at}
+
+    def handle_list_voices(self, payload: Dict) -> list:
+        from .sonic_api_wrapper import VoiceAccessibility
+
+        language = payload.get("language")
+        return self.manager.list_available_voices(
+            languages=[language] if language and language != "all" else None,
+            accessibility=VoiceAccessibility(payload.get("accessibility") or "all")
+        )
+
+    def handle_generate_speech(self, payload: Dict) -> Dict:
+        """
+        payload: {"text", "voice" (ID or name), "language", "speed", "emotions"
+        (list of "name:level"), "format", "output", "cwd"}
+        """
+        from .batch_jobs import parse_emotions, parse_speed
+
+        voice_id = self.manager.resolve_voice_id(payload["voice"])
+        output_format = resolve_output_format(payload.get("format"))
+        output = payload.get("output")
+        if not output:
+            language = payload.get("language") or self.manager.load_voice(voice_id)["language"]
+            output = f"output_{language}{file_extension(output_format)}"
+        item = {
+            "text": payload["text"],
+            "voice": voice_id,
+            "output_format": output_format,
+            "output_file": str(Path(payload.get("cwd") or ".") / output),
+        }
+        if payload.get("language"):
+            item["language"] = payload["language"]
+        if payload.get("speed") is not None:
+            item["speed"] = parse_speed(payload["speed"])
+        if payload.get("emotions"):
+            item["emotions"] = parse_emotions(payload["emotions"])
+
+        with self._slots:
+            result = self.manager._run_speak_item(0, item)
+        if result["error"]:
+            raise DaemonError(result["error"])
+        return {"output_file": result["output_file"], "cached": result["cached"], "elapsed": result["elapsed"]}
+
+    def _claim_socket(self):
+        """
+        Removes a socket file left behind by a daemon that is gone, and refuses
+        to start when another daemon is still listening on it.
+        """
+        if not os.path.exists(self.path):
+            return
+        if not stat.S_ISSOCK(os.stat(self.path).st_mode):
+            raise RuntimeError(f"{self.path} exists and is not a socket")
+        try:
+            request(self.path, {"command": "ping"}, timeout=2.0)
+        except DaemonUnavailable:
+            os.unlink(self.path)
+        except (DaemonError, OSError, ValueError):
+            raise RuntimeError(f"Something is listening on {self.path} but does not answer like a daemon")
+        else:
+            raise RuntimeError(f"A daemon is already listening on {self.path}")
+
+    def serve_forever(self):
+        """
+        Serves requests until interrupted (Ctrl+C or SIGTERM); removes the socket file on exit.
+        """
+        import signal
+        from loguru import logger
+
+        self._claim_socket()
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(self.path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        self._server.synthesis_daemon = self
+        self.started_at = time.time()
+
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, _interrupt)
+        logger.info(f"Daemon listening on {self.path} (pid {os.getpid()})")
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            logger.info("Daemon stopped")
+
+    def shutdown(self):
+        """
+        Stops serve_forever() running in another thread.
+        """
+        if self._server is not None:
+            self._server.shutdown()
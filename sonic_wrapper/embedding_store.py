@@ -0,0 +1,259 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from loguru import logger
+
+# Little-endian float32, the layout of every row in an embeddings.f32 file
+_FLOAT = "<f"
+_FLOAT_SIZE = struct.calcsize(_FLOAT)
+SLOT_KEY = "embedding_slot"
+
+
+class EmbeddingStore:
+    """
+    Append-only file of packed float32 embeddings, read through a shared memory map.
+
+    A voice's metadata record keeps its ``[offset, dim]`` slot; rewriting an
+    embedding with the same dimension reuses the slot in place. Rows that no
+    record references any more are reclaimed by ``compact_voice_dir``.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.touch(exist_ok=True)
+        self._lock = threading.RLock()
+        self._mmap = None
+        # Inode of the mapped file; compact() replaces the file, possibly from another store
+        self._inode = None
+
+    def put(self, embedding: Sequence[float], slot: Optional[Sequence[int]] = None) -> List[int]:
+        """
+        Writes an embedding and returns its ``[offset, dim]`` slot.
+        """
+        dim = len(embedding)
+        data = struct.pack(f"<{dim}f", *embedding)
+        with self._lock:
+            if slot is not None and int(slot[1]) == dim and int(slot[0]) + len(data) <= self.path.stat().st_size:
+                offset = int(slot[0])
+                with open(self.path, "r+b") as f:
+                    f.seek(offset)
+                    f.write(data)
+            else:
+                # O_APPEND keeps concurrent writers from interleaving rows
+                with open(self.path, "ab") as f:
+                    f.write(data)
+                    f.flush()
+                    offset = f.tell() - len(data)
+        return [offset, dim]
+
+    def get(self, offset: int, dim: int) -> List[float]:
+        end = offset + dim * _FLOAT_SIZE
+        with self._lock:
+            if self._mmap is None or len(self._mmap) < end or self.path.stat().st_ino != self._inode:
+                self._remap()
+            if len(self._mmap) < end:
+                raise ValueError(f"Embedding slot [{offset}, {dim}] is outside of {self.path}")
+            return list(struct.unpack_from(f"<{dim}f", self._mmap, offset))
+
+    def _remap(self):
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        self._mmap = None
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self._inode = stat.st_ino
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+
+    def compact(self, slots: Iterable[Sequence[int]]) -> Dict[tuple, List[int]]:
+        """
+        Rewrites the file with only the rows of ``slots`` and returns
+        {(offset, dim): new slot}. Every other row is dropped, so the caller must
+        hold ``self._lock`` until the records point at their new slots.
+        """
+        with self._lock:
+            self._remap()
+            mapping = {}
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                for offset, dim in sorted({(int(offset), int(dim)) for offset, dim in slots}):
+                    end = offset + dim * _FLOAT_SIZE
+                    if end > len(self._mmap):
+                        continue
+                    mapping[(offset, dim)] = [f.tell(), dim]
+                    f.write(self._mmap[offset:end])
+            if isinstance(self._mmap, mmap.mmap):
+                self._mmap.close()
+            self._mmap = None
+            os.replace(tmp_path, self.path)
+            return mapping
+
+    def close(self):
+        with self._lock:
+            if isinstance(self._mmap, mmap.mmap):
+                self._mmap.close()
+            self._mmap = None
+
+
+class LazyVoice(dict):
+    """
+    Voice record whose ``embedding`` is only read from the store when first needed:
+    on ``voice["embedding"]``, ``get("embedding")`` or anything that walks all keys
+    (``keys``, ``items``, ``values``, iteration, ``copy``, ``dict(voice)``).
+    ``"embedding" in voice`` is answered without reading it.
+    """
+
+    def __init__(self, record: Dict, store: EmbeddingStore):
+        super().__init__(record)
+        self._store = store
+
+    def _has_slot(self) -> bool:
+        return not dict.__contains__(self, "embedding") and dict.__contains__(self, SLOT_KEY)
+
+    def load(self):
+        """
+        Reads the embedding now, e.g. before the store is compacted.
+        """
+        if self._has_slot():
+            offset, dim = dict.__getitem__(self, SLOT_KEY)
+            dict.__setitem__(self, "embedding", self._store.get(offset, dim))
+
+    def __missing__(self, key):
+        if key == "embedding" and self._has_slot():
+            self.load()
+            return dict.__getitem__(self, "embedding")
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or (key == "embedding" and self._has_slot())
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        self.load()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        self.load()
+        return dict.__len__(self)
+
+    def keys(self):
+        self.load()
+        return dict.keys(self)
+
+    def items(self):
+        self.load()
+        return dict.items(self)
+
+    def values(self):
+        self.load()
+        return dict.values(self)
+
+    def copy(self) -> Dict:
+        self.load()
+        return dict(dict.items(self))
+
+
+def _write_record(file_path: Path, record: Dict):
+    """
+    Replaces a voice file atomically, so concurrent readers never see half of it.
+    The temporary name doesn't end in .json, so directory scans skip it.
+    """
+    file_path = Path(file_path)
+    tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(record, f, separators=(",", ":"))
+    os.replace(tmp_path, file_path)
+
+
+def _stored_slot(file_path: Path) -> Optional[List[int]]:
+    try:
+        with open(file_path, "r") as f:
+            return json.load(f).get(SLOT_KEY)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def write_voice_file(file_path: Path, voice_data: Dict, store: EmbeddingStore) -> Dict:
+    """
+    Writes a compact metadata record to ``file_path`` and the embedding to ``store``.
+    The embedding goes into the slot held by the file being replaced when it still
+    fits. A slot carried in ``voice_data`` is ignored: it may belong to the voice the
+    data was copied from. Returns the record that was written.
+    """
+    record = {k: v for k, v in dict.items(voice_data) if k not in ("embedding", SLOT_KEY)}
+    embedding = voice_data.get("embedding")
+    if embedding is not None:
+        record[SLOT_KEY] = store.put(embedding, slot=_stored_slot(file_path))
+    _write_record(file_path, record)
+    return record
+
+
+def read_voice_file(file_path: Path, store: EmbeddingStore) -> LazyVoice:
+    """
+    Reads a voice record without touching its embedding.
+    Legacy files with an inline JSON embedding are migrated on the way.
+    """
+    with open(file_path, "r") as f:
+        voice_data = json.load(f)
+    if "embedding" in voice_data:
+        voice_data = write_voice_file(file_path, voice_data, store)
+        logger.info(f"Migrated {file_path} to binary embedding storage")
+    return LazyVoice(voice_data, store)
+
+
+def compact_voice_dir(directory: Path, store: EmbeddingStore) -> int:
+    """
+    Drops the rows of ``store`` that no voice file in ``directory`` references
+    (left behind by removed voices and by embeddings that changed size) and
+    points the files at their new slots. Returns the number of bytes reclaimed.
+    Writes to the store wait until it finishes.
+    """
+    with store._lock:
+        records = {}
+        for file in directory.glob("*.json"):
+            try:
+                with open(file, "r") as f:
+                    record = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable voice file {file}: {e}")
+                continue
+            if SLOT_KEY in record:
+                records[file] = record
+
+        size_before = store.path.stat().st_size
+        mapping = store.compact(record[SLOT_KEY] for record in records.values())
+        for file, record in records.items():
+            slot = mapping.get(tuple(int(value) for value in record[SLOT_KEY]))
+            if slot is None:
+                logger.warning(f"Voice file {file} points outside of {store.path}")
+            elif slot != record[SLOT_KEY]:
+                _write_record(file, dict(record, **{SLOT_KEY: slot}))
+        reclaimed = size_before - store.path.stat().st_size
+
+    logger.info(f"Compacted {store.path}: {len(mapping)} embeddings kept, {reclaimed} bytes reclaimed")
+    return reclaimed
+
+
+def migrate_voice_dir(directory: Path, store: EmbeddingStore) -> int:
+    """
+    Converts every legacy voice file in ``directory``; returns the number converted.
+    """
+    migrated = 0
+    for file in directory.glob("*.json"):
+        try:
+            with open(file, "r") as f:
+                voice_data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable voice file {file}: {e}")
+            continue
+        if "embedding" in voice_data:
+            write_voice_file(file, voice_data, store)
+            migrated += 1
+    logger.info(f"Migrated {migrated} voice files in {directory} to binary embedding storage")
+    return migrated
@@ -0,0 +1,391 @@
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from loguru import logger
+
+from .batch_jobs import parse_emotions, parse_speed
+from .output_formats import resolve_output_format
+from .wav import wav_header
+
+# Placeholder sizes of a streamed WAV header: players read until the connection closes
+STREAMING_WAV_DATA_SIZE = 0xFFFFFFFF - 36
+
+# Voice names remembered by SynthesisService.resolve_voice
+MAX_VOICE_NAMES = 1024
+CONTENT_TYPES = {"wav": "audio/wav", "raw": "application/octet-stream"}
+
+
+class BadRequest(ValueError):
+    """
+    The request is malformed or names an unknown voice (answered with 400).
+    """
+
+
+class ServiceBusy(Exception):
+    """
+    No synthesis slot became free within the queue timeout.
+    """
+
+
+class SynthesisService:
+    """
+    HTTP front end for a CartesiaVoiceManager, meant to run behind other services.
+
+    Endpoints:
+
+    - ``POST /v1/speak``: JSON {"text", "voice" (ID or name), "language", "speed",
+      "emotions", "format", "stream"}. Streams the audio back as it is generated
+      (chunked transfer, WAV header first for WAV profiles); with "stream": false
+      the complete file is returned with a Content-Length.
+    - ``POST /v1/batch``: JSON {"items": [...]} with the same fields per item (plus an
+      optional "id"). Results are streamed back as JSON Lines in completion order:
+      {"index", "id", "error", "cached", "elapsed", "format", "audio" (base64)}.
+    - ``GET /v1/voices``: voices from the local catalog; ``language``, ``custom``
+      and ``public`` query parameters filter them.
+    - ``GET /v1/health`` and ``GET /metrics`` (Prometheus text).
+
+    All requests share the manager, so its client (and its HTTP connection pool),
+    catalog, loaded embeddings and synthesis cache stay warm. At most ``workers``
+    syntheses run at once across all requests; a request that cannot get a slot
+    within ``queue_timeout`` seconds is answered with 503.
+
+    :param manager: CartesiaVoiceManager to serve
+    :param workers: Maximum number of concurrent syntheses
+    :param queue_timeout: Seconds a request may wait for a synthesis slot
+    :param max_batch_items: Largest accepted batch
+    :param max_body_bytes: Largest accepted request body
+    """
+
+    def __init__(self, manager, workers: int = 8, queue_timeout: float = 30.0, max_batch_items: int = 256,
+                 max_body_bytes: int = 4 * 1024 * 1024):
+        self.manager = manager
+        self.workers = max(1, workers)
+        self.queue_timeout = queue_timeout
+        self.max_batch_items = max_batch_items
+        self.max_body_bytes = max_body_bytes
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        # Resolved voice names (LRU), dropped whenever the voice catalog changes
+        self._voice_ids = OrderedDict()
+        self._voice_ids_version = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # ------------------------------------------------------------------ server
+
+    def _create_server(self, host: str, port: int) -> ThreadingHTTPServer:
+        handler = type("ServiceHandler", (_ServiceHandler,), {"service": self})
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+        return server
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Serves from a daemon thread and returns the base URL (pass port=0 for a free port).
+        """
+        self._server = self._create_server(host, port)
+        threading.Thread(target=self._server.serve_forever, name="synthesis-service", daemon=True).start()
+        logger.info(f"Synthesis service listening on {self.base_url}")
+        return self.base_url
+
+    def serve_forever(self, host: str = "127.0.0.1", port: int = 8080):
+        """
+        Serves from the calling thread until interrupted.
+        """
+        self._server = self._create_server(host, port)
+        logger.info(f"Synthesis service listening on {self.base_url} with {self.workers} workers")
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+            self._server = None
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def base_url(self) -> Optional[str]:
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "SynthesisService":
+        if self._server is None:
+            self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------------------------------------------------------------- synthesis
+
+    def _acquire(self):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise ServiceBusy(f"All {self.workers} synthesis workers are busy")
+        with self._lock:
+            self._in_flight += 1
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def resolve_voice(self, identifier: str) -> str:
+        """
+        Voice ID for a voice ID or name. Only names that resolved are remembered,
+        so a voice created or synced later under a requested name is found.
+        """
+        version = self.manager.catalog.version
+        with self._lock:
+            if version != self._voice_ids_version:
+                self._voice_ids.clear()
+                self._voice_ids_version = version
+            voice_id = self._voice_ids.get(identifier)
+            if voice_id is not None:
+                self._voice_ids.move_to_end(identifier)
+                return voice_id
+
+        voice_id = self.manager.resolve_voice_id(identifier)
+        if voice_id != identifier:
+            with self._lock:
+                self._voice_ids[identifier] = voice_id
+                while len(self._voice_ids) > MAX_VOICE_NAMES:
+                    self._voice_ids.popitem(last=False)
+        return voice_id
+
+    def item_from_request(self, body: Dict) -> Dict:
+        """
+        Validates a speak request (or batch item) and converts it to a speak_many item.
+
+        :raises BadRequest: Missing text or voice, unknown voice, invalid speed, emotions or format
+        """
+        if not isinstance(body, dict) or not isinstance(body.get("text"), str) or not body["text"].strip():
+            raise BadRequest("Request needs a non-empty 'text'")
+        if not body.get("voice"):
+            raise BadRequest("Request needs a 'voice' (voice ID or name)")
+        try:
+            item = {
+                "text": body["text"],
+                "voice": self.resolve_voice(body["voice"]),
+                "output_format": resolve_output_format(body.get("format")),
+            }
+            self.manager.load_voice(item["voice"])
+            if body.get("language"):
+                item["language"] = body["language"]
+            if body.get("speed") is not None:
+                item["speed"] = self.manager._parse_speed(parse_speed(body["speed"]))
+            if body.get("emotions"):
+                item["emotions"] = parse_emotions(body["emotions"])
+                self.manager._parse_emotions(item["emotions"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise BadRequest(str(e))
+        return item
+
+    def synthesize(self, item: Dict) -> tuple:
+        """
+        Returns (audio_data, cached) for a complete file in the item's output format.
+        """
+        self._acquire()
+        try:
+            return self.manager.synthesize_item(item)
+        finally:
+            self._release()
+
+    def stream(self, item: Dict) -> Iterator[bytes]:
+        """
+        Yields the item's audio as it arrives, starting with a WAV header for WAV profiles.
+        The synthesis slot is held until the stream is exhausted or closed.
+        """
+        output_format = item["output_format"]
+        self._acquire()
+        try:
+            chunks, _ = self.manager.stream_item(item)
+            chunks = iter(chunks)
+            # Nothing is yielded until the first audio arrives, so early failures can still get a status code
+            first = next(chunks, b"")
+            if output_format["container"] == "wav":
+                yield wav_header(output_format["encoding"], output_format["sample_rate"], STREAMING_WAV_DATA_SIZE)
+            yield first
+            yield from chunks
+        finally:
+            self._release()
+
+    def batch(self, items: List[Dict]) -> Iterator[Dict]:
+        """
+        Synthesizes batch items concurrently (bounded by the shared worker slots)
+        and yields one result per item in completion order.
+        """
+        def run(index: int, body: Dict) -> Dict:
+            started = time.perf_counter()
+            result = {"index": index, "id": body.get("id") if isinstance(body, dict) else None,
+                      "error": None, "cached": False, "format": None, "audio": None}
+            try:
+                item = self.item_from_request(body)
+                audio, result["cached"] = self.synthesize(item)
+                result["format"] = item["output_format"]
+                result["audio"] = base64.b64encode(audio).decode("ascii")
+            except Exception as e:
+                result["error"] = str(e)
+            result["elapsed"] = time.perf_counter() - started
+            return result
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(items))),
+                                thread_name_prefix="service-batch") as executor:
+            futures = [executor.submit(run, index, body) for index, body in enumerate(items)]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def list_voices(self, query: Dict[str, List[str]]) -> List[Dict]:
+        def flag(name: str) -> Optional[bool]:
+            value = query.get(name, [None])[0]
+            return None if value is None else value.lower() in ("1", "true", "yes")
+
+        languages = [lang for value in query.get("language", []) for lang in value.split(",") if lang] or None
+        return self.manager.catalog.query(languages=languages, is_custom=flag("custom"), is_public=flag("public"))
+
+    def health(self) -> Dict:
+        with self._lock:
+            in_flight = self._in_flight
+        return {"status": "ok", "workers": self.workers, "in_flight": in_flight}
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    service: SynthesisService = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logger.debug(f"synthesis service: {format % args}")
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/v1/voices":
+            self._send_json(200, self.service.list_voices(parse_qs(url.query)))
+        elif url.path == "/v1/health":
+            self._send_json(200, self.service.health())
+        elif url.path == "/metrics":
+            body = self.service.manager.metrics.registry.to_prometheus().encode("utf-8")
+            self._send(200, body, "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._send_json(404, {"error": f"No route for GET {url.path}"})
+
+    def do_POST(self):
+        self._headers_started = False
+        path = urlsplit(self.path).path
+        if path not in ("/v1/speak", "/v1/batch"):
+            self._send_json(404, {"error": f"No route for POST {path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > self.service.max_body_bytes:
+            self._send_json(413, {"error": f"Request body larger than {self.service.max_body_bytes} bytes"})
+            self.close_connection = True
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+        except json.JSONDecodeError as e:
+            self._send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+
+        try:
+            if path == "/v1/speak":
+                self._speak(body)
+            else:
+                self._batch(body)
+        except BadRequest as e:
+            self._send_json(400, {"error": str(e)})
+        except ServiceBusy as e:
+            self._send_json(503, {"error": str(e)}, {"Retry-After": "1"})
+        except Exception as e:
+            logger.error(f"Synthesis service request failed: {e}")
+            self._send_json(502, {"error": str(e)})
+
+    def _speak(self, body: Dict):
+        item = self.service.item_from_request(body)
+        content_type = CONTENT_TYPES[item["output_format"]["container"]]
+        headers = {"X-Sample-Rate": str(item["output_format"]["sample_rate"]),
+                   "X-Encoding": item["output_format"]["encoding"]}
+        if not body.get("stream", True):
+            audio, cached = self.service.synthesize(item)
+            self._send(200, audio, content_type, dict(headers, **{"X-Cached": str(cached).lower()}))
+            return
+
+        chunks = self.service.stream(item)
+        try:
+            # Errors before the first chunk still get a proper status code
+            first = next(chunks, b"")
+            self._start_chunked(content_type, headers)
+            self._write_chunk(first)
+            for chunk in chunks:
+                self._write_chunk(chunk)
+            self._end_chunked()
+        except (BrokenPipeError, ConnectionResetError):
+            logger.debug("Synthesis service client went away mid-stream")
+            self.close_connection = True
+        except Exception as e:
+            if not self._headers_started:
+                raise
+            # The status line is gone; ending without the terminating chunk marks the body as incomplete
+            logger.error(f"Stream failed after it started: {e}")
+            self.close_connection = True
+        finally:
+            chunks.close()
+
+    def _batch(self, body: Dict):
+        items = body.get("items") if isinstance(body, dict) else None
+        if not isinstance(items, list) or not items:
+            raise BadRequest("Request needs a non-empty 'items' list")
+        if len(items) > self.service.max_batch_items:
+            raise BadRequest(f"Batch larger than {self.service.max_batch_items} items")
+        self._start_chunked("application/x-ndjson")
+        try:
+            for result in self.service.batch(items):
+                self._write_chunk(json.dumps(result).encode("utf-8") + b"\n")
+            self._end_chunked()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    # ----------------------------------------------------------------- helpers
+
+    _headers_started = False
+
+    def _start_chunked(self, content_type: str, headers: Dict[str, str] = None):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self._headers_started = True
+
+    def _write_chunk(self, data: bytes):
+        if data:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+    def _end_chunked(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, payload, headers: Dict[str, str] = None):
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json", headers)
+
+    def _send(self, status: int, data: bytes, content_type: str, headers: Dict[str, str] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
@@ -0,0 +1,114 @@
+import inspect
+import time
+from typing import Any
+
+from .metrics import WrapperMetrics
+
+
+def _audio_size(result: Any) -> int:
+    return len(result) if isinstance(result, (bytes, bytearray)) else 0
+
+
+class _InstrumentedResource:
+    """
+    Proxy of ``client.voices`` / ``client.tts`` that records every method call.
+    """
+
+    def __init__(self, name: str, resource: Any, metrics: WrapperMetrics):
+        self._name = name
+        self._resource = resource
+        self._metrics = metrics
+
+    def __getattr__(self, attribute: str):
+        target = getattr(self._resource, attribute)
+        if not callable(target):
+            return target
+        endpoint = f"{self._name}.{attribute}"
+
+        def call(*args, **kwargs):
+            started = self._before(endpoint, kwargs)
+            try:
+                result = target(*args, **kwargs)
+            except Exception:
+                self._metrics.api_errors.inc(endpoint=endpoint)
+                raise
+            if inspect.isawaitable(result):
+                return self._await(endpoint, result, started)
+            if inspect.isgenerator(result):
+                return self._wrap_stream(endpoint, result, started)
+            self._after(endpoint, result, started)
+            return result
+        return call
+
+    def _before(self, endpoint: str, kwargs: dict) -> float:
+        self._metrics.api_calls.inc(endpoint=endpoint)
+        transcript = kwargs.get("transcript")
+        if transcript:
+            self._metrics.characters.inc(len(transcript), endpoint=endpoint)
+        return time.perf_counter()
+
+    def _after(self, endpoint: str, result: Any, started: float):
+        self._metrics.api_latency.observe(time.perf_counter() - started, endpoint=endpoint)
+        size = _audio_size(result)
+        if size:
+            self._metrics.audio_bytes.inc(size, endpoint=endpoint)
+
+    async def _await(self, endpoint: str, awaitable, started: float):
+        try:
+            result = await awaitable
+        except Exception:
+            self._metrics.api_errors.inc(endpoint=endpoint)
+            raise
+        if hasattr(result, "__aiter__"):
+            return self._wrap_async_stream(endpoint, result, started)
+        self._after(endpoint, result, started)
+        return result
+
+    def _chunk(self, endpoint: str, chunk: Any, started: float, first: bool):
+        if first:
+            # Streams report their time to first chunk as latency
+            self._metrics.api_latency.observe(time.perf_counter() - started, endpoint=endpoint)
+        audio = chunk.get("audio") if isinstance(chunk, dict) else chunk
+        size = _audio_size(audio)
+        if size:
+            self._metrics.audio_bytes.inc(size, endpoint=endpoint)
+
+    def _wrap_stream(self, endpoint: str, stream, started: float):
+        first = True
+        try:
+            for chunk in stream:
+                self._chunk(endpoint, chunk, started, first)
+                first = False
+                yield chunk
+        except GeneratorExit:
+            stream.close()
+            raise
+        except Exception:
+            self._metrics.api_errors.inc(endpoint=endpoint)
+            raise
+
+    async def _wrap_async_stream(self, endpoint: str, stream, started: float):
+        first = True
+        try:
+            async for chunk in stream:
+                self._chunk(endpoint, chunk, started, first)
+                first = False
+                yield chunk
+        except Exception:
+            self._metrics.api_errors.inc(endpoint=endpoint)
+            raise
+
+
+class InstrumentedClient:
+    """
+    Wraps a Cartesia (or AsyncCartesia) client so calls made through ``voices``
+    and ``tts`` update the manager's metrics. Everything else is passed through.
+    """
+
+    def __init__(self, client: Any, metrics: WrapperMetrics):
+        self.wrapped = client
+        self.voices = _InstrumentedResource("voices", client.voices, metrics)
+        self.tts = _InstrumentedResource("tts", client.tts, metrics)
+
+    def __getattr__(self, attribute: str):
+        return getattr(self.wrapped, attribute)
@@ -0,0 +1,70 @@
+import os
+import random
+import sys
+import threading
+from typing import Optional
+
+from loguru import logger
+
+LOG_FILE = "cartesia_voice_manager.log"
+
+# Messages logged for every synthesis or voice switch; sampled by the sinks below
+hot_logger = logger.bind(hot_path=True)
+
+_lock = threading.Lock()
+_configured = False
+_sink_ids = []
+
+
+def _sampling_filter(rate: float):
+    def keep(record) -> bool:
+        return not record["extra"].get("hot_path") or rate >= 1.0 or random.random() < rate
+    return keep
+
+
+def configure_logging(level: str = None, hot_path_sample_rate: float = None, log_file: Optional[str] = LOG_FILE,
+                      rotation: str = "10 MB", force: bool = False) -> bool:
+    """
+    Sets up the package's log sinks once per process; later calls are no-ops unless ``force``.
+
+    Records are written by loguru's queue worker thread (``enqueue=True``), so
+    logging never blocks the caller on file or terminal I/O. loguru's default
+    stderr handler is replaced by an enqueued one with the same level.
+
+    :param level: Minimum level, default SONIC_LOG_LEVEL or "INFO"
+    :param hot_path_sample_rate: Fraction of hot-path messages (per synthesis or
+        voice switch, see ``hot_logger``) that are kept, default SONIC_LOG_SAMPLE_RATE or 1.0
+    :param log_file: Rotating log file, default SONIC_LOG_FILE or cartesia_voice_manager.log; None disables it
+    :param rotation: Size or interval at which the log file is rotated
+    :param force: Replace the sinks set up by an earlier call
+    :return: True when the sinks were (re)configured
+    """
+    global _configured
+    with _lock:
+        if _configured and not force:
+            return False
+
+        level = (level or os.environ.get("SONIC_LOG_LEVEL") or "INFO").upper()
+        if hot_path_sample_rate is None:
+            hot_path_sample_rate = float(os.environ.get("SONIC_LOG_SAMPLE_RATE", 1.0))
+        if log_file == LOG_FILE:
+            log_file = os.environ.get("SONIC_LOG_FILE") or LOG_FILE
+        keep = _sampling_filter(hot_path_sample_rate)
+
+        for sink_id in _sink_ids:
+            logger.remove(sink_id)
+        _sink_ids.clear()
+        if not _configured:
+            try:
+                logger.remove(0)  # loguru's default, synchronous stderr handler
+            except ValueError:
+                pass  # already removed by the application
+
+        if sys.stderr is not None:
+            _sink_ids.append(logger.add(sys.stderr, level=level, filter=keep, enqueue=True))
+        if log_file:
+            # The file is only created once something is logged
+            _sink_ids.append(logger.add(log_file, level=level, filter=keep, rotation=rotation,
+                                        enqueue=True, delay=True))
+        _configured = True
+        return True
@@ -0,0 +1,237 @@
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Tuple[str, ...], labelvalues: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing value per label combination.
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def exposition(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self.snapshot().items())]
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in cumulative buckets, with their count and sum.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), count, sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0, 0.0]
+            entry[0][index] += 1
+            entry[1] += 1
+            entry[2] += value
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict]:
+        with self._lock:
+            result = {}
+            for key, (counts, count, total) in self._values.items():
+                cumulative, running = {}, 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    running += bucket_count
+                    cumulative[bound] = running
+                result[key] = {"buckets": cumulative, "count": count, "sum": total}
+            return result
+
+    def exposition(self) -> List[str]:
+        lines = []
+        for key, data in sorted(self.snapshot().items()):
+            for bound, count in data["buckets"].items():
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {count}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {data['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(data['sum'])}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named counters and histograms, readable as a dict or in Prometheus text format.
+    Asking for an existing name returns the registered metric, so several
+    managers can share one registry.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Iterable[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Current values as {metric name: {label values tuple: value}}.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def to_prometheus(self) -> str:
+        """
+        Renders all metrics in the Prometheus text exposition format (version 0.0.4).
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.exposition())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry used by managers unless they are given their own
+REGISTRY = MetricsRegistry()
+
+
+class WrapperMetrics:
+    """
+    The metrics recorded by the voice managers, registered in ``registry``.
+    """
+
+    def __init__(self, registry: MetricsRegistry = None):
+        self.registry = registry or REGISTRY
+        self.api_calls = self.registry.counter(
+            "sonic_api_calls_total", "Cartesia API calls by endpoint", ["endpoint"])
+        self.api_errors = self.registry.counter(
+            "sonic_api_errors_total", "Cartesia API calls that raised, by endpoint", ["endpoint"])
+        self.api_latency = self.registry.histogram(
+            "sonic_api_request_seconds",
+            "Cartesia API call latency by endpoint; time to first chunk for streams", ["endpoint"])
+        self.audio_bytes = self.registry.counter(
+            "sonic_audio_bytes_total", "Bytes of audio received from the API", ["endpoint"])
+        self.characters = self.registry.counter(
+            "sonic_characters_synthesized_total", "Transcript characters sent for synthesis", ["endpoint"])
+        self.cache_hits = self.registry.counter(
+            "sonic_cache_hits_total", "Cache hits by cache", ["cache"])
+        self.cache_misses = self.registry.counter(
+            "sonic_cache_misses_total", "Cache misses by cache", ["cache"])
+
+    def cache_event(self, cache: str, hit: bool):
+        (self.cache_hits if hit else self.cache_misses).inc(cache=cache)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return self.registry.snapshot()
+
+    def to_prometheus(self) -> str:
+        return self.registry.to_prometheus()
+
+
+def _metrics_handler(registry: MetricsRegistry):
+    # http.server is imported here so importing the package stays cheap
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(f"metrics endpoint: {format % args}")
+
+    return MetricsHandler
+
+
+def serve_metrics(port: int = 9464, host: str = "127.0.0.1",
+                  registry: Optional[MetricsRegistry] = None) -> "ThreadingHTTPServer":
+    """
+    Serves ``registry`` at http://host:port/metrics from a daemon thread.
+    Call ``shutdown()`` on the returned server to stop it.
+    """
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), _metrics_handler(registry or REGISTRY))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+    logger.info(f"Serving metrics at http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,174 @@
+import hashlib
+import os
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from loguru import logger
+
+MIX_CACHE_FILE = "mix_cache.sqlite3"
+# Normalized weights are rounded so that 0.1 + 0.2 and 0.3 give the same recipe
+WEIGHT_DIGITS = 9
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def component_key(component: Dict) -> str:
+    """
+    Canonical name of one mix component: ``id:<voice id>``, ``file:<sha256 of the clip>``
+    or ``embedding:<sha256 of the float32 embedding>``.
+    """
+    source = component.get('id') or component.get('path')
+    if isinstance(source, str):
+        if os.path.isfile(source):
+            return f"file:{_file_digest(source)}"
+        return f"id:{source}"
+    embedding = component.get('embedding')
+    if embedding is None:
+        raise ValueError(f"Mix component has no id, path or embedding: {component}")
+    return "embedding:" + hashlib.sha256(struct.pack(f"<{len(embedding)}f", *embedding)).hexdigest()
+
+
+def mix_key(components: Sequence[Dict], method: str = "api") -> tuple:
+    """
+    Content address of a mix recipe: how it is mixed ("api", "local" or "verify",
+    so one method's result is never served for another), its components in
+    canonical order and their normalized weights (repeated components are merged).
+
+    :return: (key, voice ids referenced by the recipe)
+    """
+    weights = {}
+    for component in components:
+        name = component_key(component)
+        weights[name] = weights.get(name, 0.0) + float(component['weight'])
+    if not weights:
+        raise ValueError("Cannot create mixed embedding without components.")
+    total = sum(weights.values())
+    if not total:
+        raise ValueError("Mix weights must not sum to zero.")
+    recipe = f"{method}|" + ";".join(f"{name}={round(weight / total, WEIGHT_DIGITS)!r}" for name, weight in sorted(weights.items()))
+    voice_ids = sorted(name[3:] for name in weights if name.startswith("id:"))
+    return hashlib.sha256(recipe.encode("utf-8")).hexdigest(), voice_ids
+
+
+class MixCache:
+    """
+    Persistent memo of mixed embeddings keyed by ``mix_key``.
+
+    Entries live in one SQLite file as packed float32 rows with last-access times;
+    the least recently used are evicted once there are more than ``max_entries``.
+    The most recently used are also kept in memory. Entries that reference a voice
+    id are dropped with ``forget_voice`` when that voice changes.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 10000, memory_entries: int = 256):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS mixes "
+                "(key TEXT PRIMARY KEY, embedding BLOB NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_mixes_access ON mixes (last_access)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS mix_voices (key TEXT NOT NULL, voice_id TEXT NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_mix_voices_key ON mix_voices (key)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_mix_voices_voice ON mix_voices (voice_id)")
+
+    def _remember(self, key: str, embedding: List[float]):
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            embedding = self._memory.get(key)
+            if embedding is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return list(embedding)
+
+            row = self._conn.execute("SELECT embedding FROM mixes WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE mixes SET last_access = ? WHERE key = ?", (time.time(), key))
+            embedding = list(struct.unpack(f"<{len(row[0]) // 4}f", row[0]))
+            self._remember(key, embedding)
+            self._stats["disk_hits"] += 1
+            return list(embedding)
+
+    def put(self, key: str, embedding: Sequence[float], voice_ids: Sequence[str] = ()):
+        data = struct.pack(f"<{len(embedding)}f", *embedding)
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO mixes (key, embedding, last_access) VALUES (?, ?, ?)",
+                    (key, data, time.time())
+                )
+                self._conn.execute("DELETE FROM mix_voices WHERE key = ?", (key,))
+                self._conn.executemany("INSERT INTO mix_voices (key, voice_id) VALUES (?, ?)",
+                                       [(key, voice_id) for voice_id in voice_ids])
+            # Keep what a later get() returns: the float32 values read back from disk
+            self._remember(key, list(struct.unpack(f"<{len(embedding)}f", data)))
+            self._evict()
+
+    def _drop(self, keys: List[str]):
+        with self._conn:
+            self._conn.executemany("DELETE FROM mixes WHERE key = ?", [(key,) for key in keys])
+            self._conn.executemany("DELETE FROM mix_voices WHERE key = ?", [(key,) for key in keys])
+        for key in keys:
+            self._memory.pop(key, None)
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM mixes").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        keys = [key for (key,) in self._conn.execute(
+            "SELECT key FROM mixes ORDER BY last_access LIMIT ?", (count - self.max_entries,)
+        ).fetchall()]
+        self._drop(keys)
+        self._stats["evictions"] += len(keys)
+        logger.info(f"Mix cache evicted {len(keys)} entries")
+
+    def forget_voice(self, voice_id: str) -> int:
+        """
+        Drops every mix that uses the voice, returns how many were dropped.
+        """
+        with self._lock:
+            keys = [key for (key,) in self._conn.execute(
+                "SELECT DISTINCT key FROM mix_voices WHERE voice_id = ?", (voice_id,)
+            ).fetchall()]
+            if keys:
+                self._drop(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM mixes")
+                self._conn.execute("DELETE FROM mix_voices")
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_entries"] = self._conn.execute("SELECT COUNT(*) FROM mixes").fetchone()[0]
+            return stats
@@ -0,0 +1,35 @@
+from typing import Dict, Union
+
+# Named Cartesia output formats. Bytes per second of audio:
+#   hifi-f32-44k        176 400  (the original default)
+#   pcm16-24k            48 000
+#   telephony-mulaw-8k    8 000
+#   raw-pcm              48 000  (headerless 16-bit PCM, for piping into players)
+OUTPUT_PROFILES = {
+    "hifi-f32-44k": {"container": "wav", "encoding": "pcm_f32le", "sample_rate": 44100},
+    "pcm16-24k": {"container": "wav", "encoding": "pcm_s16le", "sample_rate": 24000},
+    "telephony-mulaw-8k": {"container": "wav", "encoding": "pcm_mulaw", "sample_rate": 8000},
+    "raw-pcm": {"container": "raw", "encoding": "pcm_s16le", "sample_rate": 24000},
+}
+DEFAULT_OUTPUT_PROFILE = "hifi-f32-44k"
+
+
+def resolve_output_format(output_format: Union[str, Dict, None] = None) -> Dict:
+    """
+    Returns the Cartesia output_format dict for a profile name or an explicit format dict.
+    None selects DEFAULT_OUTPUT_PROFILE.
+    """
+    if output_format is None:
+        output_format = DEFAULT_OUTPUT_PROFILE
+    if isinstance(output_format, dict):
+        missing = {"container", "encoding", "sample_rate"} - set(output_format)
+        if missing:
+            raise ValueError(f"Output format is missing keys: {sorted(missing)}")
+        return dict(output_format)
+    if output_format not in OUTPUT_PROFILES:
+        raise ValueError(f"Unknown output format: {output_format}. Choose from: {list(OUTPUT_PROFILES)}")
+    return dict(OUTPUT_PROFILES[output_format])
+
+
+def file_extension(output_format: Dict) -> str:
+    return ".wav" if output_format["container"] == "wav" else ".pcm"
@@ -0,0 +1,17 @@
+import functools
+from typing import Optional
+
+
+@functools.lru_cache(maxsize=None)
+def cartesia_class(asynchronous: bool = False) -> Optional[type]:
+    """
+    Returns the Cartesia (or AsyncCartesia) client class, importing the SDK on
+    first use. The SDK pulls in aiohttp, httpx and requests, which is most of
+    the package's import time, so commands that never reach the API skip it.
+    Returns None when the SDK is not installed.
+    """
+    try:
+        from cartesia import AsyncCartesia, Cartesia
+    except ImportError:
+        return None
+    return AsyncCartesia if asynchronous else Cartesia
@@ -1,18 +1,33 @@
 import os
-import json
+import threading
 from pathlib import Path
-from typing import List, Dict, Union, Optional
+from typing import Iterable, Iterator, List, Dict, Union, Optional
 from enum import Enum
-from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from loguru import logger
-from datetime import datetime
-import re
-from dotenv import load_dotenv
-
-try:
-    from cartesia import Cartesia
-except ImportError:
-    Cartesia = None  # Handle the case where Cartesia is not installed
+import time
+
+from .embedding_store import (
+    EmbeddingStore, LazyVoice, compact_voice_dir, read_voice_file, write_voice_file, migrate_voice_dir
+)
+from .instrumented_client import InstrumentedClient
+from .log_config import configure_logging, hot_logger
+from .metrics import MetricsRegistry, WrapperMetrics
+from .mix_cache import MIX_CACHE_FILE, MixCache, mix_key
+from .sdk import cartesia_class
+from .transport import Transport
+from .ttl_cache import TTLCache
+from .voice_catalog import VoiceCatalog
+from .voice_sync import VoiceSync
+from .output_formats import DEFAULT_OUTPUT_PROFILE, OUTPUT_PROFILES, file_extension, resolve_output_format
+from .synthesis_cache import SynthesisCache, synthesis_key
+from .text_chunking import split_text
+from .text_normalization import improve_tts_text
+from .voice_mixing import local_mixing_available, max_difference, mix_matrix, numpy_module
+from .wav import wav_header, patch_wav_header, join_pcm
+
+# Marks a client that has not been created yet, see CartesiaVoiceManager.client
+_UNSET = object()
 
 class VoiceAccessibility(Enum):
     ALL = "all"
@@ -30,26 +45,43 @@ class CartesiaVoiceManager:
     }
     EMOTION_NAMES = ["anger", "positivity", "surprise", "sadness", "curiosity"]
     EMOTION_LEVELS = ["lowest", "low", "omit", "high", "highest"]
-
-    def __init__(self, api_key: str = None, base_dir: Path = None):
+    OUTPUT_PROFILES = OUTPUT_PROFILES
+    OUTPUT_FORMAT = OUTPUT_PROFILES[DEFAULT_OUTPUT_PROFILE]
+    # Seconds to mix through the API after local_mixing="verify" could not run its check
+    LOCAL_MIXING_RETRY_AFTER = 300.0
+
+    def __init__(self, api_key: str = None, base_dir: Path = None, voices_cache_ttl: float = 300.0,
+                 metrics: MetricsRegistry = None, transport: Transport = None, local_mixing: Union[bool, str] = False,
+                 mix_cache_entries: int = 10000):
         # Load environment variables from .env file
+        from dotenv import load_dotenv
         load_dotenv()
 
+        # API call, latency, audio and cache metrics; the process-wide registry unless given one
+        self.metrics = WrapperMetrics(metrics)
+        # Live API by default; SONIC_TRANSPORT=record:<file> / replay:<file> switches it
+        self.transport = transport or Transport.from_env()
+
         self.api_key = api_key or os.environ.get("CARTESIA_API_KEY")
-        if self.api_key and Cartesia:
-            self.client = Cartesia(api_key=self.api_key)
-            logger.info("Cartesia client initialized with API key.")
-        else:
-            self.client = None
-            if not self.api_key:
-                logger.warning("API key not provided. Cartesia client is not initialized. Some features will be unavailable.")
-            else:
-                logger.warning("Cartesia library not available. Cartesia client is not initialized.")
+        # Created on first access, so work that never reaches the API doesn't import the SDK
+        self._client = _UNSET
+        self._client_lock = threading.Lock()
 
         self.current_voice = None
         self.current_model = None
         self.current_language = None
         self.current_mix = None
+        # Blend voice embeddings with numpy instead of a voices.mix call per mix:
+        # False (API only), True, or "verify" (compare with the API on the first mix)
+        self.local_mixing = local_mixing
+        self._local_mixing_verified = None
+        self._local_mixing_lock = threading.Lock()
+        # After a failed check, mix through the API without re-checking until then
+        self._local_mixing_retry_at = 0.0
+        # Memo of mix results next to the voice files, opened on first mix; 0 turns it off
+        self.mix_cache_entries = mix_cache_entries
+        self._mix_cache = None
+        self._mix_cache_lock = threading.Lock()
 
         # Setting up directories
         self.base_dir = base_dir or Path("voice2voice")
@@ -60,6 +92,25 @@ class CartesiaVoiceManager:
         self.api_dir.mkdir(parents=True, exist_ok=True)
         self.custom_dir.mkdir(parents=True, exist_ok=True)
 
+        # Packed float32 embeddings referenced by the compact voice files
+        self.api_embeddings = EmbeddingStore(self.api_dir / "embeddings.f32")
+        self.custom_embeddings = EmbeddingStore(self.custom_dir / "embeddings.f32")
+
+        # Persistent index of local voices (built from the voice files on first use)
+        self.catalog = VoiceCatalog(self.base_dir / "catalog.sqlite3", self.api_dir, self.custom_dir)
+
+        # Remote voice listing, fetched at most once per TTL window
+        self.remote_voices = TTLCache(
+            self._fetch_remote_voices, ttl=voices_cache_ttl, name="voices.list",
+            on_lookup=lambda hit: self.metrics.cache_event("voices.list", hit)
+        )
+
+        # Dropdown choices and label <-> id maps, valid until the catalog changes
+        self._choices_cache = {}
+        self._label_to_id = {}
+        self._id_to_label = {}
+        self._label_state = None
+
         # Initialize voices
         self.voices = {}
         self.loaded_voices = set()
@@ -68,19 +119,69 @@ class CartesiaVoiceManager:
         self._speed = 0.0  # normal speed
         self._emotions = {}
 
-        logger.add("cartesia_voice_manager.log", rotation="10 MB")
+        # Timings of the last speak_stream() call
+        self.last_stream_stats = None
+
+        # Content-addressed cache of generated audio, see enable_synthesis_cache()
+        self.synthesis_cache = None
+        self.last_synthesis_cached = False
+
+        # Sinks are set up once per process, see log_config
+
+        configure_logging()
         logger.info("CartesiaVoiceManager initialized")
 
     
+    @property
+    def client(self):
+        if self._client is _UNSET:
+            with self._client_lock:
+                if self._client is _UNSET:
+                    self._client = self._instrument(self._create_client())
+        return self._client
+
+    def _create_client(self):
+        Cartesia = cartesia_class()
+        if self.api_key and Cartesia:
+            client = self.transport(Cartesia(api_key=self.api_key))
+            logger.info("Cartesia client initialized with API key.")
+            return client
+        if not self.transport.needs_api_key:
+            return self.transport(None)
+        if not self.api_key:
+            logger.warning("API key not provided. Cartesia client is not initialized. Some features will be unavailable.")
+        else:
+            logger.warning("Cartesia library not available. Cartesia client is not initialized.")
+        return None
+
+    @client.setter
+    def client(self, client):
+        with self._client_lock:
+            self._client = self._instrument(client)
+
+    def _instrument(self, client):
+        # Every client goes through the metrics proxy, including ones assigned from outside
+        if client is not None and not isinstance(client, InstrumentedClient):
+            client = InstrumentedClient(client, self.metrics)
+        return client
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """
+        Returns the current metric values, see sonic_wrapper.metrics.
+        """
+        return self.metrics.snapshot()
+
     def set_api_key(self, api_key: str):
         """
         Sets the API key, initializes the Cartesia client, and saves the key to .env file.
         """
         self.api_key = api_key
+        Cartesia = cartesia_class()
         if Cartesia:
             try:
-                self.client = Cartesia(api_key=self.api_key)
+                self.client = self.transport(Cartesia(api_key=self.api_key))
                 logger.info("Cartesia client initialized with new API key.")
+                self.invalidate_voice_cache()
                 # Save the API key to .env file
                 self._save_api_key_to_env()
                 # self.update_voices_from_api()
@@ -100,6 +201,28 @@ class CartesiaVoiceManager:
         with open(env_path, 'w') as env_file:
             env_file.write(f'CARTESIA_API_KEY={self.api_key}\n')
         logger.info("API key saved to .env file.")
+
+    def _fetch_remote_voices(self) -> List[Dict]:
+        return self.client.voices.list()
+
+    def _list_remote_voices(self) -> List[Dict]:
+        """
+        Returns the remote voice listing, calling voices.list() at most once per TTL window.
+        Stale listings are served while a background refresh is running.
+        """
+        return self.remote_voices.get()
+
+    def invalidate_voice_cache(self):
+        """
+        Forces the next listing to be fetched from the API.
+        """
+        self.remote_voices.invalidate()
+
+    def get_voice_cache_stats(self) -> Dict[str, int]:
+        """
+        Returns hit/miss counters of the remote voice listing cache.
+        """
+        return self.remote_voices.stats()
     
     def load_voice(self, voice_id: str) -> Dict:
         if voice_id in self.loaded_voices:
@@ -111,17 +234,16 @@ class CartesiaVoiceManager:
         custom_file = self.custom_dir / f"{voice_id}.json"
 
         if api_file.exists():
-            voice_file = api_file
+            voice_file, store = api_file, self.api_embeddings
         elif custom_file.exists():
-            voice_file = custom_file
+            voice_file, store = custom_file, self.custom_embeddings
 
         if voice_file:
-            with open(voice_file, "r") as f:
-                voice_data = json.load(f)
-                self.voices[voice_id] = voice_data
-                self.loaded_voices.add(voice_id)
-                logger.info(f"Loaded voice {voice_id} from {voice_file}")
-                return voice_data
+            voice_data = read_voice_file(voice_file, store)
+            self.voices[voice_id] = voice_data
+            self.loaded_voices.add(voice_id)
+            hot_logger.info(f"Loaded voice {voice_id} from {voice_file}")
+            return voice_data
         else:
             # If voice not found locally, try to load from API
             if self.client:
@@ -139,25 +261,44 @@ class CartesiaVoiceManager:
                 logger.error(f"Cannot load voice {voice_id} without API client.")
                 raise ValueError(f"Voice with id {voice_id} not found and API client is not available.")
 
+    def _catalog_state(self) -> tuple:
+        """
+        Changes whenever the remote listing or the local catalog changes.
+        """
+        return (self.remote_voices.generation, self.catalog.version)
+
     def extract_voice_id_from_label(self, voice_label: str) -> Optional[str]:
         """
         Extracts voice ID from label in dropdown
         For example: "John (en) [Custom]" -> extract ID from voices dictionary
         """
-        # Get all voices and their labels
-        choices = self.get_voice_choices()
-        # Find voice by label and get its ID
-        voice_data = next((c for c in choices if c["label"] == voice_label), None)
-        return voice_data["value"] if voice_data else None
+        if self._label_state != self._catalog_state():
+            self.get_voice_choices()
+        return self._label_to_id.get(voice_label)
+
+    def get_voice_label(self, voice_id: str) -> Optional[str]:
+        """
+        Returns the dropdown label of a voice ID
+        """
+        if self._label_state != self._catalog_state():
+            self.get_voice_choices()
+        return self._id_to_label.get(voice_id)
 
     def get_voice_choices(self, language: str = None, accessibility: VoiceAccessibility = VoiceAccessibility.ALL) -> List[Dict]:
         """
-        Returns a list of voices for dropdown menu
+        Returns a list of voices for dropdown menu.
+        Cached per filter until the remote listing or the local catalog changes.
         """
+        key = (language, accessibility)
+        cached = self._choices_cache.get(key)
+        if cached and cached[0] == self._catalog_state() and not self.remote_voices.expired:
+            return list(cached[1])
+
         voices = self.list_available_voices(
             languages=[language] if language else None,
             accessibility=accessibility
         )
+        state = self._catalog_state()
 
         choices = []
         for voice in voices:
@@ -166,8 +307,19 @@ class CartesiaVoiceManager:
                 "label": f"{voice['name']} ({voice['language']}){' [Custom]' if voice.get('is_custom') else ''}",
                 "value": voice['id']  # Only ID here
             })
+        choices = sorted(choices, key=lambda x: x['label'])
+        self._choices_cache[key] = (state, choices)
 
-        return sorted(choices, key=lambda x: x['label'])
+        if language is None and accessibility == VoiceAccessibility.ALL:
+            # The unfiltered listing backs label <-> id resolution; first label wins as before
+            label_to_id, id_to_label = {}, {}
+            for choice in choices:
+                label_to_id.setdefault(choice["label"], choice["value"])
+                id_to_label.setdefault(choice["value"], choice["label"])
+            self._label_to_id, self._id_to_label = label_to_id, id_to_label
+            self._label_state = state
+
+        return list(choices)
 
     def get_voice_info(self, voice_id: str) -> Dict:
         """
@@ -185,42 +337,72 @@ class CartesiaVoiceManager:
     def _save_voice_to_api(self, voice_data: Dict):
         voice_id = voice_data["id"]
         file_path = self.api_dir / f"{voice_id}.json"
-        with open(file_path, "w") as f:
-            json.dump(voice_data, f, indent=2)
+        write_voice_file(file_path, voice_data, self.api_embeddings)
+        self.catalog.upsert(voice_data, "api")
+        self.forget_voice_mixes(voice_id)
         logger.info(f"Saved API voice {voice_id} to {file_path}")
 
     def _save_voice_to_custom(self, voice_data: Dict):
         voice_id = voice_data["id"]
         file_path = self.custom_dir / f"{voice_id}.json"
-        with open(file_path, "w") as f:
-            json.dump(voice_data, f, indent=2)
+        write_voice_file(file_path, voice_data, self.custom_embeddings)
+        self.catalog.upsert(voice_data, "custom")
+        self.forget_voice_mixes(voice_id)
         logger.info(f"Saved custom voice {voice_id} to {file_path}")
 
-    def update_voices_from_api(self):
+    def migrate_voice_storage(self) -> int:
+        """
+        Converts voice files with inline JSON embeddings to the compact layout
+        (metadata record + packed float32 embeddings). Legacy files are also
+        converted on the fly when loaded, so running this is optional.
+
+        :return: Number of converted files
+        """
+        migrated = migrate_voice_dir(self.api_dir, self.api_embeddings)
+        migrated += migrate_voice_dir(self.custom_dir, self.custom_embeddings)
+        return migrated
+
+    def compact_voice_storage(self) -> int:
+        """
+        Reclaims the space of embeddings no voice file uses any more, e.g. after
+        voices were pruned. Voices already loaded read their embeddings first,
+        because their slots move.
+
+        :return: Number of bytes reclaimed
+        """
+        for voice in list(self.voices.values()) + [self.current_voice]:
+            if isinstance(voice, LazyVoice):
+                voice.load()
+        reclaimed = compact_voice_dir(self.api_dir, self.api_embeddings)
+        reclaimed += compact_voice_dir(self.custom_dir, self.custom_embeddings)
+        return reclaimed
+
+    def update_voices_from_api(self, max_workers: int = 8, prune: bool = False) -> Optional[Dict[str, List[str]]]:
+        """
+        Mirrors the API voice library into api_dir, fetching only new or changed voices.
+
+        :param max_workers: Number of concurrent voices.get requests
+        :param prune: Delete local API voices that are no longer listed by the API
+        :return: Summary with added, updated, unchanged, removed and failed voice IDs
+        """
         if not self.client:
             logger.warning("Cannot update voices from API without API client.")
-            return
+            return None
 
         logger.info("Updating voices from API")
         try:
-            api_voices = self.client.voices.list()
-            for voice in tqdm(api_voices, desc="Updating voices"):
-                voice_id = voice["id"]
-                full_voice_data = self.client.voices.get(id=voice_id)
-                self._save_voice_to_api(full_voice_data)
-                if voice_id in self.loaded_voices:
-                    self.voices[voice_id] = full_voice_data
-            logger.info(f"Updated {len(api_voices)} voices from API")
+            return VoiceSync(self, max_workers=max_workers, prune=prune).run()
         except Exception as e:
             logger.error(f"Failed to update voices from API: {e}")
+            return None
 
     def list_available_voices(self, languages: List[str] = None, accessibility: VoiceAccessibility = VoiceAccessibility.ALL) -> List[Dict]:
         filtered_voices = []
     
         # Get voices from API
-        if self.client and accessibility in [VoiceAccessibility.ALL, VoiceAccessibility.ONLY_PUBLIC]:
+        if accessibility in [VoiceAccessibility.ALL, VoiceAccessibility.ONLY_PUBLIC] and self.client:
             try:
-                api_voices = self.client.voices.list()
+                api_voices = self._list_remote_voices()
                 for voice in api_voices:
                     metadata = {
                         'id': voice['id'],
@@ -247,23 +429,12 @@ class CartesiaVoiceManager:
     
         # Add custom voices
         if accessibility in [VoiceAccessibility.ALL, VoiceAccessibility.ONLY_CUSTOM]:
-            for file in self.custom_dir.glob("*.json"):
-                with open(file, "r") as f:
-                    voice_data = json.load(f)
-                    if languages is None or voice_data['language'] in languages:
-                        metadata = {
-                            'id': voice_data['id'],
-                            'name': voice_data['name'],
-                            'language': voice_data['language'],
-                            'is_public': False,
-                            'is_custom': True
-                        }
-                        filtered_voices.append(metadata)
+            filtered_voices.extend(self.catalog.query(languages=languages, is_custom=True))
     
         # Add private voices (non-public API voices)
         if accessibility in [VoiceAccessibility.ALL, VoiceAccessibility.ONLY_PRIVATE] and self.client:
             try:
-                api_voices = self.client.voices.list()
+                api_voices = self._list_remote_voices()
                 for voice in api_voices:
                     if not voice['is_public'] and not voice.get('is_custom'):
                         metadata = {
@@ -278,7 +449,7 @@ class CartesiaVoiceManager:
             except Exception as e:
                 logger.error(f"Failed to fetch private voices from API: {e}")
     
-        logger.info(f"Found {len(filtered_voices)} voices matching criteria")
+        hot_logger.info(f"Found {len(filtered_voices)} voices matching criteria")
         return filtered_voices
 
     def set_voice(self, voice_id: str):
@@ -288,14 +459,14 @@ class CartesiaVoiceManager:
         custom_file = self.custom_dir / f"{voice_id}.json"
 
         if api_file.exists():
-            voice_file = api_file
+            voice_file, store = api_file, self.api_embeddings
         elif custom_file.exists():
-            voice_file = custom_file
+            voice_file, store = custom_file, self.custom_embeddings
 
         if voice_file:
             # Use local data
-            with open(voice_file, "r") as f:
-                self.current_voice = json.load(f)
+            # Metadata only; the embedding is read when speak() needs it
+            self.current_voice = read_voice_file(voice_file, store)
         else:
             # Get full data with embedding from API
             if self.client:
@@ -312,7 +483,7 @@ class CartesiaVoiceManager:
                 raise ValueError(f"Voice with id {voice_id} not found and API client is not available.")
 
         self.set_language(self.current_voice['language'])
-        logger.info(f"Set current voice to {voice_id}")
+        hot_logger.info(f"Set current voice to {voice_id}")
 
     def set_model(self, language: str):
         if language.lower() in ['en', 'eng', 'english']:
@@ -320,12 +491,12 @@ class CartesiaVoiceManager:
         else:
             self.current_model = "sonic-multilingual"
         self.current_language = language
-        logger.info(f"Set model to {self.current_model} for language {language}")
+        hot_logger.info(f"Set model to {self.current_model} for language {language}")
 
     def set_language(self, language: str):
         self.current_language = language
         self.set_model(language)
-        logger.info(f"Set language to {language}")
+        hot_logger.info(f"Set language to {language}")
 
     @property
     def speed(self):
@@ -333,47 +504,85 @@ class CartesiaVoiceManager:
 
     @speed.setter
     def speed(self, value):
+        self._speed = self._parse_speed(value)
+        hot_logger.info(f"Set speed to {self._speed}")
+
+    @classmethod
+    def _parse_speed(cls, value) -> float:
         if isinstance(value, str):
-            if value not in self.SPEED_OPTIONS:
-                raise ValueError(f"Invalid speed value. Use one of: {list(self.SPEED_OPTIONS.keys())}")
-            self._speed = self.SPEED_OPTIONS[value]
+            if value not in cls.SPEED_OPTIONS:
+                raise ValueError(f"Invalid speed value. Use one of: {list(cls.SPEED_OPTIONS.keys())}")
+            return cls.SPEED_OPTIONS[value]
         elif isinstance(value, (int, float)):
             if not -1 <= value <= 1:
                 raise ValueError("Speed value must be between -1 and 1")
-            self._speed = value
+            return value
         else:
             raise ValueError("Speed must be a string from SPEED_OPTIONS or a number between -1 and 1")
-        logger.info(f"Set speed to {self._speed}")
 
     def set_emotions(self, emotions: List[Dict[str, str]] = None):
         if emotions is None:
             self._emotions = {}
-            logger.info("Cleared all emotions")
+            hot_logger.info("Cleared all emotions")
             return
 
-        self._emotions = {}
+        self._emotions = self._parse_emotions(emotions)
+        hot_logger.info(f"Set emotions: {self._emotions}")
+
+    @classmethod
+    def _parse_emotions(cls, emotions: List[Dict[str, str]]) -> Dict[str, str]:
+        parsed = {}
         for emotion in emotions:
             name = emotion.get("name")
             level = emotion.get("level")
 
-            if name not in self.EMOTION_NAMES:
-                raise ValueError(f"Invalid emotion name. Choose from: {self.EMOTION_NAMES}")
-            if level not in self.EMOTION_LEVELS:
-                raise ValueError(f"Invalid emotion level. Choose from: {self.EMOTION_LEVELS}")
-
-            self._emotions[name] = level
+            if name not in cls.EMOTION_NAMES:
+                raise ValueError(f"Invalid emotion name. Choose from: {cls.EMOTION_NAMES}")
+            if level not in cls.EMOTION_LEVELS:
+                raise ValueError(f"Invalid emotion level. Choose from: {cls.EMOTION_LEVELS}")
 
-        logger.info(f"Set emotions: {self._emotions}")
+            parsed[name] = level
+        return parsed
 
     def _get_voice_controls(self):
-        controls = {"speed": self._speed}
+        return self._voice_controls(self._speed, self._emotions)
 
-        if self._emotions:
-            controls["emotion"] = [f"{name}:{level}" for name, level in self._emotions.items()]
+    @staticmethod
+    def _voice_controls(speed: float, emotions: Dict[str, str]) -> Dict:
+        controls = {"speed": speed}
+
+        if emotions:
+            controls["emotion"] = [f"{name}:{level}" for name, level in emotions.items()]
 
         return controls
 
-    def speak(self, text: str, output_file: str = None):
+    def _build_tts_request(self, transcript: str, voice_embedding: List[float], language: str,
+                           voice_controls: Dict, output_format: Dict) -> Dict:
+        """
+        Builds the keyword arguments of a tts.bytes / tts.sse call
+        """
+        request = {
+            "model_id": 'sonic-english' if language == 'en' else 'sonic-multilingual',
+            "transcript": transcript,
+            "voice_embedding": voice_embedding,
+            "duration": None,
+            "output_format": output_format,
+            "_experimental_voice_controls": voice_controls
+        }
+        if language != 'en':
+            request["language"] = language
+        return request
+
+    def _current_tts_request(self, text: str, output_format: Dict) -> Dict:
+        """
+        Builds a TTS request from the current voice, language, speed and emotions
+        """
+        return self._current_tts_request_for(improve_tts_text(text, self.current_language), output_format)
+
+    def _current_tts_request_for(self, transcript: str, output_format: Dict) -> Dict:
+        """
+        Like _current_tts_request, for a transcript that is already normalized
+        """
         if not self.current_model or not (self.current_voice or self.current_mix):
             raise ValueError("Please set a model and a voice or voice mix before speaking.")
         if not self.client:
@@ -381,49 +590,354 @@ class CartesiaVoiceManager:
             raise ValueError("API client is not initialized. Cannot generate speech.")
 
         voice_embedding = self.current_voice['embedding'] if self.current_voice else self.current_mix
+        voice_controls = self._get_voice_controls()
 
-        improved_text = improve_tts_text(text, self.current_language)
+        hot_logger.info(f"Generating audio for text: {transcript[:50]}... with voice controls: {voice_controls}")
+        return self._build_tts_request(
+            transcript, voice_embedding, self.current_language, voice_controls, output_format
+        )
 
-        output_format = {
-            "container": "wav",
-            "encoding": "pcm_f32le",
-            "sample_rate": 44100,
-        }
+    def enable_synthesis_cache(self, directory: Path = None, max_bytes: int = 512 * 1024 * 1024,
+                               memory_max_bytes: int = 32 * 1024 * 1024) -> SynthesisCache:
+        """
+        Turns on caching of generated audio. Requests with the same normalized text,
+        voice embedding, model, language, voice controls and output format are served
+        from memory or disk instead of calling the API.
 
-        voice_controls = self._get_voice_controls()
+        :param directory: Cache directory, defaults to <base_dir>/synthesis_cache
+        :param max_bytes: Size bound of the disk tier, least recently used entries are evicted first
+        :param memory_max_bytes: Size bound of the in-memory tier of hot entries
+        """
+        self.synthesis_cache = SynthesisCache(
+            directory or self.base_dir / "synthesis_cache", max_bytes=max_bytes, memory_max_bytes=memory_max_bytes
+        )
+        logger.info(f"Synthesis cache enabled at {self.synthesis_cache.directory}")
+        return self.synthesis_cache
 
-        logger.info(f"Generating audio for text: {text[:50]}... with voice controls: {voice_controls}")
-        if self.current_language == 'en':
-            audio_data = self.client.tts.bytes(
-                model_id='sonic-english',
-                transcript=improved_text,
-                voice_embedding=voice_embedding,
-                duration=None,
-                output_format=output_format,
-                # language=self.current_language,
-                _experimental_voice_controls=voice_controls
-            )
-        else:
-            audio_data = self.client.tts.bytes(
-                model_id='sonic-multilingual',
-                transcript=improved_text,
-                voice_embedding=voice_embedding,
-                duration=None,
-                output_format=output_format,
-                language=self.current_language,
-                _experimental_voice_controls=voice_controls
-            )
+    def disable_synthesis_cache(self):
+        self.synthesis_cache = None
+
+    def get_synthesis_cache_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Returns hit/miss counters and sizes of the synthesis cache, or None when it is disabled.
+        """
+        return self.synthesis_cache.stats() if self.synthesis_cache else None
+
+    def _synthesize(self, request: Dict) -> tuple:
+        """
+        Runs a tts.bytes request through the synthesis cache, if enabled.
+        Returns (audio_data, cached).
+        """
+        if self.synthesis_cache is None:
+            return self.client.tts.bytes(**request), False
+        key = synthesis_key(request)
+        audio_data = self.synthesis_cache.get(key)
+        self.metrics.cache_event("synthesis", audio_data is not None)
+        if audio_data is not None:
+            return audio_data, True
+        audio_data = self.client.tts.bytes(**request)
+        self.synthesis_cache.put(key, audio_data)
+        return audio_data, False
+
+    def _default_output_file(self, output_format: Dict, language: str = None, index: int = None) -> str:
+        stem = "output" if index is None else f"output_{index}"
+        return f"{stem}_{language or self.current_language}{file_extension(output_format)}"
+
+    def speak(self, text: str, output_file: str = None, output_format: Union[str, Dict] = None):
+        """
+        Synthesizes text with the current voice, language, speed and emotions.
+
+        :param text: Text to synthesize
+        :param output_file: Output path, defaults to output_<language>.wav (.pcm for raw profiles)
+        :param output_format: Profile name from OUTPUT_PROFILES or a Cartesia output_format dict,
+                              defaults to hifi-f32-44k
+        :return: Path of the written file
+        """
+        output_format = resolve_output_format(output_format)
+        request = self._current_tts_request(text, output_format)
+        audio_data, self.last_synthesis_cached = self._synthesize(request)
+        if self.last_synthesis_cached:
+            hot_logger.info("Audio served from synthesis cache")
 
         if output_file is None:
-            output_file = f"output_{self.current_language}.wav"
+            output_file = self._default_output_file(output_format)
 
         with open(output_file, "wb") as f:
             f.write(audio_data)
-        logger.info(f"Audio saved to {output_file}")
+        hot_logger.info(f"Audio saved to {output_file}")
         print(f"Audio generated and saved to {output_file}")
 
         return output_file
 
+    def speak_stream(self, text: str, output_file: str = None,
+                     output_format: Union[str, Dict] = None) -> Iterator[bytes]:
+        """
+        Streams speech over SSE, yielding raw PCM chunks as they arrive.
+
+        Chunks are appended to a WAV file behind a placeholder header that is
+        patched with the final sizes when the stream ends (or is abandoned);
+        raw profiles write headerless PCM instead.
+        Timings of the last stream, including the time to the first chunk,
+        are kept in ``last_stream_stats``. With the synthesis cache enabled, a
+        cached result is yielded as a single chunk and completed streams are stored.
+
+        :param text: Text to synthesize
+        :param output_file: File to write, defaults to output_<language>.wav
+        :param output_format: Profile name or output_format dict, see speak
+        :return: Generator of raw PCM chunks in the profile's encoding and sample rate
+        """
+        output_format = resolve_output_format(output_format)
+        request = self._current_tts_request(text, dict(output_format, container="raw"))
+
+        if output_file is None:
+            output_file = self._default_output_file(output_format)
+
+        # Validation above runs eagerly; the request itself starts on first iteration
+        return self._stream_to_wav(request, output_file, with_header=output_format["container"] == "wav")
+
+    def _open_stream(self, request: Dict) -> tuple:
+        """
+        Starts a tts.sse request through the synthesis cache, if enabled.
+        Returns (chunks, cached): a cached result is a single chunk, and a live
+        stream is stored in the cache once it has been consumed to the end.
+        """
+        key = synthesis_key(request) if self.synthesis_cache is not None else None
+        cached = self.synthesis_cache.get(key) if key else None
+        if key:
+            self.metrics.cache_event("synthesis", cached is not None)
+        if cached is not None:
+            return iter([cached]), True
+        chunks = (chunk["audio"] for chunk in self.client.tts.sse(stream=True, **request))
+        return (self._cache_stream(key, chunks) if key else chunks), False
+
+    def _cache_stream(self, key: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+        received = []
+        for audio in chunks:
+            received.append(audio)
+            yield audio
+        self.synthesis_cache.put(key, b"".join(received))
+
+    def _stream_to_wav(self, request: Dict, output_file: str, with_header: bool = True) -> Iterator[bytes]:
+        output_format = request["output_format"]
+        started = time.perf_counter()
+        first_chunk_at = None
+        data_size = 0
+        chunks, self.last_synthesis_cached = self._open_stream(request)
+        with open(output_file, "wb") as f:
+            if with_header:
+                f.write(wav_header(output_format["encoding"], output_format["sample_rate"]))
+            try:
+                for audio in chunks:
+                    if first_chunk_at is None:
+                        first_chunk_at = time.perf_counter() - started
+                        hot_logger.info(f"First audio chunk after {first_chunk_at * 1000:.0f} ms")
+                    f.write(audio)
+                    data_size += len(audio)
+                    yield audio
+            finally:
+                if with_header:
+                    patch_wav_header(f, data_size)
+                self.last_stream_stats = {
+                    "output_file": output_file,
+                    "time_to_first_chunk": first_chunk_at,
+                    "total_time": time.perf_counter() - started,
+                    "bytes": data_size,
+                    "cached": self.last_synthesis_cached
+                }
+                hot_logger.info(f"Streamed {data_size} bytes of audio to {output_file}")
+
+    def speak_long(self, text: str, output_file: str = None, max_chunk_chars: int = 500,
+                   max_workers: int = 4, output_format: Union[str, Dict] = None) -> str:
+        """
+        Synthesizes long texts by splitting them at sentence and clause boundaries,
+        generating the chunks in parallel and joining the PCM in order.
+        Produces the same kind of file as speak for the given output format.
+
+        :param text: Text to synthesize
+        :param output_file: Output path, defaults to output_<language>.wav
+        :param max_chunk_chars: Maximum characters per request
+        :param max_workers: Maximum number of concurrent requests
+        :param output_format: Profile name or output_format dict, see speak
+        :return: Path of the written file
+        """
+        # Normalize the whole text once: chunks cut mid-sentence must not get sentence-final periods
+        chunks = split_text(improve_tts_text(text, self.current_language), max_chars=max_chunk_chars,
+                            language=self.current_language)
+        if len(chunks) <= 1:
+            return self.speak(text, output_file, output_format)
+
+        output_format = resolve_output_format(output_format)
+        raw_format = dict(output_format, container="raw")
+        requests = [self._current_tts_request_for(chunk, raw_format) for chunk in chunks]
+        logger.info(f"Generating {len(chunks)} chunks with {max_workers} workers")
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="speak-long") as executor:
+            results = list(executor.map(self._synthesize, requests))
+
+        pcm = join_pcm([audio for audio, _ in results], output_format["encoding"], output_format["sample_rate"])
+        cached_chunks = sum(1 for _, cached in results if cached)
+        self.last_synthesis_cached = cached_chunks == len(results)
+        if cached_chunks:
+            logger.info(f"{cached_chunks} of {len(results)} chunks served from synthesis cache")
+
+        if output_file is None:
+            output_file = self._default_output_file(output_format)
+
+        with open(output_file, "wb") as f:
+            if output_format["container"] == "wav":
+                f.write(wav_header(output_format["encoding"], output_format["sample_rate"], len(pcm)))
+            f.write(pcm)
+        hot_logger.info(f"Audio saved to {output_file}")
+        print(f"Audio generated and saved to {output_file}")
+
+        return output_file
+
+    def _prepare_item(self, index: int, item: Dict) -> tuple:
+        """
+        Builds the TTS request and output path of one speak_many item
+        without touching the manager's current settings
+        """
+        if not self.client:
+            raise ValueError("API client is not initialized. Cannot generate speech.")
+
+        voice_id = item.get("voice")
+        if voice_id:
+            voice = self.load_voice(voice_id)
+            voice_embedding = voice['embedding']
+            language = item.get("language") or voice['language']
+        elif self.current_voice or self.current_mix:
+            voice_embedding = self.current_voice['embedding'] if self.current_voice else self.current_mix
+            language = item.get("language") or self.current_language
+        else:
+            raise ValueError("Item has no voice and no current voice or voice mix is set.")
+
+        speed = self._parse_speed(item["speed"]) if item.get("speed") is not None else self._speed
+        emotions = self._parse_emotions(item["emotions"]) if item.get("emotions") is not None else self._emotions
+        output_format = resolve_output_format(item.get("output_format"))
+
+        request = self._build_tts_request(
+            improve_tts_text(item["text"], language),
+            voice_embedding,
+            language,
+            self._voice_controls(speed, emotions),
+            output_format
+        )
+        output_file = item.get("output_file") or self._default_output_file(output_format, language, index)
+        return request, output_file
+
+    def synthesize_item(self, item: Dict) -> tuple:
+        """
+        Synthesizes one speak_many item (see iter_speak_many) in memory without
+        touching the manager's current settings; safe to call from many threads.
+
+        :return: (audio_data, cached)
+        """
+        request, _ = self._prepare_item(0, item)
+        return self._synthesize(request)
+
+    def stream_item(self, item: Dict) -> tuple:
+        """
+        Streams one speak_many item over SSE without touching the manager's
+        current settings; safe to call from many threads.
+
+        :return: (chunks, cached), where chunks yields raw PCM in the encoding and
+                 sample rate of the item's output format (no WAV header)
+        """
+        output_format = resolve_output_format(item.get("output_format"))
+        request, _ = self._prepare_item(0, dict(item, output_format=dict(output_format, container="raw")))
+        return self._open_stream(request)
+
+    def stream_item_to_file(self, item: Dict) -> Iterator[bytes]:
+        """
+        Streams one speak_many item like speak_stream: raw PCM chunks are yielded
+        as they arrive and written to the item's output file, whose WAV header is
+        patched when the stream ends. Uses the item's own settings, so it is safe
+        to call from many threads (``last_stream_stats`` is still per manager).
+        """
+        output_format = resolve_output_format(item.get("output_format"))
+        request, _ = self._prepare_item(0, dict(item, output_format=dict(output_format, container="raw")))
+        output_file = item.get("output_file") or self._default_output_file(output_format, item.get("language"))
+        return self._stream_to_wav(request, output_file, with_header=output_format["container"] == "wav")
+
+    def _speak_item(self, index: int, item: Dict) -> tuple:
+        request, output_file = self._prepare_item(index, item)
+        audio_data, cached = self._synthesize(request)
+        # Written under a temporary name so an existing output file is always complete
+        partial_file = f"{output_file}.part"
+        with open(partial_file, "wb") as f:
+            f.write(audio_data)
+        os.replace(partial_file, output_file)
+        return output_file, cached
+
+    def _run_speak_item(self, index: int, item: Dict) -> Dict:
+        started = time.perf_counter()
+        result = {"index": index, "output_file": None, "error": None, "cached": False}
+        try:
+            result["output_file"], result["cached"] = self._speak_item(index, item)
+        except Exception as e:
+            logger.error(f"Item {index} failed: {e}")
+            result["error"] = str(e)
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+    def iter_speak_many(self, items: Iterable[Dict], max_workers: int = 4,
+                        show_progress: bool = True) -> Iterator[Dict]:
+        """
+        Synthesizes many items concurrently and yields results as they complete.
+
+        Each item is a dict with "text" and optionally "voice" (voice ID), "language",
+        "speed", "emotions" (same format as set_emotions), "output_format" (profile
+        name or dict, see speak) and "output_file".
+        Missing settings fall back to the manager's current voice, speed and emotions.
+        At most ``max_workers`` requests run at once and at most twice that many
+        items are read ahead from ``items``, so it may be a lazy iterable.
+
+        Each result is a dict: {"index", "output_file", "error", "cached", "elapsed"};
+        a failed item has "error" set instead of raising, "cached" tells whether the
+        audio came from the synthesis cache.
+        """
+        from tqdm import tqdm
+
+        max_workers = max(1, max_workers)
+        total = len(items) if hasattr(items, "__len__") else None
+        item_iter = enumerate(items)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speak") as executor, \
+                tqdm(total=total, desc="Generating speech", disable=not show_progress) as progress:
+            in_flight = set()
+            exhausted = False
+            while True:
+                while not exhausted and len(in_flight) < max_workers * 2:
+                    try:
+                        index, item = next(item_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    in_flight.add(executor.submit(self._run_speak_item, index, item))
+                if not in_flight:
+                    break
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    progress.update(1)
+                    yield future.result()
+
+    def speak_many(self, items: Iterable[Dict], max_workers: int = 4, ordered: bool = True,
+                   show_progress: bool = True) -> List[Dict]:
+        """
+        Synthesizes many items concurrently through the shared client.
+
+        :param items: Item dicts, see iter_speak_many
+        :param max_workers: Maximum number of concurrent requests
+        :param ordered: Return results in input order instead of completion order
+        :param show_progress: Show a progress bar
+        :return: One result dict per item
+        """
+        results = list(self.iter_speak_many(items, max_workers=max_workers, show_progress=show_progress))
+        failed = sum(1 for r in results if r["error"])
+        logger.info(f"Generated {len(results) - failed} of {len(results)} items ({failed} failed)")
+        if ordered:
+            results.sort(key=lambda r: r["index"])
+        return results
+
     def _get_embedding(self, source: Union[str, Dict]) -> Dict:
         """
         Gets embedding from various sources: ID, file path, or existing embedding
@@ -444,26 +958,168 @@ class CartesiaVoiceManager:
         else:
             raise ValueError(f"Invalid source type: {type(source)}")
 
-    def create_mixed_embedding(self, components: List[Dict[str, Union[str, float, Dict]]]) -> Dict:
+    @property
+    def mix_cache(self) -> Optional[MixCache]:
         """
-        Creates a mixed embedding from multiple components
+        Persistent memo of mixed embeddings (<base_dir>/mix_cache.sqlite3), None when disabled
+        """
+        if self._mix_cache is None and self.mix_cache_entries:
+            with self._mix_cache_lock:
+                if self._mix_cache is None:
+                    self._mix_cache = MixCache(self.base_dir / MIX_CACHE_FILE, max_entries=self.mix_cache_entries)
+        return self._mix_cache
 
-        :param components: List of dictionaries, each containing 'id' (or 'path', or embedding) and 'weight'
-        :return: New mixed embedding
+    def get_mix_cache_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Returns hit/miss counters and sizes of the mix memo, or None when it is disabled.
         """
+        return self.mix_cache.stats() if self.mix_cache else None
+
+    def forget_voice_mixes(self, voice_id: str):
+        """
+        Drops memoized mixes that use a voice whose embedding changed or was removed.
+        """
+        # A voice sync saves every new voice; don't create the memo just to find it empty
+        if self._mix_cache is None and not (self.base_dir / MIX_CACHE_FILE).exists():
+            return
+        if self.mix_cache:
+            dropped = self.mix_cache.forget_voice(voice_id)
+            if dropped:
+                logger.info(f"Dropped {dropped} memoized mixes that use voice {voice_id}")
+
+    def _local_mixing_checked(self, recipes: List[List[Dict]]) -> bool:
+        """
+        For local_mixing="verify": whether local mixes matched voices.mix on the
+        first recipes this manager mixed. Checked once per manager; a check that
+        fails is retried after LOCAL_MIXING_RETRY_AFTER seconds, not on every mix.
+        """
+        with self._local_mixing_lock:
+            if self._local_mixing_verified is None:
+                if time.monotonic() < self._local_mixing_retry_at:
+                    return False
+                try:
+                    result = self.verify_local_mix(recipes[:3])
+                except Exception as e:
+                    self._local_mixing_retry_at = time.monotonic() + self.LOCAL_MIXING_RETRY_AFTER
+                    logger.warning(f"Could not verify local voice mixing, mixing through the API "
+                                   f"for {self.LOCAL_MIXING_RETRY_AFTER:.0f} s: {e}")
+                    return False
+                self._local_mixing_verified = result["equivalent"]
+                if result["equivalent"]:
+                    logger.info(f"Local voice mixing matches the API (max difference {result['max_difference']})")
+                else:
+                    logger.warning(f"Local voice mixing differs from the API (max difference "
+                                   f"{result['max_difference']}), mixing through the API")
+            return self._local_mixing_verified
+
+    def _mix_locally(self, local: Optional[bool], embeddings: List[List[float]]) -> bool:
+        if not (self.local_mixing if local is None else local):
+            return False
+        if not local_mixing_available():
+            logger.debug("numpy is not installed, mixing voices through the API")
+            return False
+        if len({len(embedding) for embedding in embeddings}) > 1:
+            logger.warning("Mix components have embeddings of different sizes, mixing voices through the API")
+            return False
+        return True
+
+    def _remote_mix(self, embeddings: List[List[float]], weights: List[float]) -> List[float]:
         if not self.client:
             logger.error("Cannot create mixed embedding without API client.")
             raise ValueError("API client is not initialized. Cannot create mixed embedding.")
 
-        mix_components = []
-        for component in components:
-            embedding = self._get_embedding(component.get('id') or component.get('path') or component)
-            mix_components.append({
-                "embedding": embedding,
-                "weight": component['weight']
-            })
+        return self.client.voices.mix([
+            {"embedding": embedding, "weight": weight} for embedding, weight in zip(embeddings, weights)
+        ])
 
-        return self.client.voices.mix(mix_components)
+    def create_mixed_embedding(self, components: List[Dict[str, Union[str, float, Dict]]],
+                               local: bool = None) -> List[float]:
+        """
+        Creates a mixed embedding from multiple components
+
+        :param components: List of dictionaries, each containing 'id' (or 'path', or embedding) and 'weight'
+        :param local: Mix with numpy (True) or through the API (False); defaults to self.local_mixing
+        :return: New mixed embedding
+        """
+        return self.create_mixed_embeddings([components], local=local)[0]
+
+    def create_mixed_embeddings(self, recipes: List[List[Dict[str, Union[str, float, Dict]]]],
+                                local: bool = None) -> List[List[float]]:
+        """
+        Creates many mixed embeddings at once. Recipes mixed the same way before (same
+        method, voices and normalized weights) are served from the mix memo. For the
+        rest, every distinct voice is resolved once and, when mixing locally, the N
+        blends of the M distinct voices are computed as a single (N x M) @ (M x D)
+        matrix product.
+
+        :param recipes: List of component lists, as taken by create_mixed_embedding
+        :param local: Mix with numpy (True) or through the API (False); defaults to self.local_mixing
+        :return: One mixed embedding per recipe
+        """
+        cache = self.mix_cache
+        if cache is None:
+            return self._mix(recipes, local)
+
+        mode = self.local_mixing if local is None else local
+        method = "verify" if mode == "verify" else "local" if mode else "api"
+        keys = [mix_key(components, method) for components in recipes]
+        results = [cache.get(key) for key, _ in keys]
+        for result in results:
+            self.metrics.cache_event("mix", result is not None)
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            for i, embedding in zip(missing, self._mix([recipes[i] for i in missing], local)):
+                key, voice_ids = keys[i]
+                cache.put(key, embedding, voice_ids)
+                results[i] = embedding
+        return results
+
+    def _mix(self, recipes: List[List[Dict[str, Union[str, float, Dict]]]], local: bool = None) -> List[List[float]]:
+        if local is None and self.local_mixing == "verify":
+            local = local_mixing_available() and self._local_mixing_checked(recipes)
+
+        columns, embeddings, rows = {}, [], []
+        for components in recipes:
+            if not components:
+                raise ValueError("Cannot create mixed embedding without components.")
+            row = {}
+            for component in components:
+                source = component.get('id') or component.get('path')
+                key = source or tuple(component.get('embedding') or ())
+                if key not in columns:
+                    columns[key] = len(embeddings)
+                    embeddings.append(self._get_embedding(source or component))
+                row[columns[key]] = row.get(columns[key], 0.0) + float(component['weight'])
+            rows.append(row)
+
+        if not self._mix_locally(local, embeddings):
+            return [self._remote_mix([embeddings[column] for column in row], list(row.values())) for row in rows]
+
+        weights = numpy_module().zeros((len(rows), len(embeddings)))
+        for i, row in enumerate(rows):
+            weights[i, list(row)] = list(row.values())
+        return mix_matrix(embeddings, weights).tolist()
+
+    def verify_local_mix(self, recipes: List[List[Dict[str, Union[str, float, Dict]]]],
+                         tolerance: float = 1e-4) -> Dict[str, Union[int, float, bool]]:
+        """
+        Mixes sample recipes both locally and through the API and compares the results
+
+        :return: {"recipes", "max_difference", "equivalent"}; max_difference is None
+                 when the API returned embeddings of another size
+        """
+        if not local_mixing_available():
+            raise ValueError("numpy is required for local voice mixing.")
+
+        local = self._mix(recipes, local=True)
+        remote = self._mix(recipes, local=False)
+        differences = [max_difference(a, b) for a, b in zip(local, remote)]
+        worst = None if None in differences else max(differences, default=0.0)
+        return {
+            "recipes": len(recipes),
+            "max_difference": worst,
+            "equivalent": worst is not None and worst <= tolerance,
+        }
 
     def create_custom_voice(self, name: str, source: Union[str, List[Dict]], description: str = "", language: str = "en"):
         """
@@ -489,7 +1145,7 @@ class CartesiaVoiceManager:
         else:
             raise ValueError("Invalid source type. Expected file path or list of components.")
 
-        voice_id = f"custom_{len([f for f in self.custom_dir.glob('*.json')])}"
+        voice_id = f"custom_{self.catalog.count(is_custom=True)}"
 
         voice_data = {
             "id": voice_id,
@@ -509,15 +1165,8 @@ class CartesiaVoiceManager:
         return voice_id
 
     def get_voice_id_by_name(self, name: str) -> List[str]:
-        matching_voices = []
-
-        # Check both directories
-        for directory in [self.api_dir, self.custom_dir]:
-            for file in directory.glob("*.json"):
-                with open(file, "r") as f:
-                    voice_data = json.load(f)
-                    if voice_data['name'] == name:
-                        matching_voices.append(voice_data['id'])
+        # Indexed lookup over both directories
+        matching_voices = self.catalog.ids_by_name(name)
 
         if not matching_voices:
             logger.warning(f"No voices found with name: {name}")
@@ -526,24 +1175,20 @@ class CartesiaVoiceManager:
 
         return matching_voices
 
-def improve_tts_text(text: str, language: str = 'en') -> str:
-    text = re.sub(r'(\w+)(\s*)$', r'\1.\2', text)
-    text = re.sub(r'(\w+)(\s*\n)', r'\1.\2', text)
-
-    def format_date(match):
-        date = datetime.strptime(match.group(), '%Y-%m-%d')
-        return date.strftime('%m/%d/%Y')
-
-    text = re.sub(r'\d{4}-\d{2}-\d{2}', format_date, text)
-    text = text.replace(' - ', ' - - ')
-    text = re.sub(r'\?(?![\s\n])', '??', text)
-    text = text.replace('"', '')
-    text = text.replace("'", '')
-    text = re.sub(r'(https?://\S+|\S+@\S+\.\S+)\?', r'\1 ?', text)
-
-    if language.lower() in ['ru', 'rus', 'russian']:
-        text = text.replace('г.', 'году')
-    elif language.lower() in ['fr', 'fra', 'french']:
-        text = text.replace('M.', 'Monsieur')
-
-    return text
+    def resolve_voice_id(self, identifier: str) -> str:
+        """
+        Voice ID for a voice ID or a unique voice name.
+        Names are looked up in the local catalog, then in the (cached) API listing;
+        anything not found is returned as is and treated as a voice ID.
+        """
+        if self.catalog.get(identifier) is not None:
+            return identifier
+        matches = self.catalog.ids_by_name(identifier)
+        if not matches and self.client:
+            remote = self._list_remote_voices()
+            if any(voice["id"] == identifier for voice in remote):
+                return identifier
+            matches = [voice["id"] for voice in remote if voice["name"] == identifier]
+        if len(matches) > 1:
+            raise ValueError(f"Multiple voices named '{identifier}': {', '.join(matches)}")
+        return matches[0] if matches else identifier
@@ -1,18 +1,25 @@
 import os
-import json
+import threading
 from pathlib import Path
 from typing import List, Dict, Union, Optional
 from enum import Enum
-from tqdm import tqdm
 from loguru import logger
-from datetime import datetime
-import re
-from dotenv import load_dotenv
 
-try:
-    from cartesia import Cartesia
-except ImportError:
-    Cartesia = None  # Handle the case where Cartesia is not installed
+from .api_health import ApiHealth
+from .embedding_store import EmbeddingStore, read_voice_file, write_voice_file, migrate_voice_dir
+from .instrumented_client import InstrumentedClient
+from .log_config import configure_logging, hot_logger
+from .metrics import MetricsRegistry, WrapperMetrics
+from .sdk import cartesia_class
+from .output_formats import OUTPUT_PROFILES, file_extension, resolve_output_format
+from .text_normalization import improve_tts_text
+from .transport import Transport
+from .ttl_cache import TTLCache
+from .voice_catalog import VoiceCatalog
+from .voice_sync import VoiceSync
+
+# Marks a client that has not been created yet, see CartesiaVoiceManager.client
+_UNSET = object()
 
 
 class VoiceAccessibility(Enum):
@@ -32,37 +39,35 @@ class CartesiaVoiceManager:
     }
     EMOTION_NAMES = ["anger", "positivity", "surprise", "sadness", "curiosity"]
     EMOTION_LEVELS = ["lowest", "low", "omit", "high", "highest"]
+    OUTPUT_PROFILES = OUTPUT_PROFILES
 
-    def __init__(self, api_key: str = None, base_dir: Path = None):
+    def __init__(self, api_key: str = None, base_dir: Path = None, voices_cache_ttl: float = 300.0,
+                 metrics: MetricsRegistry = None, transport: Transport = None,
+                 health_ttl: float = 60.0, deep_health_check: bool = False):
         # -----------------------------------------
         # 1. Загрузка .env и установка API-ключа
         # -----------------------------------------
+        from dotenv import load_dotenv
         load_dotenv()
+
+        # API call, latency, audio and cache metrics; the process-wide registry unless given one
+        self.metrics = WrapperMetrics(metrics)
+        # Live API by default; SONIC_TRANSPORT=record:<file> / replay:<file> switches it
+        self.transport = transport or Transport.from_env()
         self.api_key = api_key or os.environ.get("CARTESIA_API_KEY")
         
         # -----------------------------------------
-        # 2. Попытка инициализации Cartesia клиента
+        # 2. Cartesia клиент создаётся при первом обращении к self.client
         # -----------------------------------------
-        if self.api_key and Cartesia:
-            try:
-                self.client = Cartesia(api_key=self.api_key)
-                logger.info("Cartesia client initialized with API key.")
-            except Exception as e:
-                logger.error(f"Failed to initialize Cartesia client: {e}")
-                self.client = None
-        else:
-            self.client = None
-            if not self.api_key:
-                logger.warning("API key not provided. Cartesia client is not initialized. Some features will be unavailable.")
-            else:
-                logger.warning("Cartesia library not available. Cartesia client is not initialized.")
+        self._client = _UNSET
+        self._client_lock = threading.Lock()
 
         # -----------------------------------------
         # 3. Внутренние статусы (доступность API, генерация)
         # -----------------------------------------
-        self._is_api_available = False
-        self._can_generate = False
-        self._last_check_datetime: Optional[datetime] = None
+        # Кэшируемый статус API: лёгкая проверка раз в health_ttl секунд,
+        # генерация тестового фрагмента — только при deep_health_check=True
+        self.health = ApiHealth(self, ttl=health_ttl, deep_check=deep_health_check)
 
         # -----------------------------------------
         # 4. Основные поля и настройки
@@ -81,6 +86,25 @@ class CartesiaVoiceManager:
         self.api_dir.mkdir(parents=True, exist_ok=True)
         self.custom_dir.mkdir(parents=True, exist_ok=True)
 
+        # Packed float32 embeddings referenced by the compact voice files
+        self.api_embeddings = EmbeddingStore(self.api_dir / "embeddings.f32")
+        self.custom_embeddings = EmbeddingStore(self.custom_dir / "embeddings.f32")
+
+        # Persistent index of local voices (built from the voice files on first use)
+        self.catalog = VoiceCatalog(self.base_dir / "catalog.sqlite3", self.api_dir, self.custom_dir)
+
+        # Remote voice listing, fetched at most once per TTL window
+        self.remote_voices = TTLCache(
+            self._fetch_remote_voices, ttl=voices_cache_ttl, name="voices.list",
+            on_lookup=lambda hit: self.metrics.cache_event("voices.list", hit)
+        )
+
+        # Dropdown choices and label <-> id maps, valid until the catalog changes
+        self._choices_cache = {}
+        self._label_to_id = {}
+        self._id_to_label = {}
+        self._label_state = None
+
         # Initialize voices
         self.voices = {}
         self.loaded_voices = set()
@@ -89,13 +113,15 @@ class CartesiaVoiceManager:
         self._speed = 0.0  # normal speed
         self._emotions = {}
 
-        logger.add("cartesia_voice_manager.log", rotation="10 MB")
+        # Sinks are set up once per process, see log_config
+
+        configure_logging()
         logger.info("CartesiaVoiceManager initialized")
 
         # -----------------------------------------
-        # 5. После инициализации проверим статус
+        # 5. После инициализации проверим статус (в фоне, не блокируя конструктор)
         # -----------------------------------------
-        self.update_api_status()
+        self.health.refresh_in_background()
 
 
     # =========================================================================
@@ -108,15 +134,16 @@ class CartesiaVoiceManager:
         Возвращает флаг, указывающий, доступен ли API (валидный ключ, 
         можем ли получить список голосов).
         """
-        return self._is_api_available
+        return self.health.is_api_available
 
     @property
     def can_generate(self) -> bool:
         """
         Возвращает флаг, указывающий, можем ли мы генерировать аудио 
-        (проверяем путём генерации короткого фрагмента).
+        (по результату глубокой проверки, если она выполнялась,
+        иначе — по результату лёгкой проверки).
         """
-        return self._can_generate
+        return self.health.can_generate
 
     @property
     def last_check_datetime(self) -> Optional[str]:
@@ -124,10 +151,54 @@ class CartesiaVoiceManager:
         Дата/время последней проверки статуса в виде строки (YYYY-MM-DD HH:MM:SS).
         Если статус не проверялся, вернёт None.
         """
-        if self._last_check_datetime:
-            return self._last_check_datetime.strftime('%Y-%m-%d %H:%M:%S')
+        return self.health.last_check_datetime
+
+    @property
+    def client(self):
+        if self._client is _UNSET:
+            with self._client_lock:
+                if self._client is _UNSET:
+                    self._client = self._instrument(self._create_client())
+        return self._client
+
+    def _create_client(self):
+        """
+        Попытка инициализации Cartesia клиента (SDK импортируется только здесь).
+        """
+        Cartesia = cartesia_class()
+        if self.api_key and Cartesia:
+            try:
+                client = self.transport(Cartesia(api_key=self.api_key))
+                logger.info("Cartesia client initialized with API key.")
+                return client
+            except Exception as e:
+                logger.error(f"Failed to initialize Cartesia client: {e}")
+                return None
+        if not self.transport.needs_api_key:
+            return self.transport(None)
+        if not self.api_key:
+            logger.warning("API key not provided. Cartesia client is not initialized. Some features will be unavailable.")
+        else:
+            logger.warning("Cartesia library not available. Cartesia client is not initialized.")
         return None
 
+    @client.setter
+    def client(self, client):
+        with self._client_lock:
+            self._client = self._instrument(client)
+
+    def _instrument(self, client):
+        # Every client goes through the metrics proxy, including ones assigned from outside
+        if client is not None and not isinstance(client, InstrumentedClient):
+            client = InstrumentedClient(client, self.metrics)
+        return client
+
+    def get_metrics(self) -> Dict[str, Dict]:
+        """
+        Returns the current metric values, see sonic_wrapper.metrics.
+        """
+        return self.metrics.snapshot()
+
     def set_api_key(self, api_key: str):
         """
         Устанавливает новый API-ключ, переинициализирует клиента и 
@@ -136,10 +207,12 @@ class CartesiaVoiceManager:
         logger.info(f"Setting a new API key: {api_key}")
         self.api_key = api_key
         
+        Cartesia = cartesia_class()
         if Cartesia:
             try:
-                self.client = Cartesia(api_key=self.api_key)
+                self.client = self.transport(Cartesia(api_key=self.api_key))
                 logger.info("Cartesia client re-initialized with new API key.")
+                self.invalidate_voice_cache()
                 # Сохраняем ключ в .env (при желании)
                 self._save_api_key_to_env()
             except Exception as e:
@@ -161,6 +234,28 @@ class CartesiaVoiceManager:
             env_file.write(f'CARTESIA_API_KEY={self.api_key}\n')
         logger.info("API key saved to .env file.")
 
+    def _fetch_remote_voices(self) -> List[Dict]:
+        return self.client.voices.list()
+
+    def _list_remote_voices(self) -> List[Dict]:
+        """
+        Returns the remote voice listing, calling voices.list() at most once per TTL window.
+        Stale listings are served while a background refresh is running.
+        """
+        return self.remote_voices.get()
+
+    def invalidate_voice_cache(self):
+        """
+        Forces the next listing to be fetched from the API.
+        """
+        self.remote_voices.invalidate()
+
+    def get_voice_cache_stats(self) -> Dict[str, int]:
+        """
+        Returns hit/miss counters of the remote voice listing cache.
+        """
+        return self.remote_voices.stats()
+
     # Если потребуется base_url или иные настройки для Cartesia, 
     # аналогичным образом можно сделать set_base_url(...).
 
@@ -169,104 +264,49 @@ class CartesiaVoiceManager:
     #                     ПРОВЕРКА ДОСТУПНОСТИ API / ГЕНЕРАЦИИ
     # =========================================================================
 
-    def update_api_status(self):
+    def update_api_status(self, deep: bool = None):
         """
-        Последовательно вызывает методы check_api_availability() и check_can_generate().
-        Обновляет внутренние флаги и сохраняет дату последней проверки.
+        Синхронно обновляет статус: лёгкая проверка (один запрос voices.get),
+        а при deep=True (или deep_health_check в конструкторе) — ещё и
+        генерация 1 символа с уже полученным embedding.
         """
-        self._is_api_available = self.check_api_availability()
-        self._can_generate = False
-        if self._is_api_available:
-            self._can_generate = self.check_can_generate()
-
-        self._last_check_datetime = datetime.now()
-        logger.info(f"API status updated: is_api_available={self._is_api_available}, "
-                    f"can_generate={self._can_generate}, last_check={self.last_check_datetime}")
+        status = self.health.refresh(deep=deep)
+        logger.info(f"API status updated: is_api_available={status['is_api_available']}, "
+                    f"can_generate={status['can_generate']}, last_check={status['last_check']}")
 
     def check_api_availability(self) -> bool:
         """
-        Проверяем, что API-ключ рабочий, пытаясь получить список голосов.
-        Если запрос успешно возвращает хотя бы один голос — считаем, что API доступен.
+        Лёгкая проверка: API доступен и ключ рабочий, если удаётся получить
+        известный голос (voices.list вызывается, только когда голосов ещё нет).
         Возвращает True или False.
         """
-        if not self.client:
-            logger.warning("No Cartesia client to check availability.")
-            return False
-
-        try:
-            voices = self.client.voices.list()
-            if voices:
-                logger.info("API key is valid, voices retrieved successfully.")
-                return True
-            else:
-                logger.warning("API key might be invalid or no voices returned.")
-                return False
-        except Exception as e:
-            logger.error(f"Error checking API availability: {e}")
-            return False
+        return self.health.probe()
 
     def check_can_generate(self) -> bool:
         """
-        Проверяем, можем ли мы генерировать аудио, 
-        попробовав сгенерировать короткий фрагмент (1 символ).
-        Если сгенерировали без исключений — True, иначе False.
+        Глубокая проверка: генерируем 1 символ в самом компактном профиле,
+        используя embedding, запомненный лёгкой проверкой (без повторных
+        voices.list / voices.get). Расходует квоту — вызывайте явно.
         """
-        if not self.client:
-            logger.warning("No Cartesia client to check generation.")
-            return False
-
-        # Для теста нам нужно хотя бы какой-то embedding. 
-        # Можно взять публичный голос (если есть) или любой voice_embedding.
-        # Здесь для примера попробуем просто получить список, взять первый голос и сгенерировать 1 символ.
-        try:
-            voices = self.client.voices.list()
-            if not voices:
-                logger.warning("No voices found to test generation.")
-                return False
-
-            # Берём embedding первого голоса из списка
-            # Полноценная инфа: voices.get(id=voice_id)
-            test_voice_id = voices[0]['id']
-            test_voice_data = self.client.voices.get(id=test_voice_id)
-            test_embedding = test_voice_data['embedding']
-
-            # Пробуем сгенерировать 1 символ (например, "A")
-            test_audio = self.client.tts.bytes(
-                model_id='sonic-english',         # допустим, английская модель
-                transcript='A',                   # всего 1 символ
-                voice_embedding=test_embedding,
-                duration=None,
-                output_format={
-                    "container": "wav",
-                    "encoding": "pcm_f32le",
-                    "sample_rate": 44100,
-                },
-                # Доп. настройки не задаём, главное, что бы работало
-            )
-            if test_audio:
-                logger.info("Successfully generated a short test audio — generation is available.")
-                return True
-            else:
-                logger.warning("Test audio is empty — generation might not be available.")
-                return False
-        except Exception as e:
-            logger.error(f"Error checking generation capability: {e}")
-            return False
+        return self.health.deep_probe()
 
-    def get_api_status(self) -> Dict[str, Union[bool, str]]:
+    def get_api_status(self) -> Dict[str, Union[bool, str, None]]:
         """
-        Возвращает словарь с текущим статусом:
+        Мгновенно возвращает последний известный статус:
         {
             "is_api_available": bool,
             "can_generate": bool,
-            "last_check": str или None
+            "generation_verified": bool,  # была ли глубокая проверка
+            "last_check": str или None,
+            "latency_ms": float или None,
+            "error": str или None,
+            "consecutive_failures": int,
+            "stale": bool
         }
+        Устаревший статус обновляется в фоне; для периодического обновления
+        используйте manager.health.start().
         """
-        return {
-            "is_api_available": self._is_api_available,
-            "can_generate": self._can_generate,
-            "last_check": self.last_check_datetime
-        }
+        return self.health.status()
 
     # =========================================================================
     #                ОСТАЛЬНЫЕ МЕТОДЫ КЛАССА (Не менялись)
@@ -280,17 +320,16 @@ class CartesiaVoiceManager:
         custom_file = self.custom_dir / f"{voice_id}.json"
 
         if api_file.exists():
-            voice_file = api_file
+            voice_file, store = api_file, self.api_embeddings
         elif custom_file.exists():
-            voice_file = custom_file
+            voice_file, store = custom_file, self.custom_embeddings
 
         if voice_file:
-            with open(voice_file, "r") as f:
-                voice_data = json.load(f)
-                self.voices[voice_id] = voice_data
-                self.loaded_voices.add(voice_id)
-                logger.info(f"Loaded voice {voice_id} from {voice_file}")
-                return voice_data
+            voice_data = read_voice_file(voice_file, store)
+            self.voices[voice_id] = voice_data
+            self.loaded_voices.add(voice_id)
+            hot_logger.info(f"Loaded voice {voice_id} from {voice_file}")
+            return voice_data
         else:
             if self.client:
                 try:
@@ -307,23 +346,65 @@ class CartesiaVoiceManager:
                 logger.error(f"Cannot load voice {voice_id} without API client.")
                 raise ValueError(f"Voice with id {voice_id} not found and API client is not available.")
 
+    def _catalog_state(self) -> tuple:
+        """
+        Changes whenever the remote listing or the local catalog changes.
+        """
+        return (self.remote_voices.generation, self.catalog.version)
+
     def extract_voice_id_from_label(self, voice_label: str) -> Optional[str]:
-        choices = self.get_voice_choices()
-        voice_data = next((c for c in choices if c["label"] == voice_label), None)
-        return voice_data["value"] if voice_data else None
+        """
+        Extracts voice ID from label in dropdown
+        For example: "John (en) [Custom]" -> extract ID from voices dictionary
+        """
+        if self._label_state != self._catalog_state():
+            self.get_voice_choices()
+        return self._label_to_id.get(voice_label)
+
+    def get_voice_label(self, voice_id: str) -> Optional[str]:
+        """
+        Returns the dropdown label of a voice ID
+        """
+        if self._label_state != self._catalog_state():
+            self.get_voice_choices()
+        return self._id_to_label.get(voice_id)
 
     def get_voice_choices(self, language: str = None, accessibility: VoiceAccessibility = VoiceAccessibility.ALL) -> List[Dict]:
+        """
+        Returns a list of voices for dropdown menu.
+        Cached per filter until the remote listing or the local catalog changes.
+        """
+        key = (language, accessibility)
+        cached = self._choices_cache.get(key)
+        if cached and cached[0] == self._catalog_state() and not self.remote_voices.expired:
+            return list(cached[1])
+
         voices = self.list_available_voices(
             languages=[language] if language else None,
             accessibility=accessibility
         )
+        state = self._catalog_state()
+
         choices = []
         for voice in voices:
+            # Keep only ID in value
             choices.append({
                 "label": f"{voice['name']} ({voice['language']}){' [Custom]' if voice.get('is_custom') else ''}",
-                "value": voice['id']
+                "value": voice['id']  # Only ID here
             })
-        return sorted(choices, key=lambda x: x['label'])
+        choices = sorted(choices, key=lambda x: x['label'])
+        self._choices_cache[key] = (state, choices)
+
+        if language is None and accessibility == VoiceAccessibility.ALL:
+            # The unfiltered listing backs label <-> id resolution; first label wins as before
+            label_to_id, id_to_label = {}, {}
+            for choice in choices:
+                label_to_id.setdefault(choice["label"], choice["value"])
+                id_to_label.setdefault(choice["value"], choice["label"])
+            self._label_to_id, self._id_to_label = label_to_id, id_to_label
+            self._label_state = state
+
+        return list(choices)
 
     def get_voice_info(self, voice_id: str) -> Dict:
         voice = self.load_voice(voice_id)
@@ -338,40 +419,54 @@ class CartesiaVoiceManager:
     def _save_voice_to_api(self, voice_data: Dict):
         voice_id = voice_data["id"]
         file_path = self.api_dir / f"{voice_id}.json"
-        with open(file_path, "w") as f:
-            json.dump(voice_data, f, indent=2)
+        write_voice_file(file_path, voice_data, self.api_embeddings)
+        self.catalog.upsert(voice_data, "api")
         logger.info(f"Saved API voice {voice_id} to {file_path}")
 
     def _save_voice_to_custom(self, voice_data: Dict):
         voice_id = voice_data["id"]
         file_path = self.custom_dir / f"{voice_id}.json"
-        with open(file_path, "w") as f:
-            json.dump(voice_data, f, indent=2)
+        write_voice_file(file_path, voice_data, self.custom_embeddings)
+        self.catalog.upsert(voice_data, "custom")
         logger.info(f"Saved custom voice {voice_id} to {file_path}")
 
-    def update_voices_from_api(self):
+    def migrate_voice_storage(self) -> int:
+        """
+        Converts voice files with inline JSON embeddings to the compact layout
+        (metadata record + packed float32 embeddings). Legacy files are also
+        converted on the fly when loaded, so running this is optional.
+
+        :return: Number of converted files
+        """
+        migrated = migrate_voice_dir(self.api_dir, self.api_embeddings)
+        migrated += migrate_voice_dir(self.custom_dir, self.custom_embeddings)
+        return migrated
+
+    def update_voices_from_api(self, max_workers: int = 8, prune: bool = False) -> Optional[Dict[str, List[str]]]:
+        """
+        Mirrors the API voice library into api_dir, fetching only new or changed voices.
+
+        :param max_workers: Number of concurrent voices.get requests
+        :param prune: Delete local API voices that are no longer listed by the API
+        :return: Summary with added, updated, unchanged, removed and failed voice IDs
+        """
         if not self.client:
             logger.warning("Cannot update voices from API without API client.")
-            return
+            return None
+
         logger.info("Updating voices from API")
         try:
-            api_voices = self.client.voices.list()
-            for voice in tqdm(api_voices, desc="Updating voices"):
-                voice_id = voice["id"]
-                full_voice_data = self.client.voices.get(id=voice_id)
-                self._save_voice_to_api(full_voice_data)
-                if voice_id in self.loaded_voices:
-                    self.voices[voice_id] = full_voice_data
-            logger.info(f"Updated {len(api_voices)} voices from API")
+            return VoiceSync(self, max_workers=max_workers, prune=prune).run()
         except Exception as e:
             logger.error(f"Failed to update voices from API: {e}")
+            return None
 
     def list_available_voices(self, languages: List[str] = None, accessibility: VoiceAccessibility = VoiceAccessibility.ALL) -> List[Dict]:
         filtered_voices = []
         # API голоса
-        if self.client and accessibility in [VoiceAccessibility.ALL, VoiceAccessibility.ONLY_PUBLIC]:
+        if accessibility in [VoiceAccessibility.ALL, VoiceAccessibility.ONLY_PUBLIC] and self.client:
             try:
-                api_voices = self.client.voices.list()
+                api_voices = self._list_remote_voices()
                 for voice in api_voices:
                     metadata = {
                         'id': voice['id'],
@@ -393,22 +488,11 @@ class CartesiaVoiceManager:
             logger.warning("API client is not available. Skipping API voices.")
         # Custom голоса
         if accessibility in [VoiceAccessibility.ALL, VoiceAccessibility.ONLY_CUSTOM]:
-            for file in self.custom_dir.glob("*.json"):
-                with open(file, "r") as f:
-                    voice_data = json.load(f)
-                    if languages is None or voice_data['language'] in languages:
-                        metadata = {
-                            'id': voice_data['id'],
-                            'name': voice_data['name'],
-                            'language': voice_data['language'],
-                            'is_public': False,
-                            'is_custom': True
-                        }
-                        filtered_voices.append(metadata)
+            filtered_voices.extend(self.catalog.query(languages=languages, is_custom=True))
         # Приватные голоса (не публичные, но из API)
         if accessibility in [VoiceAccessibility.ALL, VoiceAccessibility.ONLY_PRIVATE] and self.client:
             try:
-                api_voices = self.client.voices.list()
+                api_voices = self._list_remote_voices()
                 for voice in api_voices:
                     if not voice['is_public'] and not voice.get('is_custom'):
                         metadata = {
@@ -422,7 +506,7 @@ class CartesiaVoiceManager:
                             filtered_voices.append(metadata)
             except Exception as e:
                 logger.error(f"Failed to fetch private voices from API: {e}")
-        logger.info(f"Found {len(filtered_voices)} voices matching criteria")
+        hot_logger.info(f"Found {len(filtered_voices)} voices matching criteria")
         return filtered_voices
 
     def set_voice(self, voice_id: str):
@@ -431,13 +515,13 @@ class CartesiaVoiceManager:
         custom_file = self.custom_dir / f"{voice_id}.json"
 
         if api_file.exists():
-            voice_file = api_file
+            voice_file, store = api_file, self.api_embeddings
         elif custom_file.exists():
-            voice_file = custom_file
+            voice_file, store = custom_file, self.custom_embeddings
 
         if voice_file:
-            with open(voice_file, "r") as f:
-                self.current_voice = json.load(f)
+            # Metadata only; the embedding is read when speak() needs it
+            self.current_voice = read_voice_file(voice_file, store)
         else:
             if self.client:
                 try:
@@ -452,7 +536,7 @@ class CartesiaVoiceManager:
                 raise ValueError(f"Voice with id {voice_id} not found and API client is not available.")
 
         self.set_language(self.current_voice['language'])
-        logger.info(f"Set current voice to {voice_id}")
+        hot_logger.info(f"Set current voice to {voice_id}")
 
     def set_model(self, language: str):
         if language.lower() in ['en', 'eng', 'english']:
@@ -460,12 +544,12 @@ class CartesiaVoiceManager:
         else:
             self.current_model = "sonic-multilingual"
         self.current_language = language
-        logger.info(f"Set model to {self.current_model} for language {language}")
+        hot_logger.info(f"Set model to {self.current_model} for language {language}")
 
     def set_language(self, language: str):
         self.current_language = language
         self.set_model(language)
-        logger.info(f"Set language to {language}")
+        hot_logger.info(f"Set language to {language}")
 
     @property
     def speed(self):
@@ -483,12 +567,12 @@ class CartesiaVoiceManager:
             self._speed = value
         else:
             raise ValueError("Speed must be a string from SPEED_OPTIONS or a number between -1 and 1")
-        logger.info(f"Set speed to {self._speed}")
+        hot_logger.info(f"Set speed to {self._speed}")
 
     def set_emotions(self, emotions: List[Dict[str, str]] = None):
         if emotions is None:
             self._emotions = {}
-            logger.info("Cleared all emotions")
+            hot_logger.info("Cleared all emotions")
             return
 
         self._emotions = {}
@@ -503,7 +587,7 @@ class CartesiaVoiceManager:
 
             self._emotions[name] = level
 
-        logger.info(f"Set emotions: {self._emotions}")
+        hot_logger.info(f"Set emotions: {self._emotions}")
 
     def _get_voice_controls(self):
         controls = {"speed": self._speed}
@@ -511,7 +595,7 @@ class CartesiaVoiceManager:
             controls["emotion"] = [f"{name}:{level}" for name, level in self._emotions.items()]
         return controls
 
-    def speak(self, text: str, output_file: str = None):
+    def speak(self, text: str, output_file: str = None, output_format: Union[str, Dict] = None):
         if not self.current_model or not (self.current_voice or self.current_mix):
             raise ValueError("Please set a model and a voice or voice mix before speaking.")
         if not self.client:
@@ -521,14 +605,10 @@ class CartesiaVoiceManager:
         voice_embedding = self.current_voice['embedding'] if self.current_voice else self.current_mix
         improved_text = improve_tts_text(text, self.current_language)
 
-        output_format = {
-            "container": "wav",
-            "encoding": "pcm_f32le",
-            "sample_rate": 44100,
-        }
+        output_format = resolve_output_format(output_format)
         voice_controls = self._get_voice_controls()
 
-        logger.info(f"Generating audio for text: {text[:50]}... with voice controls: {voice_controls}")
+        hot_logger.info(f"Generating audio for text: {text[:50]}... with voice controls: {voice_controls}")
         if self.current_language == 'en':
             audio_data = self.client.tts.bytes(
                 model_id='sonic-english',
@@ -550,11 +630,11 @@ class CartesiaVoiceManager:
             )
 
         if output_file is None:
-            output_file = f"output_{self.current_language}.wav"
+            output_file = f"output_{self.current_language}{file_extension(output_format)}"
 
         with open(output_file, "wb") as f:
             f.write(audio_data)
-        logger.info(f"Audio saved to {output_file}")
+        hot_logger.info(f"Audio saved to {output_file}")
         print(f"Audio generated and saved to {output_file}")
 
         return output_file
@@ -601,7 +681,7 @@ class CartesiaVoiceManager:
         else:
             raise ValueError("Invalid source type. Expected file path or list of components.")
 
-        voice_id = f"custom_{len([f for f in self.custom_dir.glob('*.json')])}"
+        voice_id = f"custom_{self.catalog.count(is_custom=True)}"
 
         voice_data = {
             "id": voice_id,
@@ -619,13 +699,7 @@ class CartesiaVoiceManager:
         return voice_id
 
     def get_voice_id_by_name(self, name: str) -> List[str]:
-        matching_voices = []
-        for directory in [self.api_dir, self.custom_dir]:
-            for file in directory.glob("*.json"):
-                with open(file, "r") as f:
-                    voice_data = json.load(f)
-                    if voice_data['name'] == name:
-                        matching_voices.append(voice_data['id'])
+        matching_voices = self.catalog.ids_by_name(name)
         if not matching_voices:
             logger.warning(f"No voices found with name: {name}")
         else:
@@ -633,24 +707,6 @@ class CartesiaVoiceManager:
         return matching_voices
 
 
-def improve_tts_text(text: str) -> str:
-    text = re.sub(r'(\w+)(\s*)$', r'\1.\2', text)
-    text = re.sub(r'(\w+)(\s*\n)', r'\1.\2', text)
-
-    def format_date(match):
-        date = datetime.strptime(match.group(), '%Y-%m-%d')
-        return date.strftime('%m/%d/%Y')
-
-    text = re.sub(r'\d{4}-\d{2}-\d{2}', format_date, text)
-    text = text.replace(' - ', ' - - ')
-    text = re.sub(r'\?(?![\s\n])', '??', text)
-    text = text.replace('"', '')
-    text = text.replace("'", '')
-    text = re.sub(r'(https?://\S+|\S+@\S+\.\S+)\?', r'\1 ?', text)
-
-    return text
-
-
 # ============================================================================
 # Пример использования
 # ============================================================================
@@ -0,0 +1,431 @@
+"""
+Local stand-in for the Cartesia HTTP API.
+
+Implements the endpoints the wrapper uses (voices list/get/create/delete/mix/clone,
+tts bytes and sse) over a synthetic voice library, with injectable latency,
+failures and rate limiting. Point the SDK at it with ``CARTESIA_BASE_URL``:
+
+    python -m sonic_wrapper.standin_server --port 8787 --latency-ms 80 --error-rate 0.02
+    CARTESIA_BASE_URL=http://127.0.0.1:8787 CARTESIA_API_KEY=test python -m sonic_wrapper.cli ...
+
+Generated audio is silence whose length is proportional to the transcript.
+"""
+import argparse
+import base64
+import email.parser
+import email.policy
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from .wav import bytes_per_sample, wav_header
+
+LANGUAGES = ["en", "ru", "es", "de", "fr", "pl", "pt", "zh", "ja", "hi", "it", "ko", "nl", "sv", "tr"]
+EMBEDDING_DIM = 192
+
+
+def make_voices(count: int, seed: int = 0) -> List[Dict]:
+    """
+    Generates ``count`` API voices with random embeddings and a mix of languages.
+    """
+    rng = random.Random(seed)
+    voices = []
+    for i in range(count):
+        voices.append({
+            "id": f"fake-{i:06d}",
+            "name": f"Voice {i}",
+            "description": f"Synthetic voice number {i}",
+            "language": rng.choice(LANGUAGES),
+            "is_public": i % 5 != 0,
+            "created_at": "2024-01-01T00:00:00Z",
+            "embedding": [rng.uniform(-1.0, 1.0) for _ in range(EMBEDDING_DIM)],
+        })
+    return voices
+
+
+def embedding_from_bytes(data: bytes) -> List[float]:
+    """
+    Deterministic embedding for a cloned clip.
+    """
+    rng = random.Random(hashlib.sha256(data).digest())
+    return [rng.uniform(-1.0, 1.0) for _ in range(EMBEDDING_DIM)]
+
+
+def synthetic_audio(transcript: str, output_format: Dict, seconds_per_char: float = 0.06) -> bytes:
+    """
+    Silence of ``seconds_per_char`` per character in ``output_format``; wav containers get a header.
+    """
+    samples = int(output_format["sample_rate"] * len(transcript) * seconds_per_char)
+    pcm = bytes(samples * bytes_per_sample(output_format["encoding"]))
+    if output_format.get("container") == "wav":
+        return wav_header(output_format["encoding"], output_format["sample_rate"], len(pcm)) + pcm
+    return pcm
+
+
+class TokenBucket:
+    """
+    Allows ``rate`` requests per second with bursts of up to ``burst``.
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, math.ceil(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes a token; returns 0 on success, otherwise seconds until one is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class CartesiaStandIn:
+    """
+    In-process HTTP server speaking the subset of the Cartesia API used by the wrapper.
+
+    :param voices: Voice library (default: ``make_voices(voice_count, seed)``)
+    :param voice_count: Size of the generated library when ``voices`` is not given
+    :param latency: Seconds added before every response (time to first chunk for sse)
+    :param jitter: Up to this many seconds randomly added to or removed from ``latency``
+    :param error_rate: Fraction of requests answered with HTTP 500
+    :param stream_error_rate: Fraction of sse streams that fail after the first chunk
+    :param rate_limit: Requests per second before answering HTTP 429 (None: unlimited)
+    :param burst: Token bucket size of the rate limit (default: ceil(rate_limit))
+    :param api_key: Required X-API-Key value (None: any non-empty key)
+    :param seconds_per_char: Length of generated audio per transcript character
+    :param chunk_size: Bytes of audio per sse chunk
+    :param seed: Seed of the generated library and of injected failures
+    """
+
+    def __init__(self, voices: List[Dict] = None, voice_count: int = 200, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, stream_error_rate: float = 0.0,
+                 rate_limit: Optional[float] = None, burst: int = None, api_key: str = None,
+                 seconds_per_char: float = 0.06, chunk_size: int = 8192, seed: int = 0):
+        library = voices if voices is not None else make_voices(voice_count, seed)
+        self._voices = {voice["id"]: dict(voice) for voice in library}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stream_error_rate = stream_error_rate
+        self.rate_limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self.api_key = api_key
+        self.seconds_per_char = seconds_per_char
+        self.chunk_size = chunk_size
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = Counter()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # ------------------------------------------------------------------ server
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Serves from a daemon thread and returns the base URL (pass port=0 for a free port).
+        """
+        handler = type("StandInHandler", (_StandInHandler,), {"standin": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="cartesia-standin", daemon=True).start()
+        logger.info(f"Cartesia stand-in listening on {self.base_url}")
+        return self.base_url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @property
+    def base_url(self) -> Optional[str]:
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "CartesiaStandIn":
+        if self._server is None:
+            self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Requests per endpoint (e.g. "tts_sse") plus errors, stream_errors and rate_limited.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    # ---------------------------------------------------------------- behaviour
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _chance(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < rate
+
+    def _delay(self):
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self._rng.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def list_voices(self) -> List[Dict]:
+        with self._lock:
+            return [{k: v for k, v in voice.items() if k != "embedding"} for voice in self._voices.values()]
+
+    def get_voice(self, voice_id: str) -> Optional[Dict]:
+        with self._lock:
+            voice = self._voices.get(voice_id)
+            return dict(voice) if voice else None
+
+    def create_voice(self, body: Dict) -> Dict:
+        voice = {
+            "id": str(uuid.uuid4()),
+            "name": body.get("name", ""),
+            "description": body.get("description", ""),
+            "language": body.get("language", "en"),
+            "is_public": False,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "embedding": body.get("embedding") or [],
+        }
+        with self._lock:
+            self._voices[voice["id"]] = voice
+        return voice
+
+    def delete_voice(self, voice_id: str) -> bool:
+        with self._lock:
+            return self._voices.pop(voice_id, None) is not None
+
+    def mix(self, components: List[Dict]) -> List[float]:
+        embeddings, weights = [], []
+        for component in components:
+            embedding = component.get("embedding")
+            if embedding is None:
+                voice = self.get_voice(component.get("id", ""))
+                if voice is None:
+                    raise KeyError(component.get("id"))
+                embedding = voice["embedding"]
+            embeddings.append(embedding)
+            weights.append(float(component["weight"]))
+        total = sum(weights) or 1.0
+        return [sum(e[i] * w for e, w in zip(embeddings, weights)) / total for i in range(len(embeddings[0]))]
+
+
+ROUTES: List[Tuple[str, "re.Pattern", str]] = [
+    ("GET", re.compile(r"^/voices/?$"), "list_voices"),
+    ("POST", re.compile(r"^/voices/clone/clip$"), "clone_clip"),
+    ("POST", re.compile(r"^/voices/mix$"), "mix_voices"),
+    ("POST", re.compile(r"^/voices/?$"), "create_voice"),
+    ("GET", re.compile(r"^/voices/(?P<voice_id>[^/]+)$"), "get_voice"),
+    ("DELETE", re.compile(r"^/voices/(?P<voice_id>[^/]+)$"), "delete_voice"),
+    ("POST", re.compile(r"^/tts/bytes$"), "tts_bytes"),
+    ("POST", re.compile(r"^/tts/sse$"), "tts_sse"),
+    ("GET", re.compile(r"^/_standin/stats$"), "stats"),
+]
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    standin: CartesiaStandIn = None
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        logger.debug(f"cartesia stand-in: {format % args}")
+
+    def _dispatch(self, method: str):
+        path = self.path.split("?")[0]
+        for route_method, pattern, name in ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                break
+        else:
+            self._send_json(404, {"error": f"No route for {method} {path}"})
+            return
+
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if name == "stats":
+            self._send_json(200, self.standin.stats())
+            return
+
+        standin = self.standin
+        standin._count(name)
+        expected_key = standin.api_key
+        key = self.headers.get("X-API-Key")
+        if not key or (expected_key is not None and key != expected_key):
+            standin._count("errors")
+            self._send_json(401, {"error": "Invalid API key"})
+            return
+        if standin.rate_limiter is not None:
+            retry_after = standin.rate_limiter.acquire()
+            if retry_after:
+                standin._count("rate_limited")
+                self._send_json(429, {"error": "Rate limit exceeded"},
+                                {"Retry-After": str(max(1, math.ceil(retry_after)))})
+                return
+        standin._delay()
+        if standin._chance(standin.error_rate):
+            standin._count("errors")
+            self._send_json(500, {"error": "Injected server error"})
+            return
+
+        try:
+            getattr(self, f"_{name}")(body, **match.groupdict())
+        except (KeyError, ValueError, TypeError) as e:
+            standin._count("errors")
+            self._send_json(400, {"error": f"Bad request: {e}"})
+
+    def _send_json(self, status: int, payload, headers: Dict[str, str] = None):
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def _send(self, status: int, data: bytes, content_type: str, headers: Dict[str, str] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    # ---------------------------------------------------------------- endpoints
+
+    def _list_voices(self, body: bytes):
+        self._send_json(200, self.standin.list_voices())
+
+    def _get_voice(self, body: bytes, voice_id: str):
+        voice = self.standin.get_voice(voice_id)
+        if voice is None:
+            self._send_json(404, {"error": f"Voice {voice_id} not found"})
+        else:
+            self._send_json(200, voice)
+
+    def _create_voice(self, body: bytes):
+        voice = self.standin.create_voice(json.loads(body))
+        self._send_json(200, {k: v for k, v in voice.items() if k != "embedding"})
+
+    def _delete_voice(self, body: bytes, voice_id: str):
+        if self.standin.delete_voice(voice_id):
+            self._send(204, b"", "application/json")
+        else:
+            self._send_json(404, {"error": f"Voice {voice_id} not found"})
+
+    def _mix_voices(self, body: bytes):
+        components = json.loads(body)["voices"]
+        self._send_json(200, {"embedding": self.standin.mix(components)})
+
+    def _clone_clip(self, body: bytes):
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode("latin-1") + body
+        )
+        for part in message.iter_parts():
+            if part.get_param("name", header="content-disposition") == "clip":
+                self._send_json(200, {"embedding": embedding_from_bytes(part.get_payload(decode=True))})
+                return
+        raise ValueError("missing clip")
+
+    def _synthesize(self, body: bytes) -> Tuple[Dict, bytes]:
+        request = json.loads(body)
+        voice = request["voice"]
+        if "embedding" not in voice and self.standin.get_voice(voice.get("id", "")) is None:
+            raise KeyError(f"voice {voice.get('id')}")
+        output_format = request["output_format"]
+        return output_format, synthetic_audio(request["transcript"], output_format,
+                                              self.standin.seconds_per_char)
+
+    def _tts_bytes(self, body: bytes):
+        output_format, audio = self._synthesize(body)
+        content_type = "audio/wav" if output_format.get("container") == "wav" else "application/octet-stream"
+        self._send(200, audio, content_type)
+
+    def _tts_sse(self, body: bytes):
+        _, audio = self._synthesize(body)
+        fail = self.standin._chance(self.standin.stream_error_rate)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        size = self.standin.chunk_size
+        for index, start in enumerate(range(0, len(audio), size)):
+            if fail and index == 1:
+                self.standin._count("stream_errors")
+                self._event({"error": "Injected stream error"})
+                return
+            chunk = base64.b64encode(audio[start:start + size]).decode("ascii")
+            self._event({"data": chunk, "done": False})
+        self._event({"done": True})
+
+    def _event(self, payload: Dict):
+        self.wfile.write(f"event: chunk\ndata: {json.dumps(payload)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8787)
+    parser.add_argument('--voices', type=int, default=200, help='Synthetic API voices (default: 200)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Latency added to every request')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Random +/- variation of the latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests failing with 500')
+    parser.add_argument('--stream-error-rate', type=float, default=0.0,
+                        help='Fraction of sse streams failing after the first chunk')
+    parser.add_argument('--rate-limit', type=float, help='Requests per second before answering 429')
+    parser.add_argument('--burst', type=int, help='Burst size of the rate limit')
+    parser.add_argument('--api-key', help='Only accept this X-API-Key (default: any)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    standin = CartesiaStandIn(
+        voice_count=args.voices,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        stream_error_rate=args.stream_error_rate,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        api_key=args.api_key,
+        seed=args.seed,
+    )
+    standin.start(args.host, args.port)
+    print(f"Cartesia stand-in listening on {standin.base_url} (stats at {standin.base_url}/_standin/stats)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        standin.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+from loguru import logger
+
+
+def synthesis_key(request: Dict) -> str:
+    """
+    Content address of a TTS request: normalized transcript, voice embedding
+    (or voice id), model, language, voice controls and output format.
+    """
+    transcript = " ".join(unicodedata.normalize("NFC", request["transcript"]).split())
+    material = {
+        "transcript": transcript,
+        "voice_id": request.get("voice_id"),
+        "model_id": request["model_id"],
+        "language": request.get("language"),
+        "voice_controls": request.get("_experimental_voice_controls"),
+        "output_format": request["output_format"],
+    }
+    digest = hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8"))
+    embedding = request.get("voice_embedding")
+    if embedding is not None:
+        digest.update(struct.pack(f"<{len(embedding)}f", *embedding))
+    return digest.hexdigest()
+
+
+class SynthesisCache:
+    """
+    Two-tier cache of generated audio keyed by ``synthesis_key``.
+
+    * Memory tier: LRU of the most recently used entries, bounded by bytes.
+    * Disk tier: one file per entry under ``directory``, indexed in SQLite with
+      last-access times and evicted least-recently-used first once the total
+      size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 512 * 1024 * 1024,
+                 memory_max_bytes: int = 32 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memory_max_bytes = memory_max_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._conn = sqlite3.connect(str(self.directory / "index.sqlite3"), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries (last_access)")
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.bin"
+
+    def _remember(self, key: str, data: bytes):
+        if len(data) > self.memory_max_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return data
+
+            row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            try:
+                data = self._path(key).read_bytes()
+                if len(data) != row[0]:
+                    raise OSError(f"expected {row[0]} bytes, found {len(data)}")
+            except OSError as e:
+                logger.warning(f"Dropping broken synthesis cache entry {key}: {e}")
+                self._path(key).unlink(missing_ok=True)
+                with self._conn:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._stats["misses"] += 1
+                return None
+            with self._conn:
+                self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._remember(key, data)
+            self._stats["disk_hits"] += 1
+            return data
+
+    def put(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Written under a unique name and renamed, so a crash or a concurrent put
+        # of the same key never leaves a truncated entry behind
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, size, last_access) VALUES (?, ?, ?)",
+                    (key, len(data), time.time())
+                )
+            self._remember(key, data)
+            self._evict()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY last_access").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._path(key).unlink(missing_ok=True)
+            self._memory_bytes -= len(self._memory.pop(key, b""))
+            total -= size
+            evicted.append((key,))
+        with self._conn:
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        self._stats["evictions"] += len(evicted)
+        logger.info(f"Synthesis cache evicted {len(evicted)} entries")
+
+    def clear(self):
+        with self._lock:
+            for (key,) in self._conn.execute("SELECT key FROM entries").fetchall():
+                self._path(key).unlink(missing_ok=True)
+            with self._conn:
+                self._conn.execute("DELETE FROM entries")
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["memory_bytes"] = self._memory_bytes
+            stats["disk_entries"], stats["disk_bytes"] = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            return stats
@@ -0,0 +1,86 @@
+import re
+from typing import List
+
+# Whitespace after a sentence terminator, optionally followed by a closing quote or bracket
+_SENTENCE_END = re.compile(r'(?:(?<=[.!?…])|(?<=[.!?…]["\'»”)\]]))\s+')
+# Full-width terminators used by Chinese and Japanese, and the Devanagari danda; no space follows them
+_SENTENCE_END_CJK = re.compile(r'(?<=[。！？।])')
+# Clause boundaries, used only for sentences longer than the chunk size
+_CLAUSE_END = re.compile(r'(?<=[,;:—，、；：])\s*')
+
+_CJK_LANGUAGES = {"zh", "ja", "hi"}
+
+
+def _split(pattern: re.Pattern, text: str) -> List[str]:
+    return [part for part in pattern.split(text) if part and not part.isspace()]
+
+
+def _split_sentences(text: str, language: str) -> List[str]:
+    sentences = []
+    for line in text.splitlines():
+        parts = _split(_SENTENCE_END, line)
+        if language in _CJK_LANGUAGES:
+            parts = [p for part in parts for p in _split(_SENTENCE_END_CJK, part)]
+        sentences.extend(p.strip() for p in parts if p.strip())
+    return sentences
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """
+    Breaks a sentence longer than max_chars at clauses, then words, then characters.
+    """
+    pieces = []
+    for clause in _split(_CLAUSE_END, sentence):
+        if len(clause) <= max_chars:
+            pieces.append(clause.strip())
+            continue
+        current = ""
+        for word in clause.split():
+            while len(word) > max_chars:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(word[:max_chars])
+                word = word[max_chars:]
+            candidate = f"{current} {word}" if current else word
+            if len(candidate) > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            pieces.append(current)
+    return [p for p in pieces if p]
+
+
+def split_text(text: str, max_chars: int = 500, language: str = "en") -> List[str]:
+    """
+    Splits text into chunks of at most ``max_chars`` characters, cutting at
+    sentence boundaries where possible and at clause or word boundaries otherwise.
+    Consecutive short sentences are packed into the same chunk.
+
+    :param text: Text to split
+    :param max_chars: Maximum chunk length
+    :param language: Language code; "zh", "ja" and "hi" also split at full-width terminators
+    :return: Non-empty chunks in reading order
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars must be positive")
+
+    language = (language or "en").lower()
+    joiner = "" if language in ("zh", "ja") else " "
+
+    chunks = []
+    current = ""
+    for sentence in _split_sentences(text, language):
+        pieces = [sentence] if len(sentence) <= max_chars else _split_long(sentence, max_chars)
+        for piece in pieces:
+            candidate = f"{current}{joiner}{piece}" if current else piece
+            if len(candidate) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
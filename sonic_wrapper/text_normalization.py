@@ -0,0 +1,83 @@
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# improve_tts_text used to apply these rules one after another, each over the whole text:
+#   1. a period after the last word (r'(\w+)(\s*)$')
+#   2. a period after every word that ends a line (r'(\w+)(\s*\n)')
+#   3. YYYY-MM-DD dates -> MM/DD/YYYY
+#   4. ' - ' -> ' - - '
+#   5. '?' not followed by whitespace -> '??'
+#   6. double and single quotes removed
+#   7. a space between a URL or e-mail address and a following '?'
+# Rules 1-6 only ever look at characters none of the earlier rules touch, so they are
+# matched by a single alternation in one pass over the original text. Rule 7 looks at
+# the result of rules 5 and 6 and runs as a second pass, only when it can match.
+_FIRST_PASS = re.compile(
+    r'(?<=\w)(?=\s*(?:\n|\Z))'  # rules 1 and 2: empty match after a word that ends a line
+    r'|\d{4}-\d{2}-\d{2}'
+    r'| - '
+    r'|\?(?![\s\n])'
+    r'|["\']'
+)
+_URL_QUESTION = re.compile(r'(https?://\S+|\S+@\S+\.\S+)\?')
+
+_REPLACEMENTS = {
+    "": ".",
+    " - ": " - - ",
+    "?": "??",
+    '"': "",
+    "'": "",
+}
+
+
+@lru_cache(maxsize=4096)
+def _format_date(date: str) -> str:
+    return datetime.strptime(date, '%Y-%m-%d').strftime('%m/%d/%Y')
+
+
+def _replace(match: re.Match) -> str:
+    matched = match.group()
+    replacement = _REPLACEMENTS.get(matched)
+    return replacement if replacement is not None else _format_date(matched)
+
+
+# language code -> literal replacements applied, in order, after the common rules
+LANGUAGE_RULES: Dict[str, List[Tuple[str, str]]] = {}
+_LANGUAGE_ALIASES: Dict[str, str] = {}
+
+
+def register_language_rules(language: str, rules: Iterable[Tuple[str, str]], aliases: Iterable[str] = ()):
+    """
+    Registers literal replacements applied by improve_tts_text for a language.
+
+    :param language: Language code, e.g. "ru"
+    :param rules: (old, new) pairs, applied in order
+    :param aliases: Other names accepted for the language, e.g. "rus", "russian"
+    """
+    language = language.lower()
+    LANGUAGE_RULES[language] = list(rules)
+    _LANGUAGE_ALIASES[language] = language
+    for alias in aliases:
+        _LANGUAGE_ALIASES[alias.lower()] = language
+
+
+register_language_rules("ru", [("г.", "году")], aliases=("rus", "russian"))
+register_language_rules("fr", [("M.", "Monsieur")], aliases=("fra", "french"))
+
+
+def improve_tts_text(text: str, language: Optional[str] = 'en') -> str:
+    """
+    Normalizes text for better TTS results: sentence-final periods, ISO dates,
+    dashes, question marks and quotes, plus the rules registered for ``language``.
+    """
+    text = _FIRST_PASS.sub(_replace, text)
+    if "?" in text and ("://" in text or "@" in text):
+        text = _URL_QUESTION.sub(r'\1 ?', text)
+
+    if language:
+        for old, new in LANGUAGE_RULES.get(_LANGUAGE_ALIASES.get(language.lower()), ()):
+            text = text.replace(old, new)
+
+    return text
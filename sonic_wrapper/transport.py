@@ -0,0 +1,251 @@
+import base64
+import hashlib
+import inspect
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+# Resources of the Cartesia client that are recorded and replayed
+RESOURCES = ("voices", "tts")
+
+
+def _encode(value: Any) -> Any:
+    """
+    JSON-safe form of an SDK response: bytes become {"__bytes__": base64}.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {"__bytes__"}:
+            return base64.b64decode(value["__bytes__"])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+def request_key(endpoint: str, args: tuple, kwargs: Dict) -> str:
+    """
+    Identifies a call by endpoint and arguments. Files passed to voices.clone
+    are identified by their content rather than their path.
+    """
+    kwargs = dict(kwargs)
+    if endpoint == "voices.clone":
+        filepath = kwargs.pop("filepath", None) or (args[0] if args else None)
+        args = ()
+        if filepath:
+            kwargs["clip_sha256"] = hashlib.sha256(Path(filepath).read_bytes()).hexdigest()
+    payload = json.dumps({"endpoint": endpoint, "args": list(args), "kwargs": kwargs},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    Recorded SDK calls, stored as one JSON line per call in ``path``.
+    A call that is recorded several times replays its latest response.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: str, endpoint: str, kind: str, response: Any = None, error: str = None):
+        entry = {"key": key, "endpoint": endpoint, "kind": kind, "response": _encode(response), "error": error}
+        with self._lock:
+            self._entries[key] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            return self._entries.get(key)
+
+
+class _RecordingResource:
+    def __init__(self, name: str, resource: Any, cassette: Cassette):
+        self._name = name
+        self._resource = resource
+        self._cassette = cassette
+
+    def __getattr__(self, attribute: str):
+        target = getattr(self._resource, attribute)
+        if not callable(target):
+            return target
+        endpoint = f"{self._name}.{attribute}"
+
+        def call(*args, **kwargs):
+            key = request_key(endpoint, args, kwargs)
+            try:
+                result = target(*args, **kwargs)
+            except Exception as e:
+                self._cassette.add(key, endpoint, "error", error=str(e))
+                raise
+            if inspect.isawaitable(result):
+                return self._record_awaitable(key, endpoint, result)
+            if inspect.isgenerator(result):
+                return self._record_stream(key, endpoint, result)
+            self._cassette.add(key, endpoint, "value", result)
+            return result
+        return call
+
+    async def _record_awaitable(self, key: str, endpoint: str, awaitable):
+        try:
+            result = await awaitable
+        except Exception as e:
+            self._cassette.add(key, endpoint, "error", error=str(e))
+            raise
+        if hasattr(result, "__aiter__"):
+            return self._record_async_stream(key, endpoint, result)
+        self._cassette.add(key, endpoint, "value", result)
+        return result
+
+    def _record_stream(self, key: str, endpoint: str, stream):
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        # Only complete streams are recorded
+        self._cassette.add(key, endpoint, "stream", chunks)
+
+    async def _record_async_stream(self, key: str, endpoint: str, stream):
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk)
+            yield chunk
+        self._cassette.add(key, endpoint, "stream", chunks)
+
+
+class _ReplayResource:
+    def __init__(self, name: str, cassette: Cassette, asynchronous: bool):
+        self._name = name
+        self._cassette = cassette
+        self._asynchronous = asynchronous
+
+    def _replay(self, endpoint: str, args: tuple, kwargs: Dict):
+        entry = self._cassette.lookup(request_key(endpoint, args, kwargs))
+        if entry is None:
+            raise ValueError(f"No recorded response for {endpoint} with these arguments "
+                             f"in {self._cassette.path}")
+        if entry["kind"] == "error":
+            raise ValueError(entry["error"])
+        return entry["kind"], _decode(entry["response"])
+
+    def __getattr__(self, attribute: str):
+        endpoint = f"{self._name}.{attribute}"
+
+        def call(*args, **kwargs):
+            kind, response = self._replay(endpoint, args, kwargs)
+            return iter(response) if kind == "stream" else response
+
+        async def call_async(*args, **kwargs):
+            kind, response = self._replay(endpoint, args, kwargs)
+            if kind != "stream":
+                return response
+
+            async def stream():
+                for chunk in response:
+                    yield chunk
+            return stream()
+
+        return call_async if self._asynchronous else call
+
+
+class RecordingClient:
+    """
+    Passes calls through to a real Cartesia (or AsyncCartesia) client and
+    appends every voices.* and tts.* call with its response to a cassette.
+    """
+
+    def __init__(self, client: Any, cassette: Cassette):
+        self.wrapped = client
+        self.cassette = cassette
+        for name in RESOURCES:
+            setattr(self, name, _RecordingResource(name, getattr(client, name), cassette))
+
+    def __getattr__(self, attribute: str):
+        return getattr(self.wrapped, attribute)
+
+
+class ReplayClient:
+    """
+    Serves voices.* and tts.* calls from a cassette without network access.
+    Calls that were not recorded raise ValueError, like a failed API request.
+    """
+
+    def __init__(self, cassette: Cassette, asynchronous: bool = False):
+        self.cassette = cassette
+        for name in RESOURCES:
+            setattr(self, name, _ReplayResource(name, cassette, asynchronous))
+
+    async def close(self):
+        pass
+
+
+class Transport:
+    """
+    How a manager reaches the Cartesia API. Called with the SDK client the
+    manager would use (or None without an API key) and returns the client to use.
+
+    * ``Transport()``: the live API
+    * ``Transport("record", path)``: the live API, recording every call to ``path``
+    * ``Transport("replay", path)``: recorded responses only, no network or API key needed
+    """
+
+    MODES = ("live", "record", "replay")
+
+    def __init__(self, mode: str = "live", path: Path = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown transport mode: {mode}. Choose from: {list(self.MODES)}")
+        if mode != "live" and path is None:
+            raise ValueError(f"Transport mode '{mode}' needs a cassette path")
+        self.mode = mode
+        self.cassette = Cassette(path) if path is not None else None
+
+    @classmethod
+    def from_env(cls, variable: str = "SONIC_TRANSPORT") -> "Transport":
+        """
+        Reads "record:<path>" or "replay:<path>" from an environment variable;
+        unset means the live API.
+        """
+        value = os.environ.get(variable)
+        if not value:
+            return cls()
+        mode, _, path = value.partition(":")
+        return cls(mode, Path(path) if path else None)
+
+    @property
+    def needs_api_key(self) -> bool:
+        return self.mode != "replay"
+
+    def __call__(self, client: Any, asynchronous: bool = False) -> Any:
+        if self.mode == "replay":
+            logger.info(f"Replaying Cartesia API calls from {self.cassette.path} ({len(self.cassette)} recorded)")
+            return ReplayClient(self.cassette, asynchronous=asynchronous)
+        if self.mode == "record" and client is not None:
+            logger.info(f"Recording Cartesia API calls to {self.cassette.path}")
+            return RecordingClient(client, self.cassette)
+        return client
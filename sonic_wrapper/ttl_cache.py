@@ -0,0 +1,151 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+
+class TTLCache:
+    """
+    Caches the result of a zero-argument loader for ``ttl`` seconds.
+
+    The first call (or the first call after ``invalidate``) loads synchronously.
+    Once the value is older than ``ttl`` the stale value is still returned
+    immediately while a single background thread reloads it
+    (stale-while-revalidate). Failed background reloads keep the stale value and
+    back off: the next reload starts ``retry_after`` seconds later, doubling with
+    every further failure up to ``ttl``. A value older than ``max_stale`` is not
+    served any more; ``get`` then loads synchronously (and raises if that fails).
+
+    ``on_lookup``, if given, is called with True for every hit (fresh or stale)
+    and False for every miss.
+    """
+
+    def __init__(self, loader: Callable[[], Any], ttl: float = 300.0, name: str = "cache",
+                 on_lookup: Optional[Callable[[bool], None]] = None,
+                 retry_after: float = 5.0, max_stale: float = 3600.0):
+        self.loader = loader
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.max_stale = max_stale
+        self.name = name
+        self.on_lookup = on_lookup
+        self._value = None
+        self._loaded_at = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+        self._failures = 0
+        self._retry_at = 0.0
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    @property
+    def generation(self) -> int:
+        """
+        Incremented every time a new value is stored or the cache is invalidated.
+        """
+        return self._generation
+
+    @property
+    def expired(self) -> bool:
+        """
+        True once a loaded value is older than ``ttl``; the next ``get`` will revalidate it.
+        """
+        with self._lock:
+            return self._loaded_at is not None and time.monotonic() - self._loaded_at >= self.ttl
+
+    def get(self) -> Any:
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded_at is not None and now - self._loaded_at < self.max_stale:
+                if now - self._loaded_at < self.ttl:
+                    self._record("hits")
+                    return self._value
+                self._record("stale_hits")
+                if not self._refreshing and now >= self._retry_at:
+                    self._refreshing = True
+                    threading.Thread(
+                        target=self._refresh_in_background,
+                        args=(self._generation,),
+                        name=f"{self.name}-refresh",
+                        daemon=True
+                    ).start()
+                return self._value
+
+        # Nothing cached: load synchronously, letting concurrent callers share one load
+        with self._load_lock:
+            with self._lock:
+                if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.max_stale:
+                    self._record("hits")
+                    return self._value
+                self._record("misses")
+            try:
+                value = self.loader()
+            except Exception:
+                self._failed()
+                raise
+            self._store(value)
+            return value
+
+    def _record(self, event: str):
+        self._stats[event] += 1
+        if self.on_lookup is not None:
+            self.on_lookup(event != "misses")
+
+    def _store(self, value: Any, expected_generation: int = None):
+        with self._lock:
+            if expected_generation is not None and expected_generation != self._generation:
+                # Invalidated while loading; the result belongs to an older state
+                return False
+            self._value = value
+            self._loaded_at = time.monotonic()
+            self._generation += 1
+            self._failures = 0
+            self._retry_at = 0.0
+            return True
+
+    def _failed(self) -> float:
+        """
+        Counts a failed load and schedules the next background attempt; returns the delay.
+        """
+        with self._lock:
+            self._stats["errors"] += 1
+            self._failures += 1
+            delay = min(self.retry_after * 2 ** (self._failures - 1), max(self.ttl, self.retry_after))
+            self._retry_at = time.monotonic() + delay
+            return delay
+
+    def _refresh_in_background(self, generation: int):
+        try:
+            value = self.loader()
+            if self._store(value, expected_generation=generation):
+                with self._lock:
+                    self._stats["refreshes"] += 1
+                logger.debug(f"{self.name}: refreshed in background")
+        except Exception as e:
+            delay = self._failed()
+            logger.error(f"{self.name}: background refresh failed, serving stale data, next try in {delay:.0f}s: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def set(self, value: Any):
+        """
+        Stores a value fetched elsewhere (e.g. by a full sync) as fresh.
+        """
+        self._store(value)
+
+    def invalidate(self):
+        """
+        Drops the cached value so the next ``get`` loads synchronously.
+        """
+        with self._lock:
+            self._value = None
+            self._loaded_at = None
+            self._generation += 1
+        logger.info(f"{self.name}: invalidated")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,290 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Optional
+
+from loguru import logger
+
+
+class VoiceCatalog:
+    """
+    Persistent SQLite index of the voices stored under ``api_dir`` and ``custom_dir``.
+
+    Listing and name lookups are answered from the index without opening any
+    per-voice file. The index is kept current by ``upsert`` on every write and
+    re-synced from disk when a voice directory changes behind its back.
+
+    Changes are detected by directory mtime, which only moves when a file is
+    added, removed or replaced (renamed over). A voice file edited in place is
+    not noticed; call ``rebuild()`` after editing files by hand.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path: Path, api_dir: Path, custom_dir: Path):
+        self.db_path = Path(db_path)
+        self.api_dir = api_dir
+        self.custom_dir = custom_dir
+        self._lock = threading.RLock()
+        self._dir_mtimes = {}
+        self._version = 0
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS voices (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    is_public INTEGER NOT NULL,
+                    is_custom INTEGER NOT NULL,
+                    source TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_voices_name ON voices (name)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_voices_language ON voices (language)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_voices_custom ON voices (is_custom)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    id TEXT PRIMARY KEY,
+                    meta_hash TEXT NOT NULL,
+                    data_hash TEXT NOT NULL
+                )
+                """
+            )
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+            if row is None or int(row["value"]) != self.SCHEMA_VERSION:
+                self._conn.execute("DELETE FROM voices")
+                self._conn.execute("DELETE FROM sync_state")
+                self._conn.execute("DELETE FROM meta")
+                self._conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('schema_version', ?)",
+                    (str(self.SCHEMA_VERSION),)
+                )
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _record(voice_data: Dict, source: str) -> tuple:
+        is_custom = source == "custom"
+        return (
+            voice_data["id"],
+            voice_data["name"],
+            voice_data["language"],
+            int(not is_custom and bool(voice_data.get("is_public", True))),
+            int(is_custom),
+            source,
+        )
+
+    def upsert(self, voice_data: Dict, source: str):
+        """
+        Adds or replaces the index entry for a voice stored in ``source`` ("api" or "custom").
+        """
+        with self._lock:
+            if self._stored_dir_mtime(source) is None:
+                # Never indexed: recording the directory mtime below would hide
+                # the files already on disk, so index them (and this voice) first
+                self._reindex_dir(source)
+                return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO voices (id, name, language, is_public, is_custom, source) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self._record(voice_data, source)
+            )
+            self._version += 1
+        self._remember_dir_mtime(source)
+
+    def remove(self, voice_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM voices WHERE id = ?", (voice_id,))
+            self._version += 1
+
+    # -------------------------------------------------------------------------
+    # Sync with the directories on disk
+    # -------------------------------------------------------------------------
+
+    @property
+    def version(self) -> int:
+        """
+        Counter bumped on every change to the index, including changes picked up from disk.
+        """
+        self.refresh()
+        return self._version
+
+    def _dir_for(self, source: str) -> Path:
+        return self.api_dir if source == "api" else self.custom_dir
+
+    def _remember_dir_mtime(self, source: str):
+        directory = self._dir_for(source)
+        try:
+            mtime = directory.stat().st_mtime_ns
+        except OSError:
+            return
+        self._dir_mtimes[source] = mtime
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (f"mtime_{source}", str(mtime))
+            )
+
+    def _stored_dir_mtime(self, source: str) -> Optional[int]:
+        if source in self._dir_mtimes:
+            return self._dir_mtimes[source]
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (f"mtime_{source}",)).fetchone()
+        if row is None:
+            return None
+        self._dir_mtimes[source] = int(row["value"])
+        return self._dir_mtimes[source]
+
+    def refresh(self):
+        """
+        Re-indexes any voice directory whose mtime changed since it was last indexed.
+        Costs two ``stat`` calls when nothing changed.
+        """
+        with self._lock:
+            for source in ("api", "custom"):
+                directory = self._dir_for(source)
+                try:
+                    mtime = directory.stat().st_mtime_ns
+                except OSError:
+                    continue
+                if mtime != self._stored_dir_mtime(source):
+                    self._reindex_dir(source)
+
+    def rebuild(self):
+        """
+        Drops the index and rebuilds it from every voice file on disk.
+        """
+        with self._lock:
+            for source in ("api", "custom"):
+                self._reindex_dir(source)
+
+    def _reindex_dir(self, source: str):
+        directory = self._dir_for(source)
+        records = []
+        for file in directory.glob("*.json"):
+            try:
+                with open(file, "r") as f:
+                    records.append(self._record(json.load(f), source))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Skipping unreadable voice file {file}: {e}")
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM voices WHERE source = ?", (source,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO voices (id, name, language, is_public, is_custom, source) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                records
+            )
+            self._version += 1
+        self._remember_dir_mtime(source)
+        logger.info(f"Indexed {len(records)} {source} voices from {directory}")
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _to_metadata(row: sqlite3.Row) -> Dict:
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'language': row['language'],
+            'is_public': bool(row['is_public']),
+            'is_custom': bool(row['is_custom'])
+        }
+
+    def get(self, voice_id: str) -> Optional[Dict]:
+        self.refresh()
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM voices WHERE id = ?", (voice_id,)).fetchone()
+        return self._to_metadata(row) if row else None
+
+    def source_of(self, voice_id: str) -> Optional[str]:
+        """
+        Returns "api" or "custom" for a locally stored voice, None otherwise.
+        """
+        self.refresh()
+        with self._lock:
+            row = self._conn.execute("SELECT source FROM voices WHERE id = ?", (voice_id,)).fetchone()
+        return row["source"] if row else None
+
+    def query(self, languages: List[str] = None, is_custom: bool = None, is_public: bool = None) -> List[Dict]:
+        self.refresh()
+        clauses, params = [], []
+        if languages is not None:
+            clauses.append(f"language IN ({', '.join('?' for _ in languages)})")
+            params.extend(languages)
+        if is_custom is not None:
+            clauses.append("is_custom = ?")
+            params.append(int(is_custom))
+        if is_public is not None:
+            clauses.append("is_public = ?")
+            params.append(int(is_public))
+        sql = "SELECT * FROM voices"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY source, id"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_metadata(row) for row in rows]
+
+    def ids_by_name(self, name: str) -> List[str]:
+        self.refresh()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM voices WHERE name = ? ORDER BY source, id", (name,)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def count(self, is_custom: bool = None) -> int:
+        self.refresh()
+        with self._lock:
+            if is_custom is None:
+                row = self._conn.execute("SELECT COUNT(*) AS n FROM voices").fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) AS n FROM voices WHERE is_custom = ?", (int(is_custom),)
+                ).fetchone()
+        return row["n"]
+
+    # -------------------------------------------------------------------------
+    # Sync fingerprints (see voice_sync.VoiceSync)
+    # -------------------------------------------------------------------------
+
+    def get_sync_state(self) -> Dict[str, tuple]:
+        """
+        Returns {voice_id: (meta_hash, data_hash)} recorded by previous syncs.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT id, meta_hash, data_hash FROM sync_state").fetchall()
+        return {row["id"]: (row["meta_hash"], row["data_hash"]) for row in rows}
+
+    def set_sync_state(self, voice_id: str, meta_hash: str, data_hash: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (id, meta_hash, data_hash) VALUES (?, ?, ?)",
+                (voice_id, meta_hash, data_hash)
+            )
+
+    def clear_sync_state(self, voice_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sync_state WHERE id = ?", (voice_id,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,49 @@
+import functools
+from typing import Optional, Sequence
+
+
+@functools.lru_cache(maxsize=None)
+def numpy_module():
+    """
+    Returns numpy, importing it on first use so that importing the wrapper stays
+    cheap. Returns None when numpy is not installed; mixing then falls back to
+    the API.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def local_mixing_available() -> bool:
+    return numpy_module() is not None
+
+
+def mix_matrix(embeddings, weights):
+    """
+    Weighted averages of embeddings, the blend voices.mix computes, as one matrix product.
+
+    :param embeddings: M x D matrix, one voice embedding per row
+    :param weights: N x M matrix, one blend per row (weights are normalized per row)
+    :return: N x D float32 matrix of mixed embeddings
+    """
+    np = numpy_module()
+    embeddings = np.asarray(embeddings, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    if embeddings.ndim != 2 or weights.ndim != 2 or weights.shape[1] != embeddings.shape[0]:
+        raise ValueError(f"Cannot mix {weights.shape} weights with {embeddings.shape} embeddings.")
+    totals = weights.sum(axis=1, keepdims=True)
+    if not np.all(totals):
+        raise ValueError("Mix weights must not sum to zero.")
+    return ((weights / totals) @ embeddings).astype(np.float32)
+
+
+def max_difference(first: Sequence[float], second: Sequence[float]) -> Optional[float]:
+    """
+    Largest absolute difference between two embeddings, None when their sizes differ.
+    """
+    if len(first) != len(second):
+        return None
+    np = numpy_module()
+    return float(np.max(np.abs(np.asarray(first, dtype=np.float64) - np.asarray(second, dtype=np.float64))))
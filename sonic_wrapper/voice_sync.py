@@ -0,0 +1,136 @@
+import hashlib
+import json
+import struct
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from .embedding_store import SLOT_KEY, read_voice_file
+
+
+def fingerprint(data: Dict, exclude: tuple = ()) -> str:
+    """
+    Stable hash of a voice dict, ignoring the keys in ``exclude``.
+    The embedding is hashed at float32 precision, as it is stored on disk.
+    """
+    exclude = set(exclude) | {SLOT_KEY}
+    payload = {k: v for k, v in data.items() if k not in exclude and k != "embedding"}
+    digest = hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8"))
+    embedding = data.get("embedding") if "embedding" not in exclude else None
+    if embedding is not None:
+        digest.update(struct.pack(f"<{len(embedding)}f", *embedding))
+    return digest.hexdigest()
+
+
+class VoiceSync:
+    """
+    Incremental, concurrent mirror of the API voice library into ``manager.api_dir``.
+
+    * Voices whose listing metadata matches the fingerprint recorded by the last
+      sync are skipped without calling ``voices.get``.
+    * Details of the remaining voices are fetched by a bounded thread pool.
+    * A voice file is only rewritten when its full data (embedding included) changed.
+    * Fingerprints are committed to the catalog as each voice finishes, so an
+      interrupted sync resumes where it stopped on the next run.
+    """
+
+    def __init__(self, manager, max_workers: int = 8, prune: bool = False, show_progress: bool = True):
+        self.manager = manager
+        self.max_workers = max(1, max_workers)
+        self.prune = prune
+        self.show_progress = show_progress
+
+    def _stored_data_hash(self, voice_id: str) -> Optional[str]:
+        """
+        Fingerprint of a voice file written before sync state existed.
+        """
+        voice_file = self.manager.api_dir / f"{voice_id}.json"
+        if not voice_file.exists():
+            return None
+        try:
+            voice = read_voice_file(voice_file, self.manager.api_embeddings)
+            return fingerprint(dict(voice, embedding=voice["embedding"]))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def run(self) -> Dict[str, List[str]]:
+        """
+        Runs one sync and returns a summary:
+        {"added": [...], "updated": [...], "unchanged": [...], "removed": [...], "failed": [...]}
+
+        "removed" lists local API voices that are no longer returned by the API;
+        their files are only deleted when ``prune`` is set.
+        """
+        manager = self.manager
+        catalog = manager.catalog
+        summary = {"added": [], "updated": [], "unchanged": [], "removed": [], "failed": []}
+
+        api_voices = manager._fetch_remote_voices()
+        manager.remote_voices.set(api_voices)
+
+        state = catalog.get_sync_state()
+        local_ids = {v["id"] for v in catalog.query(is_custom=False)}
+        listed_ids = set()
+
+        pending = []
+        for voice in api_voices:
+            voice_id = voice["id"]
+            listed_ids.add(voice_id)
+            meta_hash = fingerprint(voice, exclude=("embedding",))
+            if voice_id in local_ids and state.get(voice_id, (None,))[0] == meta_hash:
+                summary["unchanged"].append(voice_id)
+            else:
+                pending.append((voice_id, meta_hash))
+
+        if pending:
+            logger.info(f"Fetching details for {len(pending)} of {len(api_voices)} voices "
+                        f"with {self.max_workers} workers")
+
+        from tqdm import tqdm
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="voice-sync") as executor:
+            futures = {
+                executor.submit(manager.client.voices.get, id=voice_id): (voice_id, meta_hash)
+                for voice_id, meta_hash in pending
+            }
+            progress = tqdm(as_completed(futures), total=len(futures), desc="Updating voices",
+                            disable=not self.show_progress)
+            for future in progress:
+                voice_id, meta_hash = futures[future]
+                try:
+                    full_voice_data = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to fetch voice {voice_id}: {e}")
+                    summary["failed"].append(voice_id)
+                    continue
+
+                data_hash = fingerprint(full_voice_data)
+                previous_hash = state[voice_id][1] if voice_id in state else self._stored_data_hash(voice_id)
+                if voice_id in local_ids and previous_hash == data_hash:
+                    summary["unchanged"].append(voice_id)
+                else:
+                    manager._save_voice_to_api(full_voice_data)
+                    summary["updated" if voice_id in local_ids else "added"].append(voice_id)
+                    if voice_id in manager.loaded_voices:
+                        manager.voices[voice_id] = full_voice_data
+                catalog.set_sync_state(voice_id, meta_hash, data_hash)
+
+        for voice_id in sorted(local_ids - listed_ids):
+            summary["removed"].append(voice_id)
+            if self.prune:
+                (manager.api_dir / f"{voice_id}.json").unlink(missing_ok=True)
+                catalog.remove(voice_id)
+                catalog.clear_sync_state(voice_id)
+                manager.voices.pop(voice_id, None)
+                manager.loaded_voices.discard(voice_id)
+                manager.forget_voice_mixes(voice_id)
+        if self.prune and summary["removed"]:
+            manager.compact_voice_storage()
+
+        logger.info(
+            f"Voice sync finished: {len(summary['added'])} added, {len(summary['updated'])} updated, "
+            f"{len(summary['unchanged'])} unchanged, {len(summary['removed'])} removed"
+            f"{' (pruned)' if self.prune else ''}, {len(summary['failed'])} failed"
+        )
+        return summary
@@ -0,0 +1,88 @@
+import struct
+import sys
+from array import array
+from typing import BinaryIO, List
+
+# encoding -> (WAVE format tag, bits per sample)
+WAV_ENCODINGS = {
+    "pcm_f32le": (3, 32),  # WAVE_FORMAT_IEEE_FLOAT
+    "pcm_s16le": (1, 16),  # WAVE_FORMAT_PCM
+    "pcm_alaw": (6, 8),    # WAVE_FORMAT_ALAW
+    "pcm_mulaw": (7, 8),   # WAVE_FORMAT_MULAW
+}
+WAV_HEADER_SIZE = 44
+
+
+def wav_header(encoding: str, sample_rate: int, data_size: int = 0, channels: int = 1) -> bytes:
+    """
+    Builds a canonical 44-byte RIFF/WAVE header for raw PCM of the given Cartesia encoding.
+    """
+    if encoding not in WAV_ENCODINGS:
+        raise ValueError(f"Unsupported WAV encoding: {encoding}. Choose from: {list(WAV_ENCODINGS)}")
+    format_tag, bits = WAV_ENCODINGS[encoding]
+    block_align = channels * bits // 8
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, format_tag, channels, sample_rate, sample_rate * block_align, block_align, bits,
+        b"data", data_size,
+    )
+
+
+def patch_wav_header(f: BinaryIO, data_size: int):
+    """
+    Rewrites the RIFF and data chunk sizes of a header written with ``wav_header``
+    once the amount of streamed audio is known.
+    """
+    position = f.tell()
+    f.seek(4)
+    f.write(struct.pack("<I", 36 + data_size))
+    f.seek(40)
+    f.write(struct.pack("<I", data_size))
+    f.seek(position)
+
+
+def bytes_per_sample(encoding: str) -> int:
+    return WAV_ENCODINGS[encoding][1] // 8
+
+
+# encoding -> array typecode of samples that can be faded at chunk joins
+_FADE_TYPECODES = {"pcm_f32le": "f", "pcm_s16le": "h"}
+
+
+def join_pcm(chunks: List[bytes], encoding: str, sample_rate: int, fade_ms: float = 5.0) -> bytes:
+    """
+    Concatenates raw little-endian PCM chunks, fading each join out and in over
+    ``fade_ms`` so independently generated chunks meet without a click.
+    Companded encodings (mu-law, A-law) are concatenated without fades.
+    """
+    typecode = _FADE_TYPECODES.get(encoding)
+    if typecode is None:
+        return b"".join(chunks)
+
+    fade = int(sample_rate * fade_ms / 1000)
+    width = bytes_per_sample(encoding)
+    samples = []
+    for chunk in chunks:
+        pcm = array(typecode, chunk[:len(chunk) - len(chunk) % width])
+        if sys.byteorder == "big":
+            pcm.byteswap()
+        samples.append(pcm)
+
+    for i, pcm in enumerate(samples):
+        n = min(fade, len(pcm) // 2)
+        if n == 0:
+            continue
+        if i > 0:
+            for k in range(n):
+                pcm[k] = type(pcm[k])(pcm[k] * k / n)
+        if i < len(samples) - 1:
+            for k in range(n):
+                pcm[-1 - k] = type(pcm[-1 - k])(pcm[-1 - k] * k / n)
+
+    joined = array(typecode)
+    for pcm in samples:
+        joined.extend(pcm)
+    if sys.byteorder == "big":
+        joined.byteswap()
+    return joined.tobytes()
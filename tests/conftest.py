@@ -0,0 +1,40 @@
+"""
+Fixtures running CartesiaVoiceManager against the local Cartesia stand-in.
+"""
+import pytest
+
+from sonic_wrapper.log_config import configure_logging
+from sonic_wrapper.sonic_api_wrapper import CartesiaVoiceManager
+from sonic_wrapper.standin_server import CartesiaStandIn, make_voices
+
+API_KEY = "test"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def quiet_logging():
+    configure_logging(level="ERROR", log_file=None)
+
+
+@pytest.fixture
+def standin(monkeypatch):
+    with CartesiaStandIn(voices=make_voices(12), api_key=API_KEY, chunk_size=4096) as server:
+        monkeypatch.setenv("CARTESIA_BASE_URL", server.base_url)
+        monkeypatch.delenv("SONIC_TRANSPORT", raising=False)
+        yield server
+
+
+@pytest.fixture
+def make_manager(standin, tmp_path):
+    """
+    Builds managers sharing one voice directory, like separate runs of the CLI.
+    """
+    def make(**kwargs):
+        return CartesiaVoiceManager(api_key=API_KEY, base_dir=tmp_path / "voice2voice", **kwargs)
+    return make
+
+
+@pytest.fixture
+def manager(make_manager, standin):
+    manager = make_manager()
+    manager.set_voice(standin.list_voices()[0]["id"])
+    return manager
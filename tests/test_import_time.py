@@ -0,0 +1,21 @@
+"""
+Enforces the import-time budget of benchmarks/bench_import_time.py.
+
+Budgets are wall-clock; on slow machines loosen them with
+SONIC_IMPORT_BUDGET_SCALE=2 python -m pytest tests/test_import_time.py
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / "benchmarks" / "bench_import_time.py"
+
+
+def test_import_time_budget():
+    scale = os.environ.get("SONIC_IMPORT_BUDGET_SCALE", "1")
+    result = subprocess.run(
+        [sys.executable, str(SCRIPT), "--runs", "5", "--scale", scale],
+        capture_output=True, text=True
+    )
+    assert result.returncode == 0, f"import-time budget exceeded:\n{result.stdout}{result.stderr}"
@@ -0,0 +1,22 @@
+from sonic_wrapper.text_normalization import improve_tts_text
+
+TEXT = ("This is a long sentence that has no punctuation for a while and keeps going with many words "
+        "so that the splitter has to cut it. A second sentence ends here")
+
+
+def test_chunks_are_not_normalized_on_their_own(manager, monkeypatch):
+    transcripts = []
+    synthesize = manager._synthesize
+
+    def recording(request):
+        transcripts.append(request["transcript"])
+        return synthesize(request)
+
+    monkeypatch.setattr(manager, "_synthesize", recording)
+    manager.set_language("en")
+    manager.speak_long(TEXT, output_file=str(manager.base_dir / "long.wav"), max_chunk_chars=40)
+
+    assert len(transcripts) > 2
+    assert " ".join(transcripts) == improve_tts_text(TEXT, "en")
+    # Chunks cut inside a sentence don't get a sentence-final period
+    assert [transcript.endswith(".") for transcript in transcripts] == [False] * (len(transcripts) - 1) + [True]
@@ -0,0 +1,70 @@
+import struct
+
+import pytest
+
+from sonic_wrapper.wav import WAV_HEADER_SIZE
+
+TEXT = "Streaming is patched at the end"
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    riff, riff_size, wave, fmt, _, format_tag, channels, sample_rate, _, _, bits, chunk, data_size = \
+        struct.unpack("<4sI4s4sIHHIIHH4sI", data[:WAV_HEADER_SIZE])
+    assert (riff, wave, fmt, chunk) == (b"RIFF", b"WAVE", b"fmt ", b"data")
+    return {
+        "riff_size": riff_size, "format_tag": format_tag, "channels": channels, "sample_rate": sample_rate,
+        "bits": bits, "data_size": data_size, "file_size": len(data),
+    }
+
+
+@pytest.mark.parametrize("profile, format_tag, bits, sample_rate", [
+    ("hifi-f32-44k", 3, 32, 44100),
+    ("pcm16-24k", 1, 16, 24000),
+    ("telephony-mulaw-8k", 7, 8, 8000),
+])
+def test_complete_stream_patches_sizes(manager, tmp_path, profile, format_tag, bits, sample_rate):
+    output_file = tmp_path / f"{profile}.wav"
+    chunks = list(manager.speak_stream(TEXT, output_file=str(output_file), output_format=profile))
+
+    header = read_header(output_file)
+    streamed = sum(len(chunk) for chunk in chunks)
+    assert len(chunks) > 1
+    assert (header["format_tag"], header["bits"], header["sample_rate"], header["channels"]) == \
+           (format_tag, bits, sample_rate, 1)
+    assert header["data_size"] == streamed == header["file_size"] - WAV_HEADER_SIZE
+    assert header["riff_size"] == header["file_size"] - 8
+    assert manager.last_stream_stats["bytes"] == streamed
+    assert manager.last_stream_stats["time_to_first_chunk"] is not None
+
+
+def test_abandoned_stream_patches_sizes(manager, tmp_path):
+    output_file = tmp_path / "abandoned.wav"
+    stream = manager.speak_stream(TEXT, output_file=str(output_file))
+    first = next(stream)
+    stream.close()
+
+    header = read_header(output_file)
+    assert header["data_size"] == len(first) == header["file_size"] - WAV_HEADER_SIZE
+    assert header["riff_size"] == header["file_size"] - 8
+
+
+def test_failed_stream_patches_sizes(manager, standin, tmp_path):
+    standin.stream_error_rate = 1.0
+    output_file = tmp_path / "failed.wav"
+    received = []
+    with pytest.raises(Exception):
+        for chunk in manager.speak_stream(TEXT, output_file=str(output_file)):
+            received.append(chunk)
+
+    # The header describes whatever arrived before the failure
+    header = read_header(output_file)
+    assert header["data_size"] == sum(len(chunk) for chunk in received) == header["file_size"] - WAV_HEADER_SIZE
+    assert header["riff_size"] == header["file_size"] - 8
+
+
+def test_raw_profile_has_no_header(manager, tmp_path):
+    output_file = tmp_path / "raw.pcm"
+    chunks = list(manager.speak_stream(TEXT, output_file=str(output_file), output_format="raw-pcm"))
+    assert output_file.read_bytes() == b"".join(chunks)
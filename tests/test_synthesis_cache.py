@@ -0,0 +1,106 @@
+import itertools
+import types
+
+import pytest
+
+from sonic_wrapper import synthesis_cache as synthesis_cache_module
+from sonic_wrapper.synthesis_cache import SynthesisCache, synthesis_key
+
+REQUEST = {
+    "model_id": "sonic-english",
+    "transcript": "Café au lait, please.",
+    "voice_embedding": [0.25, -0.5, 1.0],
+    "duration": None,
+    "output_format": {"container": "wav", "encoding": "pcm_f32le", "sample_rate": 44100},
+    "_experimental_voice_controls": {"speed": 0.0},
+}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    Strictly increasing last-access times, so LRU order doesn't depend on timer resolution.
+    """
+    ticks = itertools.count(1)
+    monkeypatch.setattr(synthesis_cache_module, "time", types.SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+def test_key_normalizes_unicode_and_whitespace():
+    decomposed = dict(REQUEST, transcript="  Cafe\u0301 au\tlait,\n please. ")
+    assert synthesis_key(decomposed) == synthesis_key(REQUEST)
+
+
+@pytest.mark.parametrize("change", [
+    {"transcript": "Café au lait, please!"},
+    {"voice_embedding": [0.25, -0.5, 0.5]},
+    {"model_id": "sonic-multilingual"},
+    {"language": "fr"},
+    {"_experimental_voice_controls": {"speed": 0.5}},
+    {"output_format": {"container": "raw", "encoding": "pcm_f32le", "sample_rate": 44100}},
+])
+def test_key_covers_request_settings(change):
+    assert synthesis_key(dict(REQUEST, **change)) != synthesis_key(REQUEST)
+
+
+def test_disk_hit_is_promoted_to_memory(tmp_path):
+    SynthesisCache(tmp_path).put("a" * 64, b"audio")
+
+    cache = SynthesisCache(tmp_path)
+    assert cache.get("a" * 64) == b"audio"
+    assert cache.get("a" * 64) == b"audio"
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["memory_entries"]) == (1, 1, 1)
+
+
+def test_memory_tier_is_bounded(tmp_path):
+    cache = SynthesisCache(tmp_path, memory_max_bytes=10)
+    cache.put("a" * 64, b"12345")
+    cache.put("b" * 64, b"12345")
+    cache.put("c" * 64, b"12345")
+    assert cache.stats()["memory_bytes"] == 10
+    assert cache.get("a" * 64) == b"12345"
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = SynthesisCache(tmp_path, max_bytes=10, memory_max_bytes=0)
+    cache.put("a" * 64, b"12345")
+    cache.put("b" * 64, b"12345")
+    cache.get("a" * 64)
+    cache.put("c" * 64, b"12345")
+
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) == b"12345"
+    assert cache.get("c" * 64) == b"12345"
+    stats = cache.stats()
+    assert (stats["evictions"], stats["disk_entries"], stats["disk_bytes"]) == (1, 2, 10)
+    assert not (tmp_path / "bb" / f"{'b' * 64}.bin").exists()
+
+
+def test_truncated_entry_is_rejected(tmp_path):
+    SynthesisCache(tmp_path).put("a" * 64, b"0123456789")
+    path = tmp_path / "aa" / f"{'a' * 64}.bin"
+    path.write_bytes(b"01234")
+
+    cache = SynthesisCache(tmp_path)
+    assert cache.get("a" * 64) is None
+    assert not path.exists()
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_put_leaves_no_temporary_files(tmp_path):
+    cache = SynthesisCache(tmp_path)
+    cache.put("a" * 64, b"first")
+    cache.put("a" * 64, b"second")
+    assert [path.name for path in (tmp_path / "aa").iterdir()] == [f"{'a' * 64}.bin"]
+    assert SynthesisCache(tmp_path).get("a" * 64) == b"second"
+
+
+def test_speak_is_served_from_cache(manager, standin, tmp_path):
+    manager.enable_synthesis_cache(tmp_path / "cache")
+    first = manager.speak("Hello there.", output_file=str(tmp_path / "first.wav"))
+    second = manager.speak("Hello   there.", output_file=str(tmp_path / "second.wav"))
+
+    assert manager.last_synthesis_cached
+    assert standin.stats()["tts_bytes"] == 1
+    assert open(first, "rb").read() == open(second, "rb").read()
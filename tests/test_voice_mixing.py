@@ -0,0 +1,42 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def recipes(standin):
+    voice_ids = [voice["id"] for voice in standin.list_voices()[:3]]
+    return [[{"id": voice_id, "weight": weight} for voice_id, weight in zip(voice_ids, weights)]
+            for weights in ((1, 2, 3), (3, 1, 1), (0.5, 0.5, 0))]
+
+
+def test_verified_local_mixing_stops_calling_the_api(make_manager, standin, recipes):
+    manager = make_manager(local_mixing="verify", mix_cache_entries=0)
+    manager.create_mixed_embeddings(recipes)
+    calls = standin.stats()["mix_voices"]
+    assert manager._local_mixing_verified is True
+
+    manager.create_mixed_embeddings(recipes)
+    assert standin.stats()["mix_voices"] == calls
+
+
+def test_failed_verification_is_not_repeated_on_every_mix(make_manager, standin, recipes, monkeypatch):
+    manager = make_manager(local_mixing="verify", mix_cache_entries=0)
+    verify = manager.verify_local_mix
+    attempts = []
+
+    def failing(sample):
+        attempts.append(sample)
+        raise ConnectionError("API unreachable")
+
+    monkeypatch.setattr(manager, "verify_local_mix", failing)
+    for _ in range(3):
+        manager.create_mixed_embeddings(recipes)
+    assert len(attempts) == 1
+    assert standin.stats()["mix_voices"] == 3 * len(recipes)
+
+    # Once the retry time has passed the check runs again
+    monkeypatch.setattr(manager, "verify_local_mix", verify)
+    manager._local_mixing_retry_at = 0.0
+    manager.create_mixed_embeddings(recipes)
+    assert manager._local_mixing_verified is True
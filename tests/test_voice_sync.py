@@ -0,0 +1,89 @@
+import pytest
+
+from sonic_wrapper.embedding_store import read_voice_file
+
+
+def fetches(standin):
+    return standin.stats().get("get_voice", 0)
+
+
+def assert_mirrors(manager, standin):
+    local = {voice["id"] for voice in manager.catalog.query(is_custom=False)}
+    assert local == {voice["id"] for voice in standin.list_voices()}
+    for voice_id in local:
+        stored = read_voice_file(manager.api_dir / f"{voice_id}.json", manager.api_embeddings)
+        expected = standin.get_voice(voice_id)
+        assert stored["name"] == expected["name"]
+        assert stored["embedding"] == pytest.approx(expected["embedding"], abs=1e-6)
+
+
+def test_second_sync_skips_unchanged_voices(make_manager, standin):
+    first = make_manager().update_voices_from_api(max_workers=4)
+    assert len(first["added"]) == 12
+    assert fetches(standin) == 12
+
+    second = make_manager().update_voices_from_api(max_workers=4)
+    assert len(second["unchanged"]) == 12
+    assert not (second["added"] or second["updated"] or second["failed"])
+    assert fetches(standin) == 12
+
+
+def test_changed_and_new_voices_are_fetched(make_manager, standin):
+    make_manager().update_voices_from_api()
+    renamed, changed = [voice["id"] for voice in standin.list_voices()[:2]]
+    standin._voices[renamed]["name"] = "Renamed voice"
+    standin._voices[changed]["description"] = "New description"
+    standin._voices[changed]["embedding"] = [0.5] * len(standin._voices[changed]["embedding"])
+    added = standin.create_voice({"name": "Added voice", "language": "en", "embedding": [0.25] * 192})["id"]
+
+    manager = make_manager()
+    summary = manager.update_voices_from_api()
+    assert sorted(summary["updated"]) == sorted([renamed, changed])
+    assert summary["added"] == [added]
+    assert fetches(standin) == 12 + 3
+    assert manager.get_voice_id_by_name("Renamed voice") == [renamed]
+    assert_mirrors(manager, standin)
+
+
+def test_interrupted_sync_resumes(make_manager, standin, monkeypatch):
+    manager = make_manager()
+    save = manager._save_voice_to_api
+    saved = []
+
+    def interrupted(voice_data):
+        if len(saved) == 5:
+            raise KeyboardInterrupt
+        save(voice_data)
+        saved.append(voice_data["id"])
+
+    monkeypatch.setattr(manager, "_save_voice_to_api", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        manager.update_voices_from_api(max_workers=1)
+    assert set(manager.catalog.get_sync_state()) == set(saved)
+
+    before = fetches(standin)
+    resumed = make_manager().update_voices_from_api()
+    assert sorted(resumed["unchanged"]) == sorted(saved)
+    assert len(resumed["added"]) == 12 - len(saved)
+    assert fetches(standin) - before == 12 - len(saved)
+
+
+def test_prune_removes_voices_and_compacts_embeddings(make_manager, standin):
+    make_manager().update_voices_from_api()
+    store = make_manager().api_embeddings.path
+    size = store.stat().st_size
+    removed = sorted(voice["id"] for voice in standin.list_voices()[::3])
+    for voice_id in removed:
+        standin.delete_voice(voice_id)
+
+    kept = make_manager().update_voices_from_api()
+    assert kept["removed"] == removed
+    assert all((store.parent / f"{voice_id}.json").exists() for voice_id in removed)
+
+    manager = make_manager()
+    pruned = manager.update_voices_from_api(prune=True)
+    assert pruned["removed"] == removed
+    assert not any((manager.api_dir / f"{voice_id}.json").exists() for voice_id in removed)
+    assert not set(removed) & set(manager.catalog.get_sync_state())
+    assert store.stat().st_size == size * (12 - len(removed)) // 12
+    assert_mirrors(manager, standin)